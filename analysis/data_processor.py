@@ -4,22 +4,30 @@ Processador de dados: API → Base de Dados
 Calcula métricas avançadas para análise Over 0.5 HT e Over 1.5 FT
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db_manager import DatabaseManager
+from database.models import Match, TeamForm, HeadToHead, event_rows, statistics_rows
 from api.api_client import APIFootballClient
-from config.config import CURRENT_SEASON, ANALYSIS_PARAMS
+from analysis.feature_store import pressure_from_averages
+from config.config import CURRENT_SEASON, ANALYSIS_PARAMS, ENRICHMENT_POLICY
 
 class DataProcessor:
     """Processador de dados da API para análise"""
     
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.api = APIFootballClient()
+    def __init__(self, db: DatabaseManager = None,
+                 api: APIFootballClient = None):
+        """
+        Args:
+            db: Database manager (default: BD principal)
+            api: Cliente da API (default: novo APIFootballClient)
+        """
+        self.db = db or DatabaseManager()
+        self.api = api or APIFootballClient()
         print("✅ Data Processor inicializado")
     
     # ========================================================================
@@ -36,55 +44,43 @@ class DataProcessor:
         Returns:
             Dicionário formatado para a BD
         """
-        fixture_info = fixture_raw.get('fixture', {})
-        league_info = fixture_raw.get('league', {})
+        return Match.from_api(fixture_raw).to_dict()
+    
+    @staticmethod
+    def fixture_metadata(fixture_raw: Dict) -> Tuple[List[Dict], Dict, Tuple[int, int]]:
+        """
+        Equipas, liga e temporada de um jogo da API
+        
+        Returns:
+            ([equipa casa, equipa fora], liga, (league_id, season))
+        """
         teams_info = fixture_raw.get('teams', {})
-        goals_info = fixture_raw.get('goals', {})
-        score_info = fixture_raw.get('score', {})
-        
-        # Processar resultados
-        halftime = score_info.get('halftime', {})
-        extratime = score_info.get('extratime', {})
-        penalty = score_info.get('penalty', {})
-        
-        return {
-            'id': fixture_info.get('id'),
-            'league_id': league_info.get('id'),
-            'season': league_info.get('season'),
-            'round': league_info.get('round'),
-            'date': fixture_info.get('date'),
-            'timestamp': fixture_info.get('timestamp'),
-            
-            # Equipas
-            'home_team_id': teams_info.get('home', {}).get('id'),
-            'away_team_id': teams_info.get('away', {}).get('id'),
-            
-            # Status
-            'status_short': fixture_info.get('status', {}).get('short'),
-            'status_long': fixture_info.get('status', {}).get('long'),
-            'status_elapsed': fixture_info.get('status', {}).get('elapsed'),
-            
-            # Venue
-            'venue_id': fixture_info.get('venue', {}).get('id'),
-            'venue_name': fixture_info.get('venue', {}).get('name'),
-            'venue_city': fixture_info.get('venue', {}).get('city'),
-            'referee': fixture_info.get('referee'),
-            
-            # Resultados
-            'home_goals': goals_info.get('home'),
-            'away_goals': goals_info.get('away'),
-            'home_goals_halftime': halftime.get('home'),
-            'away_goals_halftime': halftime.get('away'),
-            'home_goals_extratime': extratime.get('home'),
-            'away_goals_extratime': extratime.get('away'),
-            'home_goals_penalty': penalty.get('home'),
-            'away_goals_penalty': penalty.get('away'),
+        teams = [
+            {
+                'id': teams_info.get(side, {}).get('id'),
+                'name': teams_info.get(side, {}).get('name'),
+                'logo': teams_info.get(side, {}).get('logo'),
+            }
+            for side in ('home', 'away')
+        ]
+        
+        league_info = fixture_raw.get('league', {})
+        league = {
+            'id': league_info.get('id'),
+            'name': league_info.get('name'),
+            'type': league_info.get('type'),
+            'country': league_info.get('country'),
+            'logo': league_info.get('logo'),
         }
+        return teams, league, (league_info.get('id'), league_info.get('season'))
     
     def save_fixture_complete(self, fixture_raw: Dict) -> bool:
         """
         Guardar fixture completo: jogo + equipas + liga
         
+        Equipas, liga e temporada só são escritas se forem novas ou tiverem
+        mudado (save_metadata); o jogo é sempre guardado.
+        
         Args:
             fixture_raw: Dados brutos da API
         
@@ -92,52 +88,44 @@ class DataProcessor:
             True se guardou com sucesso
         """
         try:
-            # 1. Guardar equipas
-            teams_info = fixture_raw.get('teams', {})
-            
-            home_team = {
-                'id': teams_info.get('home', {}).get('id'),
-                'name': teams_info.get('home', {}).get('name'),
-                'logo': teams_info.get('home', {}).get('logo'),
-            }
-            
-            away_team = {
-                'id': teams_info.get('away', {}).get('id'),
-                'name': teams_info.get('away', {}).get('name'),
-                'logo': teams_info.get('away', {}).get('logo'),
-            }
-            
-            self.db.insert_team(home_team)
-            self.db.insert_team(away_team)
-            
-            # 2. Guardar liga
-            league_info = fixture_raw.get('league', {})
-            league_data = {
-                'id': league_info.get('id'),
-                'name': league_info.get('name'),
-                'type': league_info.get('type'),
-                'country': league_info.get('country'),
-                'logo': league_info.get('logo'),
-            }
-            self.db.insert_league(league_data)
-            
-            # 3. Guardar season
-            self.db.insert_season(
-                league_info.get('id'),
-                league_info.get('season'),
-                current=True
-            )
-            
-            # 4. Guardar fixture
-            fixture_data = self.process_fixture_from_api(fixture_raw)
-            self.db.insert_fixture(fixture_data)
+            # 1. Guardar equipas, liga e season (se novas/alteradas)
+            teams, league, season = self.fixture_metadata(fixture_raw)
+            if self.db.save_metadata(teams, [league], [season]) < 0:
+                return False
             
-            return True
+            # 2. Guardar fixture
+            return self.db.insert_fixture(Match.from_api(fixture_raw))
             
         except Exception as e:
             print(f"❌ Erro ao guardar fixture: {e}")
             return False
     
+    def save_fixtures_bulk(self, fixtures_raw: List[Dict]) -> Optional[List[int]]:
+        """
+        Guardar muitos jogos de uma vez (uma transação, ex.: temporada inteira)
+        
+        Args:
+            fixtures_raw: Dados brutos da API
+        
+        Returns:
+            IDs dos jogos terminados guardados (para enrich_fixtures),
+            ou None se a transação falhou (nada foi guardado)
+        """
+        teams, leagues, seasons, matches = {}, {}, set(), []
+        
+        for fixture_raw in fixtures_raw:
+            fixture_teams, league, season = self.fixture_metadata(fixture_raw)
+            teams.update((team['id'], team) for team in fixture_teams)
+            leagues[league['id']] = league
+            seasons.add(season)
+            matches.append(Match.from_api(fixture_raw))
+        
+        if matches and not self.db.insert_fixtures_bulk(matches, teams.values(),
+                                                         leagues.values(), seasons):
+            return None
+        
+        return [match.id for match in matches if match.status_short == 'FT']
+    
     # ========================================================================
     # PROCESSAMENTO DE ESTATÍSTICAS
     # ========================================================================
@@ -160,61 +148,12 @@ class DataProcessor:
             
             if not stats_raw:
                 print(f"      ⚠️  Sem estatísticas disponíveis")
+                self.db.mark_fixture_fetched(fixture_id, 'stats', found=False)
                 return False
             
-            # Processar estatísticas de cada equipa
-            for team_stats in stats_raw:
-                team_id = team_stats.get('team', {}).get('id')
-                statistics = team_stats.get('statistics', [])
-                
-                # Converter lista de stats para dict
-                stats_dict = {}
-                for stat in statistics:
-                    type_name = stat.get('type', '')
-                    value = stat.get('value')
-                    
-                    # Mapear nomes da API para nomes da BD
-                    mapping = {
-                        'Shots on Goal': 'shots_on_goal',
-                        'Shots off Goal': 'shots_off_goal',
-                        'Total Shots': 'total_shots',
-                        'Blocked Shots': 'blocked_shots',
-                        'Shots insidebox': 'shots_insidebox',
-                        'Shots outsidebox': 'shots_outsidebox',
-                        'Ball Possession': 'ball_possession',
-                        'Total passes': 'total_passes',
-                        'Passes accurate': 'passes_accurate',
-                        'Passes %': 'passes_percentage',
-                        'Corner Kicks': 'corner_kicks',
-                        'Offsides': 'offsides',
-                        'Fouls': 'fouls',
-                        'Yellow Cards': 'yellow_cards',
-                        'Red Cards': 'red_cards',
-                        'Goalkeeper Saves': 'goalkeeper_saves',
-                        'expected_goals': 'expected_goals',
-                    }
-                    
-                    if type_name in mapping:
-                        key = mapping[type_name]
-                        
-                        # Processar valor
-                        if value is None:
-                            stats_dict[key] = None
-                        elif isinstance(value, str) and '%' in value:
-                            # Remover % e converter
-                            stats_dict[key] = int(value.replace('%', ''))
-                        else:
-                            try:
-                                stats_dict[key] = int(value) if value else None
-                            except:
-                                stats_dict[key] = value
-                
-                # Adicionar IDs
-                stats_dict['fixture_id'] = fixture_id
-                stats_dict['team_id'] = team_id
-                
-                # Guardar na BD
-                self.db.insert_fixture_statistics(stats_dict)
+            if not self.save_fixture_statistics(fixture_id, stats_raw):
+                print(f"      ❌ Estatísticas não guardadas")
+                return False
             
             print(f"      ✅ Estatísticas guardadas")
             return True
@@ -223,6 +162,24 @@ class DataProcessor:
             print(f"      ❌ Erro ao processar estatísticas: {e}")
             return False
     
+    def save_fixture_statistics(self, fixture_id: int, stats_raw: List[Dict]) -> bool:
+        """
+        Converter e guardar a resposta de /fixtures/statistics
+        
+        Args:
+            fixture_id: ID do jogo
+            stats_raw: Campo 'response' da API (uma entrada por equipa)
+        
+        Returns:
+            True se guardou (só então o jogo fica marcado no ledger)
+        """
+        # Uma linha por equipa, convertida numa só passagem (STATISTIC_TYPES)
+        if not self.db.insert_fixture_statistics_bulk(statistics_rows(fixture_id, stats_raw)):
+            return False
+        
+        self.db.mark_fixture_fetched(fixture_id, 'stats', found=bool(stats_raw))
+        return True
+    
     # ========================================================================
     # PROCESSAMENTO DE EVENTOS
     # ========================================================================
@@ -246,27 +203,13 @@ class DataProcessor:
             
             if not events_raw:
                 print(f"      ⚠️  Sem eventos disponíveis")
+                self.db.mark_fixture_fetched(fixture_id, 'events', found=False)
                 return False
             
-            # Processar cada evento
-            events_count = 0
-            for event in events_raw:
-                event_data = {
-                    'fixture_id': fixture_id,
-                    'team_id': event.get('team', {}).get('id'),
-                    'time_elapsed': event.get('time', {}).get('elapsed'),
-                    'time_extra': event.get('time', {}).get('extra'),
-                    'type': event.get('type'),
-                    'detail': event.get('detail'),
-                    'player_id': event.get('player', {}).get('id'),
-                    'player_name': event.get('player', {}).get('name'),
-                    'assist_id': event.get('assist', {}).get('id'),
-                    'assist_name': event.get('assist', {}).get('name'),
-                    'comments': event.get('comments'),
-                }
-                
-                self.db.insert_fixture_event(event_data)
-                events_count += 1
+            events_count = self.save_fixture_events(fixture_id, events_raw)
+            if events_count < 0:
+                print(f"      ❌ Eventos não guardados")
+                return False
             
             print(f"      ✅ {events_count} eventos guardados")
             return True
@@ -275,13 +218,116 @@ class DataProcessor:
             print(f"      ❌ Erro ao processar eventos: {e}")
             return False
     
+    def save_fixture_events(self, fixture_id: int, events_raw: List[Dict]) -> int:
+        """
+        Converter e guardar a resposta de /fixtures/events
+        
+        Substitui os eventos já guardados do jogo (evita duplicados ao
+        voltar a processar o mesmo jogo).
+        
+        Returns:
+            Número de eventos guardados (-1 em caso de erro; o jogo não fica
+            marcado no ledger)
+        """
+        events_count = self.db.replace_fixture_events(fixture_id,
+                                                      event_rows(fixture_id, events_raw))
+        if events_count < 0:
+            return -1
+        
+        self.db.mark_fixture_fetched(fixture_id, 'events', found=bool(events_raw))
+        return events_count
+    
+    # ========================================================================
+    # ENRIQUECIMENTO (ledger de fetch)
+    # ========================================================================
+    
+    def enrich_fixtures(self, fixture_ids: List[int],
+                        season: int = CURRENT_SEASON,
+                        stats_last_n: int = None) -> Dict[str, int]:
+        """
+        Buscar estatísticas e eventos só dos jogos que precisam deles
+        
+        Dois filtros, por esta ordem:
+        - ENRICHMENT_POLICY: o que o scoring consome (estatísticas dos
+          últimos jogos de cada equipa, eventos dos jogos com golos)
+        - ledger (fixture_fetch_ledger): o que ainda não foi obtido
+        
+        Args:
+            fixture_ids: IDs de jogos terminados (FT)
+            season: Temporada cujos jogos são enriquecidos (backfill: a
+                temporada em curso de carregamento)
+            stats_last_n: Últimos jogos por equipa com estatísticas
+                (default: ENRICHMENT_POLICY)
+        
+        Returns:
+            {'stats': pedidos, 'events': pedidos,
+             'skipped': jogos já completos, 'not_needed': pedidos evitados pela política}
+        """
+        targets = self.db.get_enrichment_targets(
+            fixture_ids,
+            stats_last_n=stats_last_n or ENRICHMENT_POLICY['stats']['last_n_games'],
+            min_total_goals=ENRICHMENT_POLICY['events']['min_total_goals'],
+            season=season
+        )
+        needs = self.db.get_enrichment_needs(targets)
+        result = {'stats': 0, 'events': 0,
+                  'skipped': len(targets) - len(needs), 'not_needed': 0}
+        
+        for fixture_id, need in needs.items():
+            for kind, process in (('stats', self.process_fixture_statistics),
+                                  ('events', self.process_fixture_events)):
+                if not need[kind]:
+                    continue
+                if targets[fixture_id][kind]:
+                    process(fixture_id)
+                    result[kind] += 1
+                else:
+                    result['not_needed'] += 1
+        
+        if result['skipped'] or result['not_needed']:
+            print(f"      📒 {result['skipped']} jogos já completos, "
+                  f"{result['not_needed']} requests dispensáveis evitados")
+        
+        return result
+    
+    # ========================================================================
+    # REPROCESSAMENTO OFFLINE (arquivo de payloads)
+    # ========================================================================
+    
+    def reprocess_payload(self, endpoint: str, params: Dict, data: Dict) -> int:
+        """
+        Reconstruir dados derivados a partir de uma resposta arquivada
+        
+        Args:
+            endpoint: Endpoint da API (ex.: 'fixtures', 'fixtures/events')
+            params: Parâmetros do request original
+            data: Resposta completa da API
+        
+        Returns:
+            Número de registos processados
+        """
+        response = data.get('response') or []
+        
+        if endpoint in ('fixtures', 'fixtures/headtohead'):
+            return sum(1 for fixture_raw in response
+                       if self.save_fixture_complete(fixture_raw))
+        
+        if endpoint == 'fixtures/statistics' and response:
+            saved = self.save_fixture_statistics(int(params['fixture']), response)
+            return len(response) if saved else 0
+        
+        if endpoint == 'fixtures/events' and response:
+            return max(0, self.save_fixture_events(int(params['fixture']), response))
+        
+        return 0
+    
     # ========================================================================
     # CÁLCULO DE MÉTRICAS AVANÇADAS
     # ========================================================================
     
     def calculate_offensive_pressure_score(self, team_id: int, 
                                           league_id: int,
-                                          last_n_games: int = 5) -> float:
+                                          last_n_games: int = ENRICHMENT_POLICY['stats']['last_n_games']) -> float:
         """
         Calcular score de pressão ofensiva baseado em estatísticas
         
@@ -411,6 +457,98 @@ class DataProcessor:
             print(f"❌ Erro ao calcular distribuição de minutos: {e}")
             return 0
     
+    def get_team_form(self, team_id: int, league_id: int,
+                      last_n_games: int = ANALYSIS_PARAMS['recent_form_games']) -> TeamForm:
+        """
+        Calcular forma recente de uma equipa a partir da BD
+        
+        Args:
+            team_id: ID da equipa
+            league_id: ID da liga
+            last_n_games: Número de jogos
+        
+        Returns:
+            TeamForm com jogos, golos e jogos com golo na 1ª parte / Over 1.5
+        """
+        return self.db.get_team_form(
+            team_id,
+            league_id=league_id,
+            season=CURRENT_SEASON,
+            limit=last_n_games
+        )
+    
+    def get_head_to_head_summary(self, team1_id: int, team2_id: int,
+                                 league_id: int, limit: int = 10) -> HeadToHead:
+        """
+        Calcular resumo dos confrontos diretos a partir da BD
+        
+        Returns:
+            HeadToHead com totais e jogos com golo na 1ª parte / Over 1.5
+        """
+        matches = self.db.get_head_to_head_matches(
+            team1_id,
+            team2_id,
+            league_id=league_id,
+            limit=limit
+        )
+        return HeadToHead.from_matches(team1_id, team2_id, league_id, matches)
+    
+    # ========================================================================
+    # DADOS DE ANÁLISE (formato de ScoringSystem.analyze_match)
+    # ========================================================================
+    
+    def get_matches_analysis_data(self, matches: List[Tuple[int, int, int]]) -> List[Dict]:
+        """
+        Montar analysis_data de vários jogos de uma vez
+        
+        Equipas e pares repetidos no dia são calculados uma única vez e
+        cada tipo de feature (forma, H2H, pressão, distribuição) é obtido
+        com uma única query para todos os jogos.
+        
+        Args:
+            matches: (home_team_id, away_team_id, league_id) de cada jogo
+        
+        Returns:
+            Lista de analysis_data, pela mesma ordem de matches
+        """
+        teams = set()
+        pairs = set()
+        for home, away, league in matches:
+            teams.update(((home, league), (away, league)))
+            pairs.add((home, away, league))
+        
+        forms = self.db.get_team_forms(
+            teams, season=CURRENT_SEASON,
+            limit=ANALYSIS_PARAMS['recent_form_games']
+        )
+        h2h = self.db.get_head_to_head_stats_many(pairs, limit=10)
+        pressure = self.db.get_team_avg_statistics_many(
+            teams, CURRENT_SEASON, ENRICHMENT_POLICY['stats']['last_n_games']
+        )
+        distribution = self.db.get_goals_by_minute_distribution_many(
+            teams, CURRENT_SEASON
+        )
+        
+        return [
+            {
+                'h2h': {'stats': h2h[(home, away, league)]},
+                'home_team': {'stats': forms[(home, league)]},
+                'away_team': {'stats': forms[(away, league)]},
+                'home_pressure': pressure_from_averages(pressure[(home, league)]),
+                'away_pressure': pressure_from_averages(pressure[(away, league)]),
+                'home_distribution': distribution[(home, league)],
+                'away_distribution': distribution[(away, league)],
+            }
+            for home, away, league in matches
+        ]
+    
+    def get_match_analysis_data(self, home_team_id: int, away_team_id: int,
+                                league_id: int) -> Dict:
+        """analysis_data de um único jogo (ver get_matches_analysis_data)"""
+        return self.get_matches_analysis_data(
+            [(home_team_id, away_team_id, league_id)]
+        )[0]
+    
     # ========================================================================
     # ANÁLISE COMPLETA DE JOGO
     # ========================================================================
@@ -442,15 +580,18 @@ class DataProcessor:
             # 2. Guardar fixture
             self.save_fixture_complete(fixture_raw)
             
-            # 3. Buscar estatísticas (se o jogo já terminou)
+            # 3. Buscar estatísticas/eventos em falta (se o jogo já terminou)
             status = fixture_raw.get('fixture', {}).get('status', {}).get('short')
             
-            if status == 'FT' and fetch_stats:
-                self.process_fixture_statistics(fixture_id)
-            
-            # 4. Buscar eventos (se o jogo já terminou)
-            if status == 'FT' and fetch_events:
-                self.process_fixture_events(fixture_id)
+            if status == 'FT':
+                need = self.db.get_enrichment_needs([fixture_id]).get(fixture_id, {})
+                
+                if fetch_stats and need.get('stats'):
+                    self.process_fixture_statistics(fixture_id)
+                
+                # 4. Buscar eventos
+                if fetch_events and need.get('events'):
+                    self.process_fixture_events(fixture_id)
             
             print("✅ Fixture processado com sucesso!")
             
@@ -499,6 +640,75 @@ class DataProcessor:
             print(f"❌ Erro ao buscar jogos de hoje: {e}")
             return []
     
+    def ingest_team_history(self, team_id: int, league_id: int,
+                            last_n_games: int = 10) -> List[int]:
+        """
+        Buscar e guardar os últimos jogos de uma equipa (sem enriquecer)
+        
+        Returns:
+            IDs dos jogos terminados guardados (para enrich_fixtures)
+        """
+        print(f"   📥 Buscando histórico da equipa {team_id}...")
+        
+        # Buscar da API
+        fixtures_raw = self.api.get_team_fixtures(
+            team_id,
+            last=last_n_games,
+            season=CURRENT_SEASON
+        )
+        
+        # Guardar fixtures
+        saved = 0
+        finished = []
+        for fixture_raw in fixtures_raw:
+            # Filtrar apenas jogos da liga especificada
+            if fixture_raw.get('league', {}).get('id') == league_id:
+                if self.save_fixture_complete(fixture_raw):
+                    
+                    # Jogos terminados: enriquecidos depois (só o que falta)
+                    status = fixture_raw.get('fixture', {}).get('status', {}).get('short')
+                    if status == 'FT':
+                        finished.append(fixture_raw.get('fixture', {}).get('id'))
+                    
+                    saved += 1
+        
+        print(f"      ✅ {saved} jogos guardados")
+        return finished
+    
+    def ingest_head_to_head(self, team1_id: int, team2_id: int,
+                            league_id: int) -> List[int]:
+        """
+        Buscar e guardar confrontos diretos (sem enriquecer)
+        
+        Returns:
+            IDs dos jogos terminados guardados (para enrich_fixtures)
+        """
+        print(f"   📥 Buscando confrontos diretos...")
+        
+        # Buscar da API
+        fixtures_raw = self.api.get_head_to_head(
+            team1_id,
+            team2_id,
+            years=ANALYSIS_PARAMS['direct_confrontations_years'],
+            league_id=league_id
+        )
+        
+        # Guardar fixtures
+        saved = 0
+        finished = []
+        for fixture_raw in fixtures_raw:
+            if self.save_fixture_complete(fixture_raw):
+                
+                # Jogos terminados: enriquecidos depois (só o que falta)
+                status = fixture_raw.get('fixture', {}).get('status', {}).get('short')
+                if status == 'FT':
+                    finished.append(fixture_raw.get('fixture', {}).get('id'))
+                
+                saved += 1
+        
+        print(f"      ✅ {saved} confrontos guardados")
+        return finished
+    
     def fetch_team_history(self, team_id: int, league_id: int,
                           last_n_games: int = 10) -> List[Dict]:
         """
@@ -512,34 +722,9 @@ class DataProcessor:
         Returns:
             Lista de jogos
         """
-        print(f"   📥 Buscando histórico da equipa {team_id}...")
-        
         try:
-            # Buscar da API
-            fixtures_raw = self.api.get_team_fixtures(
-                team_id,
-                last=last_n_games,
-                season=CURRENT_SEASON
-            )
-            
-            # Guardar fixtures
-            saved = 0
-            for fixture_raw in fixtures_raw:
-                # Filtrar apenas jogos da liga especificada
-                if fixture_raw.get('league', {}).get('id') == league_id:
-                    if self.save_fixture_complete(fixture_raw):
-                        
-                        # Se jogo terminou, buscar stats e eventos
-                        status = fixture_raw.get('fixture', {}).get('status', {}).get('short')
-                        fixture_id = fixture_raw.get('fixture', {}).get('id')
-                        
-                        if status == 'FT':
-                            self.process_fixture_statistics(fixture_id)
-                            self.process_fixture_events(fixture_id)
-                        
-                        saved += 1
-            
-            print(f"      ✅ {saved} jogos guardados")
+            finished = self.ingest_team_history(team_id, league_id, last_n_games)
+            self.enrich_fixtures(finished)
             
             # Retornar da BD
             return self.db.get_team_fixtures(
@@ -567,33 +752,9 @@ class DataProcessor:
         Returns:
             Lista de confrontos
         """
-        print(f"   📥 Buscando confrontos diretos...")
-        
         try:
-            # Buscar da API
-            fixtures_raw = self.api.get_head_to_head(
-                team1_id,
-                team2_id,
-                years=ANALYSIS_PARAMS['direct_confrontations_years'],
-                league_id=league_id
-            )
-            
-            # Guardar fixtures
-            saved = 0
-            for fixture_raw in fixtures_raw:
-                if self.save_fixture_complete(fixture_raw):
-                    
-                    # Se jogo terminou, buscar stats e eventos
-                    status = fixture_raw.get('fixture', {}).get('status', {}).get('short')
-                    fixture_id = fixture_raw.get('fixture', {}).get('id')
-                    
-                    if status == 'FT':
-                        self.process_fixture_statistics(fixture_id)
-                        self.process_fixture_events(fixture_id)
-                    
-                    saved += 1
-            
-            print(f"      ✅ {saved} confrontos guardados")
+            finished = self.ingest_head_to_head(team1_id, team2_id, league_id)
+            self.enrich_fixtures(finished)
             
             # Retornar da BD
             return self.db.get_head_to_head(
@@ -0,0 +1,388 @@
+"""
+Feature Store - Football Betting AI
+Vetores de features point-in-time por jogo, guardados em ficheiros NumPy
+mapeados em memória (np.memmap) e indexados pelo ID do jogo.
+
+Cada vetor contém exatamente o que ScoringSystem.analyze_match consome
+(forma, H2H, pressão ofensiva e distribuição de golos), calculado apenas
+com jogos anteriores ao pontapé de saída.
+
+Layout do diretório:
+    features.f64  - matriz N x len(FEATURE_NAMES), float64, linha a linha
+    index.i64     - ID do jogo de cada linha (mesma ordem)
+    meta.json     - nomes das features (validação de compatibilidade)
+
+Um único processo escreve (append); qualquer número de processos pode ler,
+partilhando as mesmas páginas através do page cache do sistema.
+"""
+
+from typing import Dict, Iterable, List, Optional
+import json
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from database.models import Match
+from config.config import ANALYSIS_PARAMS, ENRICHMENT_POLICY, FEATURE_STORE_DIR
+
+FEATURE_NAMES = (
+    # Confrontos diretos
+    'h2h_total_matches',
+    'h2h_matches_with_first_half_goal',
+    'h2h_matches_over15',
+    # Forma recente
+    'home_games_played',
+    'home_games_with_first_half_goal',
+    'home_games_over15',
+    'away_games_played',
+    'away_games_with_first_half_goal',
+    'away_games_over15',
+    # Pressão ofensiva (médias dos últimos jogos com estatísticas)
+    'home_pressure_games_count',
+    'home_shots_on_goal_avg',
+    'home_shots_insidebox_avg',
+    'home_corners_avg',
+    'home_possession_avg',
+    'home_dangerous_attacks_avg',
+    'away_pressure_games_count',
+    'away_shots_on_goal_avg',
+    'away_shots_insidebox_avg',
+    'away_corners_avg',
+    'away_possession_avg',
+    'away_dangerous_attacks_avg',
+    # Distribuição de golos por minuto
+    'home_goals_total',
+    'home_first_half_percentage',
+    'away_goals_total',
+    'away_first_half_percentage',
+)
+
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Correspondência entre get_team_avg_statistics e o formato de pressure_data
+PRESSURE_FIELDS = (
+    ('games_count', 'games_count'),
+    ('avg_shots_on_goal', 'shots_on_goal_avg'),
+    ('avg_shots_insidebox', 'shots_insidebox_avg'),
+    ('avg_corners', 'corners_avg'),
+    ('avg_possession', 'possession_avg'),
+    ('avg_dangerous_attacks', 'dangerous_attacks_avg'),
+)
+
+PRESSURE_GAMES = ENRICHMENT_POLICY['stats']['last_n_games']  # Jogos usados pela pressão ofensiva
+
+
+def pressure_from_averages(averages: Dict) -> Dict:
+    """Converter resultado de get_team_avg_statistics para pressure_data"""
+    return {
+        target: averages.get(source) or 0
+        for source, target in PRESSURE_FIELDS
+    }
+
+
+def features_to_analysis_data(vector: np.ndarray) -> Dict:
+    """
+    Reconstruir o dict analysis_data esperado por ScoringSystem.analyze_match
+
+    Args:
+        vector: Linha do feature store (len(FEATURE_NAMES) valores)
+    """
+    f = {name: vector[i].item() for i, name in enumerate(FEATURE_NAMES)}
+
+    def pressure(prefix):
+        data = {'games_count': f[f'{prefix}_pressure_games_count']}
+        for _, target in PRESSURE_FIELDS[1:]:
+            data[target] = f[f'{prefix}_{target}']
+        return data
+
+    return {
+        'h2h': {'stats': {
+            'total_matches': int(f['h2h_total_matches']),
+            'matches_with_first_half_goal': int(f['h2h_matches_with_first_half_goal']),
+            'matches_over15': int(f['h2h_matches_over15']),
+        }},
+        'home_team': {'stats': {
+            'games_played': int(f['home_games_played']),
+            'games_with_first_half_goal': int(f['home_games_with_first_half_goal']),
+            'games_over15': int(f['home_games_over15']),
+        }},
+        'away_team': {'stats': {
+            'games_played': int(f['away_games_played']),
+            'games_with_first_half_goal': int(f['away_games_with_first_half_goal']),
+            'games_over15': int(f['away_games_over15']),
+        }},
+        'home_pressure': pressure('home'),
+        'away_pressure': pressure('away'),
+        'home_distribution': {
+            'total': int(f['home_goals_total']),
+            'first_half_percentage': f['home_first_half_percentage'],
+        },
+        'away_distribution': {
+            'total': int(f['away_goals_total']),
+            'first_half_percentage': f['away_first_half_percentage'],
+        },
+    }
+
+
+class FeatureBuilder:
+    """Calcula vetores de features point-in-time a partir da BD"""
+
+    def __init__(self, db: DatabaseManager = None):
+        self.db = db or DatabaseManager()
+        self.form_games = ANALYSIS_PARAMS['recent_form_games']
+
+    def build(self, match: Match) -> np.ndarray:
+        """
+        Calcular o vetor de features de um jogo
+
+        Apenas jogos com data anterior a match.date entram no cálculo.
+        """
+        vector = np.zeros(len(FEATURE_NAMES), dtype=np.float64)
+
+        def put(name, value):
+            vector[FEATURE_INDEX[name]] = value or 0
+
+        home, away = match.home_team_id, match.away_team_id
+        league, season, before = match.league_id, match.season, match.date
+
+        h2h = self.db.get_head_to_head_stats(
+            home, away, league_id=league, limit=10, before_date=before
+        )
+        put('h2h_total_matches', h2h.total_matches)
+        put('h2h_matches_with_first_half_goal', h2h.matches_with_first_half_goal)
+        put('h2h_matches_over15', h2h.matches_over15)
+
+        for prefix, team_id in (('home', home), ('away', away)):
+            form = self.db.get_team_form(
+                team_id, league_id=league, season=season,
+                limit=self.form_games, before_date=before
+            )
+            put(f'{prefix}_games_played', form.games_played)
+            put(f'{prefix}_games_with_first_half_goal', form.games_with_first_half_goal)
+            put(f'{prefix}_games_over15', form.games_over15)
+
+            pressure = pressure_from_averages(self.db.get_team_avg_statistics(
+                team_id, league, season, PRESSURE_GAMES, before_date=before
+            ))
+            put(f'{prefix}_pressure_games_count', pressure['games_count'])
+            for _, target in PRESSURE_FIELDS[1:]:
+                put(f'{prefix}_{target}', pressure[target])
+
+            distribution = self.db.get_goals_by_minute_distribution(
+                team_id, league, season, before_date=before
+            )
+            put(f'{prefix}_goals_total', distribution.get('total'))
+            put(f'{prefix}_first_half_percentage',
+                distribution.get('first_half_percentage'))
+
+        return vector
+
+
+class FeatureStore:
+    """Armazenamento append-only de features em ficheiros memory-mapped"""
+
+    def __init__(self, directory: str = FEATURE_STORE_DIR):
+        self.directory = directory
+        self.features_path = os.path.join(directory, 'features.f64')
+        self.index_path = os.path.join(directory, 'index.i64')
+        self.meta_path = os.path.join(directory, 'meta.json')
+        self.width = len(FEATURE_NAMES)
+
+        os.makedirs(directory, exist_ok=True)
+        self._check_meta()
+        self._repair()
+
+        self._features = None
+        self._ids = None
+        self._positions: Dict[int, int] = {}
+        self.refresh()
+
+    def _check_meta(self):
+        """Garantir que os ficheiros existentes usam as mesmas features"""
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                names = json.load(f).get('features', [])
+            if tuple(names) != FEATURE_NAMES:
+                raise ValueError(
+                    f"Feature store em {self.directory} usa outras features; "
+                    "apague o diretório para o reconstruir"
+                )
+        else:
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'features': list(FEATURE_NAMES)}, f, indent=2)
+
+    def _repair(self) -> bool:
+        """
+        Alinhar features.f64 com index.i64 depois de um append interrompido
+
+        Cada linha de índice tem de corresponder a uma linha de features:
+        o excedente de qualquer um dos ficheiros (linhas ou bytes soltos) é
+        cortado, senão o append seguinte ficava desalinhado. refresh() não
+        corta nada porque os leitores o chamam enquanto o escritor acrescenta.
+        """
+        def size(path):
+            return os.path.getsize(path) if os.path.exists(path) else 0
+
+        row_bytes = 8 * self.width
+        rows = min(size(self.index_path) // 8, size(self.features_path) // row_bytes)
+
+        repaired = False
+        for path, expected in ((self.features_path, rows * row_bytes),
+                               (self.index_path, rows * 8)):
+            if size(path) != expected:
+                print(f"⚠️  Feature store: {os.path.basename(path)} cortado para {rows} linhas")
+                os.truncate(path, expected)
+                repaired = True
+        return repaired
+
+    # ========================================================================
+    # LEITURA (zero-copy)
+    # ========================================================================
+
+    def refresh(self):
+        """Remapear os ficheiros (ver linhas acrescentadas por outro processo)"""
+        rows = 0
+        if os.path.exists(self.index_path) and os.path.exists(self.features_path):
+            rows = min(
+                os.path.getsize(self.index_path) // 8,
+                os.path.getsize(self.features_path) // (8 * self.width)
+            )
+
+        if rows == 0:
+            self._ids = np.empty(0, dtype=np.int64)
+            self._features = np.empty((0, self.width), dtype=np.float64)
+            self._positions = {}
+            return
+
+        self._ids = np.memmap(self.index_path, dtype=np.int64, mode='r', shape=(rows,))
+        self._features = np.memmap(self.features_path, dtype=np.float64, mode='r',
+                                   shape=(rows, self.width))
+        self._positions = {int(fid): i for i, fid in enumerate(self._ids)}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, fixture_id: int) -> bool:
+        return fixture_id in self._positions
+
+    def get(self, fixture_id: int) -> Optional[np.ndarray]:
+        """Vetor de features de um jogo (view read-only sobre o memmap)"""
+        position = self._positions.get(fixture_id)
+        if position is None:
+            return None
+        return self._features[position]
+
+    def matrix(self, fixture_ids: Iterable[int] = None) -> np.ndarray:
+        """
+        Matriz de features
+
+        Args:
+            fixture_ids: IDs a selecionar (None = matriz completa, sem cópia)
+        """
+        if fixture_ids is None:
+            return self._features
+        return self._features[[self._positions[fid] for fid in fixture_ids]]
+
+    def fixture_ids(self) -> np.ndarray:
+        return self._ids
+
+    def get_analysis_data(self, fixture_id: int) -> Optional[Dict]:
+        """analysis_data pronto para ScoringSystem.analyze_match"""
+        vector = self.get(fixture_id)
+        return features_to_analysis_data(vector) if vector is not None else None
+
+    # ========================================================================
+    # ESCRITA (append incremental)
+    # ========================================================================
+
+    def append(self, fixture_ids: List[int], vectors: np.ndarray) -> int:
+        """
+        Acrescentar vetores ao store (IDs já existentes são ignorados)
+
+        Returns:
+            Número de linhas acrescentadas
+        """
+        vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, self.width)
+        keep, seen = [], set(self._positions)
+        for i, fid in enumerate(fixture_ids):
+            if fid not in seen:  # Também IDs repetidos no mesmo lote
+                seen.add(fid)
+                keep.append(i)
+        if not keep:
+            return 0
+
+        ids = np.asarray([fixture_ids[i] for i in keep], dtype=np.int64)
+
+        # Um append anterior interrompido não pode desalinhar este
+        if self._repair():
+            self.refresh()
+
+        # Features primeiro, índice depois: um leitor nunca vê um ID sem vetor
+        with open(self.features_path, 'ab') as f:
+            f.write(np.ascontiguousarray(vectors[keep]).tobytes())
+        with open(self.index_path, 'ab') as f:
+            f.write(ids.tobytes())
+
+        self.refresh()
+        return len(keep)
+
+    def build_missing(self, matches: Iterable[Match],
+                      builder: FeatureBuilder = None,
+                      batch_size: int = 500) -> int:
+        """
+        Calcular e guardar features dos jogos que ainda não estão no store
+
+        Args:
+            matches: Jogos a processar (ex.: db.iter_*(model=Match))
+            builder: FeatureBuilder (default: sobre a BD por defeito)
+            batch_size: Vetores acumulados antes de cada escrita
+
+        Returns:
+            Número de jogos acrescentados
+        """
+        builder = builder or FeatureBuilder()
+        added = 0
+        ids, vectors = [], []
+
+        for match in matches:
+            if match.id in self._positions:
+                continue
+            ids.append(match.id)
+            vectors.append(builder.build(match))
+
+            if len(ids) >= batch_size:
+                added += self.append(ids, np.vstack(vectors))
+                ids, vectors = [], []
+
+        if ids:
+            added += self.append(ids, np.vstack(vectors))
+
+        return added
+
+
+# ============================================================================
+# Teste do Feature Store
+# ============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+    from config.config import DATABASE_PATH
+
+    print("\n" + "="*80)
+    print("🧪 TESTE DO FEATURE STORE")
+    print("="*80 + "\n")
+
+    # Cópia em memória da BD e store temporário: nada é escrito no repositório
+    db = DatabaseManager.in_memory(DATABASE_PATH)
+    with tempfile.TemporaryDirectory() as directory:
+        store = FeatureStore(directory)
+
+        matches = db.iter_fixtures(status='FT', model=Match)
+        added = store.build_missing(matches, FeatureBuilder(db))
+
+        print(f"📦 {added} jogos acrescentados | total no store: {len(store)}")
+    db.close()
+    print("\n✅ Feature Store testado com sucesso!")
@@ -0,0 +1,179 @@
+"""
+Match-Day Planner - Football Betting AI
+Grafo de dependências dos jogos do dia: cada equipa, par de equipas e jogo
+a enriquecer é um nó, partilhado por todos os jogos que dele dependem. O
+planner só planeia e orçamenta; quem busca cada nó uma única vez é o
+MatchDayPipeline (analysis/pipeline.py).
+
+    jogo ──► (equipa casa, liga) ─┐
+         ├─► (equipa fora, liga) ─┼─► jogos terminados a enriquecer
+         └─► (par, liga) ─────────┘
+
+Antes de gastar pedidos, o plano estima o custo de cada jogo (pedidos de
+histórico de nós ainda não contados + estatísticas/eventos em dívida no
+ledger) e, por ordem de pontapé de saída, escolhe o modo de cada jogo:
+
+    full     histórico + enriquecimento
+    history  só histórico (o orçamento não chega para enriquecer)
+    cached   nenhum pedido: analisado com o que já está na BD
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.data_processor import DataProcessor
+from config.config import ANALYSIS_PARAMS, API_REQUESTS_PER_DAY, ENRICHMENT_POLICY
+
+MATCH_MODES = ('full', 'history', 'cached')
+
+
+@dataclass
+class MatchDayPlan:
+    """Grafo de dependências de um dia de jogos"""
+    fixtures: List[Tuple[Dict, str]] = field(default_factory=list)  # (fixture da API, nome da liga)
+    matches: List[Tuple[int, int, int]] = field(default_factory=list)  # (casa, fora, liga) por jogo
+
+    # Nó -> índices dos jogos que dependem dele
+    teams: Dict[Tuple[int, int], List[int]] = field(default_factory=dict)
+    pairs: Dict[Tuple[int, int, int], List[int]] = field(default_factory=dict)
+
+    # Orçamento (preenchido por MatchDayPlanner.budget)
+    order: List[int] = field(default_factory=list)      # Índices por pontapé de saída
+    modes: List[str] = field(default_factory=list)      # MATCH_MODES por jogo
+    estimates: List[int] = field(default_factory=list)  # Pedidos marginais por jogo
+    budget: Optional[int] = None
+    actual_requests: Optional[int] = None
+
+    @property
+    def naive_requests(self) -> int:
+        """Pedidos de histórico sem deduplicação (2 equipas + 1 H2H por jogo)"""
+        return 3 * len(self.matches)
+
+    @property
+    def planned_requests(self) -> int:
+        return len(self.teams) + len(self.pairs)
+
+    @property
+    def estimated_requests(self) -> int:
+        """Pedidos estimados para os modos escolhidos"""
+        return sum(self.estimates)
+
+    def mode(self, index: int) -> str:
+        """Modo de um jogo (sem orçamento: full)"""
+        return self.modes[index] if self.modes else 'full'
+
+
+class MatchDayPlanner:
+    """Constrói e executa o plano de fetch dos jogos do dia"""
+
+    def __init__(self, processor: DataProcessor = None):
+        self.processor = processor or DataProcessor()
+
+    def build(self, fixtures: List[Tuple[Dict, str]]) -> MatchDayPlan:
+        """
+        Construir o grafo a partir dos jogos do dia
+
+        Args:
+            fixtures: (fixture da API, nome da liga) de cada jogo
+        """
+        plan = MatchDayPlan(fixtures=list(fixtures))
+
+        for index, (fixture, _) in enumerate(plan.fixtures):
+            teams = fixture.get('teams', {})
+            home = teams.get('home', {}).get('id')
+            away = teams.get('away', {}).get('id')
+            league = fixture.get('league', {}).get('id')
+            plan.matches.append((home, away, league))
+
+            plan.teams.setdefault((home, league), []).append(index)
+            plan.teams.setdefault((away, league), []).append(index)
+            # (A, B) e (B, A) têm os mesmos confrontos diretos
+            pair = (min(home, away), max(home, away), league)
+            plan.pairs.setdefault(pair, []).append(index)
+
+        # Ordem de trabalho: pontapé de saída (jogos mais cedo primeiro)
+        plan.order = sorted(
+            range(len(plan.fixtures)),
+            key=lambda i: (plan.fixtures[i][0].get('fixture', {}).get('timestamp') or 0, i)
+        )
+        return plan
+
+    def remaining_quota(self) -> int:
+        """Pedidos ainda disponíveis hoje (status da API ou, sem ele, api_usage)"""
+        api = self.processor.api
+        api.get_api_status()
+        if api.daily_remaining is not None:
+            return api.daily_remaining
+        return max(0, API_REQUESTS_PER_DAY - sum(self.processor.db.get_api_usage().values()))
+
+    def budget(self, plan: MatchDayPlan, budget: int = None) -> MatchDayPlan:
+        """
+        Estimar o custo de cada jogo e escolher o seu modo dentro do orçamento
+
+        Os jogos são percorridos por pontapé de saída; cada um paga só os nós
+        (equipas, pares, enriquecimento de equipas) ainda não pagos por um
+        jogo anterior. Quando o orçamento não chega, o jogo perde primeiro o
+        enriquecimento e depois o histórico.
+
+        Args:
+            budget: Pedidos disponíveis (default: quota restante do dia)
+        """
+        plan.budget = self.remaining_quota() if budget is None else budget
+
+        backlog = self.processor.db.get_enrichment_backlog(
+            plan.teams,
+            stats_last_n=ENRICHMENT_POLICY['stats']['last_n_games'],
+            min_total_goals=ENRICHMENT_POLICY['events']['min_total_goals']
+        )
+        h2h_cost = ANALYSIS_PARAMS['direct_confrontations_years']  # Um pedido por temporada
+
+        plan.modes = ['cached'] * len(plan.matches)
+        plan.estimates = [0] * len(plan.matches)
+        fetched, enriched, pairs = set(), set(), set()
+        spent = 0
+
+        for index in plan.order:
+            home, away, league = plan.matches[index]
+            teams = [(home, league), (away, league)]
+            pair = (min(home, away), max(home, away), league)
+
+            history = sum(1 for key in teams if key not in fetched)
+            history += h2h_cost if pair not in pairs else 0
+            enrichment = sum(backlog.get(key, 0) for key in teams if key not in enriched)
+
+            if spent + history + enrichment <= plan.budget:
+                mode, cost = 'full', history + enrichment
+                enriched.update(teams)
+            elif spent + history <= plan.budget:
+                mode, cost = 'history', history
+            else:
+                continue
+
+            fetched.update(teams)
+            pairs.add(pair)
+            plan.modes[index] = mode
+            plan.estimates[index] = cost
+            spent += cost
+
+        return plan
+
+    def print_budget(self, plan: MatchDayPlan):
+        """Resumo do plano e do orçamento antes de começar"""
+        print(f"🗺️  Plano do dia: {len(plan.matches)} jogos → "
+              f"{len(plan.teams)} equipas + {len(plan.pairs)} pares "
+              f"({plan.naive_requests - plan.planned_requests} pedidos evitados)")
+        counts = {mode: plan.modes.count(mode) for mode in MATCH_MODES}
+        print(f"🧮 Orçamento: ~{plan.estimated_requests} pedidos estimados "
+              f"de {plan.budget} disponíveis | {counts['full']} completos, "
+              f"{counts['history']} sem enriquecimento, {counts['cached']} só com a BD\n")
+
+    def report(self, plan: MatchDayPlan):
+        """Plano vs. custo real (plan.actual_requests preenchido por quem executou)"""
+        if plan.actual_requests is None:
+            return
+        diff = plan.actual_requests - plan.estimated_requests
+        print(f"\n🧾 Pedidos: estimados {plan.estimated_requests} | reais {plan.actual_requests} "
+              f"({diff:+d}) | orçamento {plan.budget}")
@@ -0,0 +1,385 @@
+"""
+Pipeline de Jogos do Dia - Football Betting AI
+Estágios ligados por filas limitadas, cada um com os seus workers:
+
+    descobrir ─► histórico ─► enriquecer ─► score ─► guardar ─► emitir
+    (ligas)      (equipas,     (estatísticas  (analysis  (predictions)
+                  pares)        e eventos)     _data)
+
+O estágio score reutiliza a previsão guardada quando nenhuma das equipas
+mudou desde o cálculo (dirty_teams); só as outras são recalculadas e escritas.
+Os jogos que já esperam na fila são pontuados em lote (score_batch) com um
+único get_matches_analysis_data; com a fila vazia, cada jogo segue sozinho.
+
+Cada jogo avança assim que os seus dados estão prontos: a primeira previsão
+sai sem esperar pelos restantes jogos do dia. Equipas, pares e jogos a
+enriquecer partilhados por vários jogos são obtidos uma única vez
+(_OnceRegistry); o ritmo global fica limitado pelo rate limit do cliente.
+
+Com um MatchDayPlan orçamentado, a descoberta é substituída pelos jogos do
+plano (por pontapé de saída) e o modo de cada jogo decide que estágios
+gastam pedidos.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import queue
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis.data_processor import DataProcessor
+from analysis.match_day import MatchDayPlan
+from config.config import ANALYSIS_PARAMS, LEAGUES, PIPELINE_PARAMS
+
+_DONE = object()  # Fim do fluxo (propagado estágio a estágio)
+_POLL_SECONDS = 0.1  # Filas bloqueadas verificam a cada intervalo se o pipeline parou
+
+
+class _OnceRegistry:
+    """
+    Executa cada chave uma única vez; chamadas concorrentes esperam pelo resultado
+
+    Só uma execução com sucesso conta: se func falha, a chave é libertada e
+    quem estava à espera (ou chega depois) tenta de novo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: Dict = {}
+        self._results: Dict = {}
+
+    def _claim(self, keys: Iterable):
+        """(chaves reclamadas por quem chama, [(chave, evento)] de outros)"""
+        owned, pending = [], []
+        with self._lock:
+            for key in keys:
+                event = self._events.get(key)
+                if event is None:
+                    self._events[key] = threading.Event()
+                    owned.append(key)
+                else:
+                    pending.append((key, event))
+        return owned, pending
+
+    def _release(self, keys: List, success: bool):
+        with self._lock:
+            events = [self._events[key] for key in keys]
+            if not success:
+                for key in keys:
+                    del self._events[key]
+        for event in events:
+            event.set()
+
+    def _failed(self, pending: List) -> List:
+        """Chaves cujo dono falhou (evento já não registado)"""
+        with self._lock:
+            return [key for key, event in pending if self._events.get(key) is not event]
+
+    def run(self, key, func: Callable):
+        while True:
+            owned, pending = self._claim([key])
+            if owned:
+                try:
+                    self._results[key] = func()
+                except BaseException:
+                    self._release(owned, success=False)
+                    raise
+                self._release(owned, success=True)
+                return self._results[key]
+
+            pending[0][1].wait()
+            if not self._failed(pending):
+                return self._results.get(key)
+
+    def run_many(self, keys: Iterable, func: Callable[[List], None]):
+        """Executar func uma vez com as chaves ainda não reclamadas e esperar pelas outras"""
+        keys = list(keys)
+        while keys:
+            owned, pending = self._claim(keys)
+            if owned:
+                try:
+                    func(owned)
+                except BaseException:
+                    self._release(owned, success=False)
+                    raise
+                self._release(owned, success=True)
+
+            for _, event in pending:
+                event.wait()
+            keys = self._failed(pending)
+
+
+class _Stage:
+    """Conjunto de workers que consome inbox e produz para outbox"""
+
+    def __init__(self, name: str, func: Callable, workers: int,
+                 inbox: queue.Queue, outbox: queue.Queue, batch: int = 1,
+                 stop: threading.Event = None):
+        self.name = name
+        self.func = func  # item (ou lista de itens, com batch) -> iterável de itens
+        self.inbox = inbox
+        self.outbox = outbox
+        self.batch = batch
+        self.stop = stop or threading.Event()  # Consumidor desistiu: sair sem esperar
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+    def _get(self):
+        """Próximo item da inbox (_DONE se o pipeline parou)"""
+        while not self.stop.is_set():
+            try:
+                return self.inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        """Pôr item numa fila limitada; False se o pipeline parou com a fila cheia"""
+        while not self.stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _next(self):
+        """Próximo item ou, com batch, o próximo mais os que já estão na fila"""
+        item = self._get()
+        if self.batch == 1 or item is _DONE:
+            return item
+
+        # Nunca espera por mais: sem fila, o lote é só este item
+        items = [item]
+        while len(items) < self.batch:
+            try:
+                item = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                self._put(self.inbox, _DONE)
+                break
+            items.append(item)
+        return items
+
+    def _work(self):
+        while True:
+            item = self._next()
+
+            if item is _DONE:
+                if self.stop.is_set():
+                    return
+                with self._lock:
+                    self._remaining -= 1
+                    last = self._remaining == 0
+                # O último worker a terminar avisa o estágio seguinte
+                if last:
+                    self._put(self.outbox, _DONE)
+                else:
+                    self._put(self.inbox, _DONE)
+                return
+
+            try:
+                for output in self.func(item):
+                    if not self._put(self.outbox, output):
+                        return
+            except Exception as e:
+                print(f"   ❌ Erro no estágio {self.name}: {e}")
+
+
+class MatchDayPipeline:
+    """Pipeline de streaming fetch → persist → score dos jogos do dia"""
+
+    def __init__(self, processor: DataProcessor,
+                 score_fn: Callable[..., Dict],
+                 persist_fn: Callable[[Dict], Dict],
+                 reuse_fn: Callable[[Dict], Optional[Dict]] = None,
+                 params: Dict = None):
+        """
+        Args:
+            processor: DataProcessor (API + BD)
+            score_fn: (fixture, league_name, analysis_data, input_seq=) -> previsão
+            persist_fn: previsão -> previsão guardada
+            reuse_fn: fixture -> previsão guardada ainda atual (None = recalcular)
+            params: Workers e tamanho das filas (default: PIPELINE_PARAMS)
+        """
+        self.processor = processor
+        self.score_fn = score_fn
+        self.persist_fn = persist_fn
+        self.reuse_fn = reuse_fn
+        self.counts = {'recomputed': 0, 'reused': 0}  # Atualizado só pelo estágio guardar
+        self.params = {**PIPELINE_PARAMS, **(params or {})}
+        self.form_games = ANALYSIS_PARAMS['recent_form_games']
+        self.league_names = {league_id: name for name, league_id in LEAGUES.items()}
+
+        self._teams = _OnceRegistry()
+        self._pairs = _OnceRegistry()
+        self._enriched = _OnceRegistry()
+
+    # ========================================================================
+    # ESTÁGIOS (item -> iterável de itens)
+    # ========================================================================
+
+    def _discover(self, league_id: int) -> Iterator[Dict]:
+        league_name = self.league_names.get(league_id, str(league_id))
+        fixtures = self.processor.api.get_today_fixtures(league_id)
+
+        if not fixtures:
+            print(f"   ℹ️  {league_name}: sem jogos hoje")
+            return
+
+        print(f"   📋 {league_name}: {len(fixtures)} jogos")
+        for fixture in fixtures:
+            teams = fixture.get('teams', {})
+            yield {
+                'fixture': fixture,
+                'league_name': league_name,
+                'home': teams.get('home', {}).get('id'),
+                'away': teams.get('away', {}).get('id'),
+                'league': fixture.get('league', {}).get('id'),
+            }
+
+    def _planned(self, item: Dict) -> Iterator[Dict]:
+        yield item
+
+    def _history(self, item: Dict) -> Iterator[Dict]:
+        home, away, league = item['home'], item['away'], item['league']
+        to_enrich = set()
+        item['to_enrich'] = []
+
+        if item.get('mode') == 'cached':
+            yield item
+            return
+
+        for team_id in (home, away):
+            to_enrich.update(self._teams.run(
+                (team_id, league),
+                lambda team_id=team_id: self.processor.ingest_team_history(
+                    team_id, league, self.form_games
+                )
+            ) or [])
+
+        # (A, B) e (B, A) têm os mesmos confrontos diretos
+        pair = (min(home, away), max(home, away), league)
+        to_enrich.update(self._pairs.run(
+            pair, lambda: self.processor.ingest_head_to_head(home, away, league)
+        ) or [])
+
+        item['to_enrich'] = sorted(to_enrich)
+        yield item
+
+    def _enrich(self, item: Dict) -> Iterator[Dict]:
+        if item.get('mode', 'full') == 'full':
+            self._enriched.run_many(item['to_enrich'], self.processor.enrich_fixtures)
+        yield item
+
+    def _score(self, items: List[Dict]) -> Iterator[Dict]:
+        # Dirty set: sem alterações nas equipas, a previsão guardada serve
+        pending = []
+        for item in items:
+            prediction = self.reuse_fn(item['fixture']) if self.reuse_fn else None
+            if prediction:
+                yield {'prediction': prediction, 'fresh': False}
+            else:
+                pending.append(item)
+        if not pending:
+            return
+
+        # Sequência lida antes dos dados: uma alteração pelo meio força novo cálculo
+        input_seq = self.processor.db.get_change_seq()
+        # Um lote, um get_matches_analysis_data (equipas/pares repetidos só uma vez)
+        analysis_data = self.processor.get_matches_analysis_data(
+            [(item['home'], item['away'], item['league']) for item in pending]
+        )
+        for item, data in zip(pending, analysis_data):
+            try:
+                prediction = self.score_fn(item['fixture'], item['league_name'], data,
+                                           input_seq=input_seq)
+            except Exception as e:
+                print(f"   ❌ Erro ao pontuar {item['fixture'].get('fixture', {}).get('id')}: {e}")
+                continue
+            if prediction:
+                yield {'prediction': prediction, 'fresh': True}
+
+    def _persist(self, scored: Dict) -> Iterator[Dict]:
+        if scored['fresh']:
+            self.counts['recomputed'] += 1
+            yield self.persist_fn(scored['prediction'])
+        else:
+            self.counts['reused'] += 1
+            yield scored['prediction']
+
+    # ========================================================================
+    # EXECUÇÃO
+    # ========================================================================
+
+    def run(self, league_ids: List[int] = None,
+            plan: MatchDayPlan = None) -> Iterator[Dict]:
+        """
+        Correr o pipeline e devolver cada previsão assim que fica guardada
+
+        Args:
+            league_ids: Ligas a analisar (descobre os jogos de hoje)
+            plan: Jogos já descobertos e orçamentados (substitui league_ids)
+
+        Yields:
+            Previsões, pela ordem em que terminam
+        """
+        size = self.params['queue_size']
+        stop = threading.Event()
+        sources = queue.Queue()
+        queues = [queue.Queue(maxsize=size) for _ in range(5)]
+
+        if plan is not None:
+            first = _Stage('plano', self._planned, 1, sources, queues[0], stop=stop)
+            for index in plan.order:
+                fixture, league_name = plan.fixtures[index]
+                home, away, league = plan.matches[index]
+                sources.put({'fixture': fixture, 'league_name': league_name,
+                             'home': home, 'away': away, 'league': league,
+                             'mode': plan.mode(index)})
+        else:
+            first = _Stage('descobrir', self._discover, 1, sources, queues[0], stop=stop)
+            for league_id in league_ids or []:
+                sources.put(league_id)
+        sources.put(_DONE)
+
+        stages = [
+            first,
+            _Stage('histórico', self._history, self.params['history_workers'], queues[0], queues[1],
+                   stop=stop),
+            _Stage('enriquecer', self._enrich, self.params['enrich_workers'], queues[1], queues[2],
+                   stop=stop),
+            _Stage('score', self._score, self.params['score_workers'], queues[2], queues[3],
+                   batch=self.params['score_batch'], stop=stop),
+            _Stage('guardar', self._persist, 1, queues[3], queues[4], stop=stop),
+        ]
+        for stage in stages:
+            stage.start()
+
+        try:
+            while True:
+                prediction = queues[4].get()
+                if prediction is _DONE:
+                    return
+                yield prediction
+        finally:
+            # Gerador fechado a meio (break/close): sem isto os workers ficavam
+            # bloqueados para sempre em filas cheias. Cada um acaba o item em
+            # curso e sai; esperar por eles deixa contagens e BD estáveis.
+            stop.set()
+            for stage in stages:
+                stage.join()
@@ -4,12 +4,20 @@ Avalia probabilidade de Over 0.5 HT e Over 1.5 FT
 Inclui métricas avançadas: Pressão Ofensiva e Distribuição de Minutos
 """
 
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Union
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.config import SCORING_WEIGHTS, ALERT_THRESHOLDS
+from database.models import TeamForm, HeadToHead
+
+
+def _stat(stats, key: str, default=0):
+    """Ler campo de estatísticas, seja dict ou modelo (TeamForm/HeadToHead)"""
+    if isinstance(stats, dict):
+        return stats.get(key, default)
+    return getattr(stats, key, default)
 
 class ScoringSystem:
     """Sistema de pontuação para avaliar jogos"""
@@ -23,23 +31,23 @@ class ScoringSystem:
     # COMPONENTES DO SCORE - OVER 0.5 HT
     # ========================================================================
     
-    def calculate_h2h_score(self, h2h_stats: Dict) -> Tuple[float, str]:
+    def calculate_h2h_score(self, h2h_stats: Union[Dict, HeadToHead]) -> Tuple[float, str]:
         """
         Calcular score baseado nos confrontos diretos (OVER 0.5 HT)
         
         Args:
-            h2h_stats: Estatísticas dos confrontos diretos
+            h2h_stats: Estatísticas dos confrontos diretos (dict ou HeadToHead)
         
         Returns:
             Tuple com (score 0-100, explicação)
         """
-        total_matches = h2h_stats.get('total_matches', 0)
+        total_matches = _stat(h2h_stats, 'total_matches')
         
         if total_matches == 0:
             return 0, "Sem histórico de confrontos diretos"
         
         # Score = Percentagem de jogos com golo na 1ª parte
-        matches_with_goal = h2h_stats.get('matches_with_first_half_goal', 0)
+        matches_with_goal = _stat(h2h_stats, 'matches_with_first_half_goal')
         percentage = (matches_with_goal / total_matches) * 100
         
         score = percentage
@@ -55,24 +63,25 @@ class ScoringSystem:
         
         return round(score, 2), explanation
     
-    def calculate_team_form_score(self, team_stats: Dict, is_home: bool = True) -> Tuple[float, str]:
+    def calculate_team_form_score(self, team_stats: Union[Dict, TeamForm],
+                                  is_home: bool = True) -> Tuple[float, str]:
         """
         Calcular score baseado na forma recente (OVER 0.5 HT)
         
         Args:
-            team_stats: Estatísticas da equipa
+            team_stats: Estatísticas da equipa (dict ou TeamForm)
             is_home: Se é a equipa da casa
         
         Returns:
             Tuple com (score 0-100, explicação)
         """
-        games_played = team_stats.get('games_played', 0)
+        games_played = _stat(team_stats, 'games_played')
         
         if games_played == 0:
             return 0, "Sem dados de forma recente"
         
         # Score = Percentagem de jogos com golo na 1ª parte
-        games_with_goal = team_stats.get('games_with_first_half_goal', 0)
+        games_with_goal = _stat(team_stats, 'games_with_first_half_goal')
         percentage = (games_with_goal / games_played) * 100
         
         score = percentage
@@ -218,14 +227,14 @@ class ScoringSystem:
     # COMPONENTES DO SCORE - OVER 1.5 FT
     # ========================================================================
     
-    def calculate_h2h_score_over15(self, h2h_stats: Dict) -> Tuple[float, str]:
+    def calculate_h2h_score_over15(self, h2h_stats: Union[Dict, HeadToHead]) -> Tuple[float, str]:
         """Calcular score H2H para Over 1.5 FT"""
-        total_matches = h2h_stats.get('total_matches', 0)
+        total_matches = _stat(h2h_stats, 'total_matches')
         
         if total_matches == 0:
             return 0, "Sem histórico de confrontos diretos"
         
-        matches_over15 = h2h_stats.get('matches_over15', 0)
+        matches_over15 = _stat(h2h_stats, 'matches_over15')
         percentage = (matches_over15 / total_matches) * 100
         
         score = percentage
@@ -240,14 +249,15 @@ class ScoringSystem:
         
         return round(score, 2), explanation
     
-    def calculate_team_form_score_over15(self, team_stats: Dict, is_home: bool = True) -> Tuple[float, str]:
+    def calculate_team_form_score_over15(self, team_stats: Union[Dict, TeamForm],
+                                         is_home: bool = True) -> Tuple[float, str]:
         """Calcular score de forma para Over 1.5 FT"""
-        games_played = team_stats.get('games_played', 0)
+        games_played = _stat(team_stats, 'games_played')
         
         if games_played == 0:
             return 0, "Sem dados de forma recente"
         
-        games_over15 = team_stats.get('games_over15', 0)
+        games_over15 = _stat(team_stats, 'games_over15')
         percentage = (games_over15 / games_played) * 100
         
         score = percentage
@@ -457,6 +467,19 @@ class ScoringSystem:
             'reasoning': reasoning,
         }
     
+    def analyze_features(self, features) -> Dict:
+        """
+        Analisar um jogo a partir de um vetor do FeatureStore
+        
+        Args:
+            features: Linha de FeatureStore.get() / FeatureStore.matrix()
+        
+        Returns:
+            O mesmo dicionário que analyze_match
+        """
+        from analysis.feature_store import features_to_analysis_data
+        return self.analyze_match(features_to_analysis_data(features))
+    
     def _build_reasoning(self, h2h_exp, home_exp, away_exp, pressure_exp, dist_exp,
                         h2h_score, home_score, away_score, pressure_score, dist_score,
                         final_score, confidence,
@@ -3,6 +3,7 @@ Cliente para integração com API Football
 """
 
 import requests
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
@@ -14,13 +15,21 @@ from config.config import (
     API_FOOTBALL_BASE_URL, 
     API_KEY, 
     API_REQUESTS_PER_MINUTE,
-    CURRENT_SEASON
+    CURRENT_SEASON,
+    RAW_PAYLOAD_ARCHIVE
 )
+from api.payload_store import PayloadStore
 
 class APIFootballClient:
     """Cliente para comunicação com API-Football"""
     
-    def __init__(self, api_key: str = API_KEY):
+    def __init__(self, api_key: str = API_KEY, payload_store: PayloadStore = None):
+        """
+        Args:
+            api_key: Chave da API
+            payload_store: Arquivo de respostas brutas (default: só se
+                RAW_PAYLOAD_ARCHIVE=1; False desativa)
+        """
         self.base_url = API_FOOTBALL_BASE_URL
         self.api_key = api_key
         self.headers = {
@@ -29,16 +38,57 @@ class APIFootballClient:
         self.request_count = 0
         self.last_request_time = None
         self.rate_limit_delay = 60 / API_REQUESTS_PER_MINUTE  # segundos entre requests
+        self._rate_lock = threading.Lock()  # Partilhado pelos workers do pipeline
+        
+        # Quota reportada pela API nos headers da última resposta
+        self.daily_limit = None
+        self.daily_remaining = None
+        self.minute_remaining = None
+        
+        if payload_store is None and RAW_PAYLOAD_ARCHIVE:
+            payload_store = PayloadStore()
+        self.payload_store = payload_store
     
     def _rate_limit(self):
-        """Controlo de rate limiting"""
-        if self.last_request_time:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - elapsed)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
+        """Controlo de rate limiting (thread-safe: cada thread reserva o seu slot)"""
+        with self._rate_lock:
+            now = time.time()
+            slot = now
+            if self.last_request_time:
+                slot = max(now, self.last_request_time + self.rate_limit_delay)
+            
+            self.last_request_time = slot
+            self.request_count += 1
+        
+        # Esperar fora do lock: as outras threads reservam os slots seguintes
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _read_quota(self, headers):
+        """Atualizar a quota a partir dos headers x-ratelimit-* da resposta"""
+        def header_int(name):
+            value = headers.get(name)
+            return int(value) if value is not None and str(value).isdigit() else None
+        
+        limit = header_int('x-ratelimit-requests-limit')
+        remaining = header_int('x-ratelimit-requests-remaining')
+        minute = header_int('x-ratelimit-remaining')
+        
+        with self._rate_lock:
+            if limit is not None:
+                self.daily_limit = limit
+            if remaining is not None:
+                self.daily_remaining = remaining
+            if minute is not None:
+                self.minute_remaining = minute
+    
+    def quota_exhausted(self, reserve: int = 0) -> bool:
+        """
+        Se a quota diária chegou ao limite (deixando reserve pedidos livres)
+        
+        Enquanto nenhum pedido tiver sido feito a quota é desconhecida (False).
+        """
+        return self.daily_remaining is not None and self.daily_remaining <= reserve
     
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """Fazer request à API com tratamento de erros"""
@@ -48,14 +98,22 @@ class APIFootballClient:
         
         try:
             response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            self._read_quota(response.headers)
             response.raise_for_status()
             
             data = response.json()
             
             if data.get('errors'):
                 print(f"⚠️ API retornou erros: {data['errors']}")
+                # Limite diário atingido: a API responde 200 com este erro
+                if isinstance(data['errors'], dict) and 'requests' in data['errors']:
+                    self.daily_remaining = 0
                 return None
             
+            # Arquivar resposta bruta para reprocessamento offline
+            if self.payload_store:
+                self.payload_store.save(endpoint, params, data)
+            
             return data
             
         except requests.exceptions.RequestException as e:
@@ -292,7 +350,16 @@ class APIFootballClient:
         data = self._make_request('status')
         
         if data:
-            return data.get('response', {})
+            status = data.get('response', {})
+            # O endpoint status não gasta quota e dá o uso do dia
+            requests_info = status.get('requests', {}) if isinstance(status, dict) else {}
+            if requests_info.get('limit_day') is not None:
+                with self._rate_lock:
+                    self.daily_limit = requests_info['limit_day']
+                    self.daily_remaining = max(
+                        0, requests_info['limit_day'] - (requests_info.get('current') or 0)
+                    )
+            return status
         
         return {}
     
@@ -0,0 +1,209 @@
+"""
+Arquivo de Payloads da API - Football Betting AI
+Guarda cada resposta bruta da API comprimida (zstd se disponível, senão zlib)
+numa BD SQLite própria, para reprocessar dados sem voltar a gastar requests.
+
+Opcional (RAW_PAYLOAD_ARCHIVE=1); prune() apaga as respostas com mais de
+RAW_PAYLOAD_RETENTION_DAYS dias (scripts/reprocess_payloads.py).
+"""
+
+import json
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+import sys
+import os
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; zlib está sempre disponível
+    zstandard = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import RAW_PAYLOAD_DB_PATH, RAW_PAYLOAD_RETENTION_DAYS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_payloads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,          -- JSON canónico (chaves ordenadas)
+    fetched_at TIMESTAMP NOT NULL,
+    codec TEXT NOT NULL,           -- 'zstd' ou 'zlib'
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_api_payloads_key
+    ON api_payloads(endpoint, params, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_api_payloads_fetched
+    ON api_payloads(fetched_at);
+"""
+
+# Endpoints sem valor para reprocessamento
+SKIPPED_ENDPOINTS = ('status',)
+
+
+def _params_key(params: Optional[Dict]) -> str:
+    """Serialização canónica dos parâmetros (usada como chave)"""
+    return json.dumps(params or {}, sort_keys=True, separators=(',', ':'))
+
+
+class PayloadStore:
+    """Arquivo comprimido de respostas brutas da API"""
+
+    def __init__(self, db_path: str = RAW_PAYLOAD_DB_PATH, level: int = None):
+        """
+        Args:
+            db_path: Ficheiro SQLite do arquivo
+            level: Nível de compressão (default: 3 zstd / 6 zlib)
+        """
+        self.db_path = db_path
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+        self.level = level or (3 if zstandard is not None else 6)
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # ========================================================================
+    # COMPRESSÃO
+    # ========================================================================
+
+    # Os contextos zstd não podem ser usados por várias threads ao mesmo
+    # tempo (workers do pipeline): cada chamada cria o seu
+
+    def _compress(self, data: Dict) -> bytes:
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level).compress(raw)
+        return zlib.compress(raw, self.level)
+
+    def _decompress(self, codec: str, body: bytes) -> Dict:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("Payload zstd mas o módulo zstandard não está instalado")
+            raw = zstandard.ZstdDecompressor().decompress(body)
+        else:
+            raw = zlib.decompress(body)
+        return json.loads(raw)
+
+    # ========================================================================
+    # ESCRITA / LEITURA
+    # ========================================================================
+
+    def save(self, endpoint: str, params: Optional[Dict], data: Dict,
+             fetched_at: datetime = None) -> bool:
+        """Guardar uma resposta da API"""
+        if endpoint in SKIPPED_ENDPOINTS:
+            return False
+
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    INSERT INTO api_payloads (endpoint, params, fetched_at, codec, body)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    endpoint,
+                    _params_key(params),
+                    (fetched_at or datetime.now()).isoformat(timespec='seconds'),
+                    self.codec,
+                    self._compress(data)
+                ))
+            return True
+        except Exception as e:
+            print(f"⚠️ Erro ao arquivar payload {endpoint}: {e}")
+            return False
+
+    def latest(self, endpoint: str, params: Optional[Dict]) -> Optional[Dict]:
+        """Resposta mais recente para um endpoint + parâmetros"""
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT codec, body FROM api_payloads
+                WHERE endpoint = ? AND params = ?
+                ORDER BY fetched_at DESC, id DESC
+                LIMIT 1
+            """, (endpoint, _params_key(params))).fetchone()
+
+        return self._decompress(*row) if row else None
+
+    def iter_payloads(self, endpoint: str = None,
+                      since: str = None) -> Iterator[Tuple[str, Dict, str, Dict]]:
+        """
+        Percorrer payloads por ordem de fetch
+
+        Args:
+            endpoint: Filtrar por endpoint (ex.: 'fixtures/events')
+            since: Apenas payloads obtidos a partir desta data (ISO)
+
+        Yields:
+            (endpoint, params, fetched_at, data)
+        """
+        query = "SELECT endpoint, params, fetched_at, codec, body FROM api_payloads WHERE 1 = 1"
+        params = []
+
+        if endpoint:
+            query += " AND endpoint = ?"
+            params.append(endpoint)
+
+        if since:
+            query += " AND fetched_at >= ?"
+            params.append(since)
+
+        query += " ORDER BY fetched_at, id"
+
+        with self._connect() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(200)
+                if not rows:
+                    break
+                for ep, params_json, fetched_at, codec, body in rows:
+                    yield ep, json.loads(params_json), fetched_at, self._decompress(codec, body)
+
+    def get_stats(self) -> Dict:
+        """Número de payloads e bytes comprimidos por endpoint"""
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT endpoint, COUNT(*), SUM(LENGTH(body))
+                FROM api_payloads GROUP BY endpoint ORDER BY endpoint
+            """).fetchall()
+        return {ep: {'count': count, 'bytes': size} for ep, count, size in rows}
+
+    def prune(self, older_than: timedelta = None) -> int:
+        """
+        Apagar respostas antigas (retenção do arquivo)
+
+        Args:
+            older_than: Idade máxima (default: RAW_PAYLOAD_RETENTION_DAYS)
+
+        Returns:
+            Número de respostas apagadas (-1 em caso de erro)
+        """
+        if older_than is None:
+            older_than = timedelta(days=RAW_PAYLOAD_RETENTION_DAYS)
+        cutoff = (datetime.now() - older_than).isoformat(timespec='seconds')
+
+        try:
+            with self._connect() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM api_payloads WHERE fetched_at < ?", (cutoff,)
+                ).rowcount
+            if deleted:
+                # Devolver o espaço ao sistema (o arquivo é só de acumulação)
+                with self._connect() as conn:
+                    conn.execute("VACUUM")
+            return deleted
+        except Exception as e:
+            print(f"⚠️ Erro ao limpar arquivo de payloads: {e}")
+            return -1
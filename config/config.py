@@ -30,6 +30,16 @@ ANALYSIS_PARAMS = {
     'min_games_for_analysis': 3,
 }
 
+# Enriquecimento: só os dados que os componentes do scoring consomem
+ENRICHMENT_POLICY = {
+    # Pressão ofensiva: médias das estatísticas dos últimos N jogos da
+    # equipa na liga/temporada atual
+    'stats': {'last_n_games': 5},
+    # Distribuição por minuto: eventos de golo dos jogos da temporada atual
+    # (jogos sem golos não têm eventos relevantes)
+    'events': {'min_total_goals': 1},
+}
+
 # Critérios de scoring
 SCORING_WEIGHTS = {
     'direct_confrontations': 0.25,      # 25%
@@ -41,11 +51,65 @@ SCORING_WEIGHTS = {
 
 # Database
 DATABASE_PATH = "football_betting.db"
+DB_STREAM_CHUNK_SIZE = 500  # Linhas por fetchmany nas leituras em streaming
+ARCHIVE_DIR = "archive"  # BDs por temporada (football_betting_<ano>.db)
+
+# Backups online (backup API do SQLite) e snapshots só de leitura
+BACKUP_PAGES_PER_STEP = 256  # Páginas copiadas por passo
+BACKUP_STEP_SLEEP = 0.05  # Segundos entre passos (deixa o writer avançar)
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_KEEP = 3  # Snapshots mantidos (os mais antigos são apagados)
+
+# Manutenção da BD (ANALYZE / PRAGMA optimize / incremental vacuum)
+MAINTENANCE_PARAMS = {
+    'analyze_growth_pct': 10,       # ANALYZE quando as tabelas de jogos crescem 10%
+    'vacuum_interval_hours': 24,    # Incremental vacuum no máximo 1x por dia
+    'vacuum_min_free_pages': 64,    # Abaixo disto não vale a pena
+}
+
+# Ledger de enriquecimento (estatísticas/eventos por jogo)
+FETCH_LEDGER_PARAMS = {
+    'empty_retry_hours': 24,  # Resposta vazia: voltar a tentar após 24h
+    'max_attempts': 3,        # Depois disto o jogo fica sem estatísticas/eventos
+}
+
+# Backfill histórico das LEAGUES (scripts/backfill.py)
+BACKFILL_PARAMS = {
+    'seasons': 3,           # Temporadas a carregar (a atual e as anteriores)
+    'stats_last_n': 38,     # Estatísticas de todos os jogos de uma temporada
+    'enrich_chunk': 25,     # Jogos enriquecidos entre verificações de quota
+    'quota_reserve': 100,   # Pedidos diários que o backfill nunca gasta
+    'live_quota_share': 0.3,  # Parte da quota diária reservada à análise do dia
+    'demand_days': 7,       # Janela de jogos próximos usada para priorizar
+    'fixtures_per_season': 306,  # Estimativa por liga/temporada ainda por carregar
+}
+
+# Pipeline dos jogos do dia (workers por estágio e tamanho das filas)
+PIPELINE_PARAMS = {
+    'history_workers': 4,   # Histórico de equipas / confrontos diretos
+    'enrich_workers': 4,    # Estatísticas e eventos
+    'score_workers': 2,
+    'score_batch': 8,       # Jogos já em fila pontuados com um só get_matches_analysis_data
+    'queue_size': 32,       # Filas limitadas entre estágios
+}
+
+# Profiling de queries (ativar com DB_PROFILE=1)
+DB_PROFILE = os.getenv("DB_PROFILE", "0") == "1"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "50"))
+DB_SLOW_QUERY_LOG = "logs/slow_queries.log"
+
+# Feature store (vetores point-in-time em ficheiros memory-mapped)
+FEATURE_STORE_DIR = "features"
 
 # Logging
 LOG_LEVEL = "INFO"
 LOG_FILE = f"logs/football_betting_{datetime.now().strftime('%Y%m%d')}.log"
 
+# Arquivo de respostas brutas da API (reprocessamento offline, ativar com RAW_PAYLOAD_ARCHIVE=1)
+RAW_PAYLOAD_ARCHIVE = os.getenv("RAW_PAYLOAD_ARCHIVE", "0") == "1"
+RAW_PAYLOAD_DB_PATH = "api_payloads.db"
+RAW_PAYLOAD_RETENTION_DAYS = 90  # Respostas mais antigas são apagadas por prune()
+
 # API Rate Limiting
 API_REQUESTS_PER_MINUTE = 300
 API_REQUESTS_PER_DAY = 10000
@@ -4,45 +4,463 @@ Gestor otimizado para análise Over 0.5 HT e Over 1.5 FT
 """
 
 import sqlite3
+import itertools
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
-from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Union, Iterable
+from contextlib import contextmanager, nullcontext
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.config import DATABASE_PATH, CURRENT_SEASON
+from config.config import (
+    DATABASE_PATH, CURRENT_SEASON, DB_STREAM_CHUNK_SIZE, ARCHIVE_DIR, DB_PROFILE,
+    BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP, SNAPSHOT_DIR, SNAPSHOT_KEEP,
+    MAINTENANCE_PARAMS, FETCH_LEDGER_PARAMS
+)
+from database.models import Match, MatchStatistics, TeamForm, HeadToHead, model_row_factory
+from database.profiler import ProfilingConnection
+
+# Colunas de fixtures pela ordem de inserção (igual à ordem dos campos de Match)
+FIXTURE_COLUMNS = Match.__match_args__
+
+# Upsert de um jogo (valores pela ordem de FIXTURE_COLUMNS)
+FIXTURE_UPSERT = """
+    INSERT OR REPLACE INTO fixtures (
+        id, league_id, season, round, date, timestamp,
+        home_team_id, away_team_id,
+        status_short, status_long, status_elapsed,
+        venue_id, venue_name, venue_city, referee,
+        home_goals, away_goals,
+        home_goals_halftime, away_goals_halftime,
+        home_goals_extratime, away_goals_extratime,
+        home_goals_penalty, away_goals_penalty,
+        updated_at
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?,
+        ?, ?,
+        ?, ?, ?,
+        ?, ?, ?, ?,
+        ?, ?,
+        ?, ?,
+        ?, ?,
+        ?, ?,
+        CURRENT_TIMESTAMP
+    )
+"""
+
+# Colunas de fixture_statistics (igual à ordem dos campos de MatchStatistics)
+STATISTICS_COLUMNS = MatchStatistics.__match_args__
+
+# Upsert das estatísticas de uma equipa num jogo (valores pela ordem de STATISTICS_COLUMNS)
+STATISTICS_UPSERT = """
+    INSERT OR REPLACE INTO fixture_statistics (
+        fixture_id, team_id,
+        shots_on_goal, shots_off_goal, total_shots,
+        blocked_shots, shots_insidebox, shots_outsidebox,
+        ball_possession, total_passes, passes_accurate, passes_percentage,
+        attacks, dangerous_attacks,
+        corner_kicks, offsides, fouls,
+        yellow_cards, red_cards, goalkeeper_saves,
+        expected_goals
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+    )
+"""
+
+EVENT_INSERT = """
+    INSERT INTO fixture_events_data (
+        fixture_id, team_id,
+        time_elapsed, time_extra,
+        type_id, detail_id,
+        player_ref, assist_ref,
+        comment_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Tabelas de jogos visíveis através das BDs de arquivo (uma por temporada)
+ARCHIVED_TABLES = ('fixtures', 'fixture_statistics', 'fixture_events')
+
+# Tabelas de lookup dos eventos (texto -> ID)
+EVENT_LOOKUP_TABLES = ('event_types', 'event_details', 'event_comments')
+
+# db_path especial: BD em memória (shared cache) com a mesma API
+MEMORY_DB = ':memory:'
+_memory_ids = itertools.count(1)
+
+# Tabelas cujo crescimento dispara um novo ANALYZE
+MAINTENANCE_TABLES = ('fixtures', 'fixture_statistics', 'fixture_events_data')
+
+# PRAGMA auto_vacuum: 0 = NONE, 1 = FULL, 2 = INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Queries representativas dos caminhos quentes (relatório de uso de índices)
+INDEX_PROBES = {
+    'fixtures_by_date': (
+        "SELECT * FROM fixtures WHERE date(date) = date(?) ORDER BY date", ('2025-01-01',)),
+    'team_form': (
+        "SELECT date FROM fixtures WHERE home_team_id = ? AND status_short = 'FT' "
+        "AND league_id = ? AND season = ? AND date < ? "
+        "UNION ALL "
+        "SELECT date FROM fixtures WHERE away_team_id = ? AND status_short = 'FT' "
+        "AND league_id = ? AND season = ? AND date < ? "
+        "ORDER BY date DESC LIMIT 10", (0, 0, 0, '2025-01-01', 0, 0, 0, '2025-01-01')),
+    'head_to_head': (
+        "SELECT date FROM fixtures WHERE home_team_id = ? AND away_team_id = ? "
+        "AND status_short = 'FT' AND date < ? "
+        "UNION ALL "
+        "SELECT date FROM fixtures WHERE home_team_id = ? AND away_team_id = ? "
+        "AND status_short = 'FT' AND date < ? "
+        "ORDER BY date DESC LIMIT 10", (0, 0, '2025-01-01', 0, 0, '2025-01-01')),
+    'fixture_statistics': (
+        "SELECT * FROM fixture_statistics WHERE fixture_id = ?", (0,)),
+    'fixture_events': (
+        "SELECT * FROM fixture_events WHERE fixture_id = ? ORDER BY time_elapsed", (0,)),
+    'goal_distribution': (
+        "SELECT COUNT(*) FROM fixture_events e JOIN fixtures f ON e.fixture_id = f.id "
+        "WHERE e.team_id = ? AND e.type = 'Goal' AND e.detail NOT IN ('Missed Penalty') "
+        "AND f.league_id = ? AND f.season = ? AND f.status_short = 'FT' "
+        "AND f.date < ?", (0, 0, 0, '2025-01-01')),
+    'predictions_by_date': (
+        "SELECT * FROM predictions WHERE date(date) = date(?)", ('2025-01-01',)),
+}
+
+# Colunas acrescentadas a tabelas existentes (ALTER TABLE ADD COLUMN)
+ADDED_COLUMNS = {
+    'predictions': {'home_team_id': 'INTEGER', 'away_team_id': 'INTEGER',
+                    'input_seq': 'INTEGER', 'updated_at': 'TIMESTAMP'},
+}
+
+# Identity map nome -> ID partilhado pelo processo: (db_path, tabela, nome) -> id
+_NAME_CACHE: Dict[Tuple[str, str, str], int] = {}
+# Nome em cache de cada ID (para invalidar o nome antigo quando muda)
+_CACHED_NAMES: Dict[Tuple[str, str, int], str] = {}
+
+# Colunas comparadas antes de reescrever equipas/ligas (save_metadata)
+METADATA_COLUMNS = {
+    'teams': ('name', 'code', 'country', 'founded', 'logo'),
+    'leagues': ('name', 'type', 'country', 'logo'),
+}
+
+TEAM_UPSERT = """
+    INSERT OR REPLACE INTO teams 
+    (id, name, code, country, founded, logo, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+LEAGUE_UPSERT = """
+    INSERT OR REPLACE INTO leagues 
+    (id, name, type, country, logo)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Médias devolvidas por get_team_avg_statistics
+STATISTICS_AVERAGES = (
+    'avg_shots_on_goal', 'avg_total_shots', 'avg_shots_insidebox',
+    'avg_corners', 'avg_possession', 'avg_dangerous_attacks',
+)
+
+# Contagem de golos por período (get_goals_by_minute_distribution*)
+GOAL_PERIODS = (('0-15', None, 15), ('16-30', 15, 30), ('31-45', 30, 45),
+                ('46-60', 45, 60), ('61-75', 60, 75), ('76-90', 75, 90))
+GOAL_PERIOD_COLUMNS = ",\n".join(
+    f"SUM(CASE WHEN {'' if low is None else f'time_elapsed > {low} AND '}"
+    f"time_elapsed <= {high} THEN 1 ELSE 0 END) as g_{label.replace('-', '_')}"
+    for label, low, high in GOAL_PERIODS
+) + ",\nCOUNT(*) as total_goals"
+
+# CTE das agregações em lote: chaves (equipa, liga) passadas em JSON
+TEAM_KEYS_CTE = """
+    keys AS (
+        SELECT json_extract(value, '$[0]') AS team_id,
+               json_extract(value, '$[1]') AS league_id
+        FROM json_each(:keys)
+    )
+"""
+
+# Tipos de enriquecimento registados em fixture_fetch_ledger
+LEDGER_KINDS = ('stats', 'events')
+
+# Pedido de enriquecimento em dívida (l = fixture_fetch_ledger, via LEFT JOIN):
+# nunca feito, ou resposta vazia antiga ainda com tentativas disponíveis
+LEDGER_DUE = """
+    (l.fixture_id IS NULL OR (
+        NOT l.has_{kind} AND l.{kind}_attempts < :max_attempts
+        AND (l.{kind}_fetched_at IS NULL
+             OR l.{kind}_fetched_at <= datetime('now', :retry))
+    ))
+"""
+
+
+def _ledger_due_params() -> Dict[str, Any]:
+    """Parâmetros :retry / :max_attempts de LEDGER_DUE"""
+    return {'retry': f"-{FETCH_LEDGER_PARAMS['empty_retry_hours']} hours",
+            'max_attempts': FETCH_LEDGER_PARAMS['max_attempts']}
+
+# Colunas de fixture_search e pesos do bm25 (nomes das equipas pesam mais)
+SEARCH_WEIGHTS = {
+    'home_team': 10.0, 'away_team': 10.0,
+    'venue_name': 4.0, 'venue_city': 2.0,
+    'referee': 3.0, 'round': 1.0,
+}
+
+# Instruções do schema por caminho (lidas do disco uma única vez por processo)
+_SCHEMA_CACHE: Dict[str, List[str]] = {}
+
+
+def _split_sql(script: str) -> List[str]:
+    """Dividir um script SQL em instruções completas (triggers incluídos)"""
+    statements, buffer = [], ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = "\n".join(
+                l for l in buffer.strip().splitlines() if not l.lstrip().startswith('--')
+            ).strip()
+            if statement:
+                statements.append(statement)
+            buffer = ""
+    return statements
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """
+    Converter texto livre numa query FTS5 segura
+
+    Cada palavra vira um prefixo entre aspas ("benf"*), ligadas por AND,
+    para a pesquisa funcionar enquanto o utilizador escreve.
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
 
 class DatabaseManager:
     """Gestor da base de dados SQLite"""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None,
+                 archive_seasons: Iterable[int] = None,
+                 profile: bool = None,
+                 snapshot_path: str = None,
+                 read_only: bool = False):
         """
         Inicializar database manager
         
         Args:
             db_path: Caminho para o ficheiro da BD (opcional)
+            archive_seasons: Temporadas arquivadas a anexar (ATTACH) em cada
+                conexão, para backtests. As tabelas de jogos passam a incluir
+                essas temporadas (só leitura).
+            profile: Cronometrar queries e escrever slow-query log
+                (default: DB_PROFILE, variável de ambiente DB_PROFILE=1)
+            snapshot_path: BD a copiar (backup API) antes de aplicar o schema;
+                útil com db_path=':memory:' para testes e benchmarks
+            read_only: Abrir a BD só para leitura (ex.: snapshot criado por
+                create_snapshot); o schema não é aplicado
         """
         self.db_path = db_path or DATABASE_PATH
         self.schema_path = os.path.join(
             os.path.dirname(__file__), 
             'db_schema.sql'
         )
+        self.archive_seasons: List[int] = []
+        self.profile = DB_PROFILE if profile is None else profile
+        self._lookup_cache: Dict[Tuple, int] = {}  # (tabela, valor) -> ID
+        self._metadata_cache: Dict[str, Dict] = {}  # tabela -> metadados já gravados
+        self._uri = False
+        self._anchor = None
+        self._memory_lock = None
+        self.read_only = read_only
+        
+        if read_only:
+            self.db_path = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            self._uri = True
+            if archive_seasons:
+                self.archive_seasons = sorted(set(archive_seasons))
+            return
+        
+        if self.db_path == MEMORY_DB:
+            # Cada get_connection abre uma nova conexão para a mesma BD em
+            # memória; a conexão âncora mantém-na viva até close()
+            self.db_path = (f"file:football_betting_mem{next(_memory_ids)}"
+                            "?mode=memory&cache=shared")
+            self._uri = True
+            self._anchor = sqlite3.connect(self.db_path, uri=True,
+                                           check_same_thread=False)
+            # Cache partilhada: um conflito entre conexões dá logo "database
+            # table is locked" (o busy timeout não se aplica); as conexões de
+            # threads diferentes são usadas à vez
+            self._memory_lock = threading.RLock()
+        
+        if snapshot_path:
+            self.load_snapshot(snapshot_path)
+        
         self.initialize_database()
+        
+        # Só depois do schema: as views temporárias escondem as tabelas de main
+        if archive_seasons:
+            self.archive_seasons = sorted(set(archive_seasons))
     
-    @contextmanager
-    def get_connection(self):
-        """Context manager para conexões à BD"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Para acessar colunas por nome
+    @classmethod
+    def in_memory(cls, snapshot_path: str = None, **kwargs) -> 'DatabaseManager':
+        """
+        BD em memória, opcionalmente semeada a partir de um ficheiro
+        
+        Exemplo:
+            db = DatabaseManager.in_memory('football_betting.db')
+        """
+        return cls(MEMORY_DB, snapshot_path=snapshot_path, **kwargs)
+    
+    @property
+    def is_memory(self) -> bool:
+        return self._anchor is not None
+    
+    def close(self):
+        """Libertar a BD em memória (sem efeito em BDs de ficheiro)"""
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Abrir conexão crua (ficheiro ou memória, com/sem profiling)"""
+        factory = ProfilingConnection if self.profile else sqlite3.Connection
+        return sqlite3.connect(self.db_path, uri=self._uri, factory=factory)
+    
+    def load_snapshot(self, snapshot_path: str):
+        """
+        Substituir o conteúdo da BD por uma cópia de snapshot_path
+        
+        Usa a backup API do SQLite; o ficheiro de origem é aberto só para
+        leitura e nunca é alterado.
+        """
+        if not os.path.exists(snapshot_path):
+            raise FileNotFoundError(f"Snapshot não encontrado: {snapshot_path}")
+        
+        source = sqlite3.connect(Path(snapshot_path).resolve().as_uri() + "?mode=ro",
+                                 uri=True)
+        target = self._connect()
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        
+        self._lookup_cache.clear()
+        self.refresh_metadata_cache()
+        print(f"📥 Snapshot carregado: {snapshot_path}")
+    
+    # ========================================================================
+    # BACKUP E SNAPSHOTS - Cópias online (backup API)
+    # ========================================================================
+    
+    def backup_to(self, dest_path: str,
+                  pages: int = BACKUP_PAGES_PER_STEP,
+                  sleep: float = BACKUP_STEP_SLEEP,
+                  show_progress: bool = True) -> bool:
+        """
+        Copiar a BD para dest_path sem bloquear os writers
+        
+        A cópia é feita em passos de `pages` páginas com `sleep` segundos
+        entre passos. Se outra conexão escrever durante a cópia, o SQLite
+        recomeça-a, por isso o resultado é sempre consistente. O ficheiro
+        final só aparece no fim (escrita para .tmp + rename).
+        
+        Returns:
+            True se a cópia terminou
+        """
+        tmp_path = dest_path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        
+        directory = os.path.dirname(dest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        def progress(status, remaining, total):
+            if show_progress and total:
+                done = (total - remaining) / total * 100
+                print(f"\r   💾 {total - remaining}/{total} páginas ({done:.0f}%)",
+                      end='', flush=True)
+        
+        source = self._connect()
+        target = sqlite3.connect(tmp_path)
         try:
-            yield conn
-            conn.commit()
+            source.backup(target, pages=pages, progress=progress, sleep=sleep)
+            target.close()
+            os.replace(tmp_path, dest_path)
+            if show_progress:
+                print()
+            print(f"✅ Backup criado: {dest_path}")
+            return True
         except Exception as e:
-            conn.rollback()
-            raise e
+            target.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            print(f"\n❌ Erro no backup: {e}")
+            return False
         finally:
-            conn.close()
+            source.close()
+    
+    def create_snapshot(self, directory: str = SNAPSHOT_DIR,
+                        keep: int = SNAPSHOT_KEEP) -> Optional[str]:
+        """
+        Criar snapshot datado para leituras (GUI, análises)
+        
+        Returns:
+            Caminho do snapshot ou None em caso de erro
+        """
+        name = f"football_betting_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+        path = os.path.join(directory, name)
+        if not self.backup_to(path, show_progress=False):
+            return None
+        
+        # Apagar os mais antigos
+        for old in self.list_snapshots(directory)[:-max(keep, 1)]:
+            os.remove(old)
+        
+        return path
+    
+    @staticmethod
+    def list_snapshots(directory: str = SNAPSHOT_DIR) -> List[str]:
+        """Snapshots existentes, do mais antigo para o mais recente"""
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith('football_betting_') and name.endswith('.db')
+        )
+    
+    @classmethod
+    def open_latest_snapshot(cls, directory: str = SNAPSHOT_DIR,
+                             **kwargs) -> Optional['DatabaseManager']:
+        """Abrir (só leitura) o snapshot mais recente, se existir"""
+        snapshots = cls.list_snapshots(directory)
+        if not snapshots:
+            return None
+        return cls(snapshots[-1], read_only=True, **kwargs)
+    
+    @contextmanager
+    def get_connection(self):
+        """Context manager para conexões à BD"""
+        with self._memory_lock or nullcontext():
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row  # Para acessar colunas por nome
+            if self.archive_seasons:
+                self._attach_archives(conn)
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                conn.close()
     
     def initialize_database(self):
         """Criar base de dados e executar schema"""
@@ -54,14 +472,36 @@ class DatabaseManager:
             return False
         
         try:
-            # Ler schema
-            with open(self.schema_path, 'r', encoding='utf-8') as f:
-                schema_sql = f.read()
+            # Ler schema (cache por processo)
+            statements = _SCHEMA_CACHE.get(self.schema_path)
+            if statements is None:
+                with open(self.schema_path, 'r', encoding='utf-8') as f:
+                    statements = _SCHEMA_CACHE[self.schema_path] = _split_sql(f.read())
             
-            # Executar schema
+            # Executar schema e migrações numa única transação (executescript
+            # fazia COMMIT a meio): uma falha desfaz também os RENAME *_legacy
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.executescript(schema_sql)
+                pragmas = [st for st in statements if st.upper().startswith('PRAGMA')]
+                for statement in pragmas:
+                    cursor.execute(statement)
+                
+                cursor.execute("BEGIN")
+                # *_legacy deixada por uma versão anterior que falhou a meio: retomar
+                leftover_events = bool(self._table_columns(conn, 'fixture_events_legacy'))
+                leftover_fixtures = bool(self._table_columns(conn, 'fixtures_legacy'))
+                legacy_events = self._prepare_events_migration(conn)
+                rebuild_fixtures = self._prepare_fixtures_rebuild(conn)
+                self._add_missing_columns(conn)
+                for statement in statements:
+                    if statement not in pragmas:
+                        cursor.execute(statement)
+                if legacy_events or leftover_events:
+                    self._migrate_legacy_events(conn, keep_ids=not leftover_events)
+                if rebuild_fixtures or leftover_fixtures:
+                    self._finish_fixtures_rebuild(conn)
+                self._populate_search_index(conn)
+                self._seed_fetch_ledger(conn)
             
             print("✅ Base de dados inicializada com sucesso!")
             return True
@@ -70,6 +510,380 @@ class DatabaseManager:
             print(f"❌ Erro ao inicializar BD: {e}")
             return False
     
+    # ========================================================================
+    # MIGRAÇÕES
+    # ========================================================================
+    
+    @staticmethod
+    def _prepare_events_migration(conn: sqlite3.Connection) -> bool:
+        """
+        Detetar a antiga tabela fixture_events (texto por linha) e renomeá-la
+        para fixture_events_legacy, libertando o nome para a nova view.
+        
+        Returns:
+            True se há eventos antigos a migrar
+        """
+        row = conn.execute("""
+            SELECT type FROM sqlite_master WHERE name = 'fixture_events'
+        """).fetchone()
+        if not row or row[0] != 'table':
+            return False
+        
+        print("🔄 A migrar fixture_events para tabelas de lookup...")
+        # A view depende de fixture_events e seria reescrita pelo RENAME
+        conn.execute("DROP VIEW IF EXISTS goals_by_period")
+        conn.execute("ALTER TABLE fixture_events RENAME TO fixture_events_legacy")
+        return True
+    
+    def _migrate_legacy_events(self, conn: sqlite3.Connection, keep_ids: bool = True):
+        """
+        Copiar fixture_events_legacy para fixture_events_data e apagá-la
+        
+        Args:
+            keep_ids: Manter os IDs antigos (False ao retomar uma migração
+                interrompida, em que fixture_events_data já pode ter linhas)
+        """
+        for table, column in (('event_types', 'type'),
+                              ('event_details', 'detail'),
+                              ('event_comments', 'comments')):
+            conn.execute(f"""
+                INSERT OR IGNORE INTO {table} (name)
+                SELECT DISTINCT {column} FROM fixture_events_legacy
+                WHERE {column} IS NOT NULL
+            """)
+        
+        conn.execute("""
+            INSERT INTO players (api_id, name)
+            SELECT DISTINCT api_id, name FROM (
+                SELECT player_id AS api_id, player_name AS name FROM fixture_events_legacy
+                UNION
+                SELECT assist_id, assist_name FROM fixture_events_legacy
+            )
+            WHERE (api_id IS NOT NULL OR name IS NOT NULL)
+            AND NOT EXISTS (
+                SELECT 1 FROM players p
+                WHERE p.api_id IS api_id AND p.name IS name
+            )
+        """)
+        
+        cursor = conn.execute(f"""
+            INSERT INTO fixture_events_data (
+                id, fixture_id, team_id, time_elapsed, time_extra,
+                type_id, detail_id, player_ref, assist_ref, comment_id, created_at
+            )
+            SELECT
+                {'l.id' if keep_ids else 'NULL'}, l.fixture_id, l.team_id,
+                l.time_elapsed, l.time_extra,
+                t.id, d.id, p.id, a.id, c.id, l.created_at
+            FROM fixture_events_legacy l
+            JOIN event_types t ON t.name = l.type
+            LEFT JOIN event_details d ON d.name = l.detail
+            LEFT JOIN event_comments c ON c.name = l.comments
+            LEFT JOIN players p ON p.api_id IS l.player_id AND p.name IS l.player_name
+                AND (l.player_id IS NOT NULL OR l.player_name IS NOT NULL)
+            LEFT JOIN players a ON a.api_id IS l.assist_id AND a.name IS l.assist_name
+                AND (l.assist_id IS NOT NULL OR l.assist_name IS NOT NULL)
+            -- Jogos com eventos já obtidos de novo ficam com os atuais
+            WHERE NOT EXISTS (
+                SELECT 1 FROM fixture_events_data e WHERE e.fixture_id = l.fixture_id
+            )
+        """)
+        
+        conn.execute("DROP TABLE fixture_events_legacy")
+        print(f"✅ {cursor.rowcount} eventos migrados")
+    
+    def _prepare_fixtures_rebuild(self, conn: sqlite3.Connection) -> bool:
+        """
+        Preparar a reconstrução de fixtures sem as colunas geradas
+        (ht_goals, total_goals), que só podem ser STORED em CREATE TABLE.
+        
+        Returns:
+            True se a tabela foi renomeada para fixtures_legacy
+        """
+        columns = self._table_columns(conn, 'fixtures', generated=True)
+        if not columns or 'ht_goals' in columns:
+            return False
+        
+        print("🔄 A reconstruir fixtures com colunas geradas...")
+        # Índices, triggers e views são recriados pelo schema
+        objects = conn.execute("""
+            SELECT type, name FROM sqlite_master
+            WHERE (tbl_name = 'fixtures' AND type IN ('index', 'trigger') AND sql IS NOT NULL)
+               OR (type = 'view' AND name = 'fixtures_with_stats')
+        """).fetchall()
+        for obj_type, name in objects:
+            conn.execute(f"DROP {obj_type.upper()} IF EXISTS {name}")
+        
+        # legacy_alter_table: as FKs das outras tabelas continuam a apontar para fixtures
+        conn.execute("PRAGMA legacy_alter_table = ON")
+        conn.execute("ALTER TABLE fixtures RENAME TO fixtures_legacy")
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+        return True
+    
+    def _finish_fixtures_rebuild(self, conn: sqlite3.Connection):
+        """
+        Copiar fixtures_legacy para a nova fixtures e apagá-la
+        
+        Ao retomar uma reconstrução interrompida, os jogos já guardados de
+        novo em fixtures são mais recentes e ficam como estão.
+        """
+        columns = ", ".join(self._table_columns(conn, 'fixtures_legacy'))
+        cursor = conn.execute(f"""
+            INSERT OR IGNORE INTO fixtures ({columns})
+            SELECT {columns} FROM fixtures_legacy
+        """)
+        conn.execute("DROP TABLE fixtures_legacy")
+        print(f"✅ {cursor.rowcount} jogos copiados")
+    
+    def _populate_search_index(self, conn: sqlite3.Connection):
+        """Indexar os dados existentes quando as tabelas FTS são novas"""
+        row = conn.execute("""
+            SELECT
+                EXISTS (SELECT 1 FROM teams) AND NOT EXISTS (SELECT 1 FROM team_search),
+                EXISTS (SELECT 1 FROM fixtures) AND NOT EXISTS (SELECT 1 FROM fixture_search)
+        """).fetchone()
+        if row[0] or row[1]:
+            print("🔎 A construir índice de pesquisa...")
+            self._fill_search_index(conn)
+    
+    @staticmethod
+    def _fill_search_index(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """(Re)preencher team_search e fixture_search a partir de teams/fixtures"""
+        conn.execute("DELETE FROM team_search")
+        teams = conn.execute("""
+            INSERT INTO team_search (rowid, name, country)
+            SELECT id, name, country FROM teams
+        """).rowcount
+        conn.execute("DELETE FROM fixture_search")
+        fixtures = conn.execute("""
+            INSERT INTO fixture_search
+                (rowid, home_team, away_team, venue_name, venue_city, referee, round)
+            SELECT f.id, h.name, a.name, f.venue_name, f.venue_city, f.referee, f.round
+            FROM fixtures f
+            LEFT JOIN teams h ON h.id = f.home_team_id
+            LEFT JOIN teams a ON a.id = f.away_team_id
+        """).rowcount
+        # Juntar os segmentos criados pela carga inicial
+        conn.execute("INSERT INTO team_search (team_search) VALUES ('optimize')")
+        conn.execute("INSERT INTO fixture_search (fixture_search) VALUES ('optimize')")
+        return teams, fixtures
+    
+    @staticmethod
+    def _seed_fetch_ledger(conn: sqlite3.Connection):
+        """Registar no ledger as estatísticas/eventos já existentes na BD"""
+        if conn.execute("SELECT 1 FROM fixture_fetch_ledger LIMIT 1").fetchone():
+            return
+        cursor = conn.execute("""
+            INSERT INTO fixture_fetch_ledger (
+                fixture_id, status_short,
+                has_stats, stats_fetched_at, stats_attempts,
+                has_events, events_fetched_at, events_attempts
+            )
+            SELECT id, status_short,
+                   has_stats, CASE WHEN has_stats THEN updated_at END, has_stats,
+                   has_events, CASE WHEN has_events THEN updated_at END, has_events
+            FROM (
+                SELECT f.id, f.status_short, f.updated_at,
+                       EXISTS (SELECT 1 FROM fixture_statistics s
+                               WHERE s.fixture_id = f.id) AS has_stats,
+                       EXISTS (SELECT 1 FROM fixture_events_data e
+                               WHERE e.fixture_id = f.id) AS has_events
+                FROM fixtures f
+            )
+            WHERE has_stats OR has_events
+        """)
+        if cursor.rowcount > 0:
+            print(f"📒 Ledger de fetch iniciado com {cursor.rowcount} jogos")
+    
+    def _add_missing_columns(self, conn: sqlite3.Connection):
+        """Acrescentar colunas novas (ADDED_COLUMNS) a tabelas já existentes"""
+        for table, columns in ADDED_COLUMNS.items():
+            existing = self._table_columns(conn, table)
+            if not existing:
+                continue  # Tabela nova: criada já completa pelo schema
+            for column, column_type in columns.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    
+    def _iter_query(self, query: str, params: Union[List, Tuple] = (),
+                    chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                    as_tuples: bool = False,
+                    model: type = None) -> Iterator[Any]:
+        """
+        Executar query e devolver linhas em streaming (fetchmany)
+        
+        A conexão fica aberta enquanto o gerador é consumido; apenas
+        `chunk_size` linhas estão em memória de cada vez.
+        
+        Args:
+            query: SQL a executar
+            params: Parâmetros da query
+            chunk_size: Número de linhas lidas por cada fetchmany
+            as_tuples: Se True devolve tuplos simples em vez de dicts
+            model: Classe de database.models a construir por linha (opcional)
+        """
+        with self.get_connection() as conn:
+            if model is not None:
+                conn.row_factory = model_row_factory(model)
+            elif as_tuples:
+                conn.row_factory = None
+            cursor = conn.cursor()
+            cursor.arraysize = chunk_size
+            cursor.execute(query, params)
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if as_tuples or model is not None:
+                    yield from rows
+                else:
+                    for row in rows:
+                        yield dict(row)
+    
+    # ========================================================================
+    # ARQUIVO - Temporadas fechadas em BDs separadas
+    # ========================================================================
+    
+    @staticmethod
+    def get_archive_path(season: int) -> str:
+        """Caminho da BD de arquivo de uma temporada"""
+        return os.path.join(ARCHIVE_DIR, f"football_betting_{season}.db")
+    
+    @staticmethod
+    def get_archived_seasons() -> List[int]:
+        """Temporadas com BD de arquivo em ARCHIVE_DIR"""
+        if not os.path.isdir(ARCHIVE_DIR):
+            return []
+        
+        seasons = []
+        for name in os.listdir(ARCHIVE_DIR):
+            if name.startswith('football_betting_') and name.endswith('.db'):
+                year = name[len('football_betting_'):-len('.db')]
+                if year.isdigit():
+                    seasons.append(int(year))
+        return sorted(seasons)
+    
+    @staticmethod
+    def _table_columns(conn: sqlite3.Connection, table: str,
+                       schema: str = 'main', generated: bool = False) -> List[str]:
+        """
+        Colunas de uma tabela
+        
+        Args:
+            generated: Incluir colunas geradas (por defeito só as graváveis)
+        """
+        if not generated:
+            rows = conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()
+            return [row[1] for row in rows]
+        # table_xinfo: hidden 2/3 = coluna gerada VIRTUAL/STORED
+        rows = conn.execute(f"PRAGMA {schema}.table_xinfo({table})").fetchall()
+        return [row[1] for row in rows if row[6] in (0, 2, 3)]
+    
+    def _attach_archives(self, conn: sqlite3.Connection):
+        """
+        Anexar as BDs de arquivo e criar views temporárias com o mesmo nome
+        das tabelas de jogos (UNION ALL de main + arquivos).
+        
+        O SQLite resolve nomes em temp antes de main, por isso todas as
+        queries existentes passam a ver o histórico completo.
+        """
+        attached = []
+        for season in self.archive_seasons:
+            path = self.get_archive_path(season)
+            if not os.path.exists(path):
+                print(f"⚠️  Arquivo da temporada {season} não encontrado: {path}")
+                continue
+            conn.execute("ATTACH DATABASE ? AS ?", (path, f"s{season}"))
+            attached.append(f"s{season}")
+        
+        if not attached:
+            return
+        
+        for table in ARCHIVED_TABLES:
+            columns = ", ".join(self._table_columns(conn, table, generated=True))
+            parts = [f"SELECT {columns} FROM main.{table}"]
+            parts += [f"SELECT {columns} FROM {schema}.{table}" for schema in attached]
+            conn.execute(
+                f"CREATE TEMP VIEW IF NOT EXISTS {table} AS "
+                + " UNION ALL ".join(parts)
+            )
+    
+    def archive_season(self, season: int, vacuum: bool = True) -> Dict[str, int]:
+        """
+        Mover uma temporada fechada para a sua BD de arquivo
+        
+        Copia fixtures, fixture_statistics e eventos da temporada para
+        ARCHIVE_DIR/football_betting_<season>.db e apaga-os da BD principal,
+        numa única transação. As tabelas de lookup dos eventos são copiadas
+        inteiras (ficam também na BD principal).
+        
+        Args:
+            season: Temporada a arquivar (tem de ser anterior à atual)
+            vacuum: Se deve fazer VACUUM à BD principal no fim
+        
+        Returns:
+            {tabela: linhas movidas}
+        """
+        if season >= CURRENT_SEASON:
+            print(f"❌ A temporada {season} ainda não está fechada")
+            return {}
+        
+        if self.archive_seasons:
+            print("❌ Arquivo não suportado com temporadas anexadas")
+            return {}
+        
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        archive_path = self.get_archive_path(season)
+        
+        # Criar BD de arquivo com o mesmo schema
+        DatabaseManager(archive_path)
+        
+        # fixtures por último: as outras tabelas filtram pelos seus IDs
+        filters = {
+            'fixture_events_data': "fixture_id IN (SELECT id FROM main.fixtures WHERE season = ?)",
+            'fixture_statistics': "fixture_id IN (SELECT id FROM main.fixtures WHERE season = ?)",
+            'fixtures': "season = ?",
+        }
+        
+        moved = {}
+        conn = self._connect()
+        try:
+            conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+            
+            with conn:
+                # Lookups completos (mesmos IDs) para a view fixture_events do
+                # arquivo; teams para o índice de pesquisa do arquivo
+                for table in EVENT_LOOKUP_TABLES + ('players', 'teams'):
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO archive.{table} SELECT * FROM main.{table}"
+                    )
+                
+                for table, where in filters.items():
+                    columns = ", ".join(self._table_columns(conn, table))
+                    conn.execute(f"""
+                        INSERT OR REPLACE INTO archive.{table} ({columns})
+                        SELECT {columns} FROM main.{table} WHERE {where}
+                    """, (season,))
+                    cursor = conn.execute(
+                        f"DELETE FROM main.{table} WHERE {where}", (season,)
+                    )
+                    moved[table] = cursor.rowcount
+            
+            conn.execute("DETACH DATABASE archive")
+            
+            if vacuum:
+                conn.execute("VACUUM")
+            
+            print(f"✅ Temporada {season} arquivada em {archive_path}")
+            return moved
+            
+        except Exception as e:
+            print(f"❌ Erro ao arquivar temporada {season}: {e}")
+            return {}
+        finally:
+            conn.close()
+    
     # ========================================================================
     # TEAMS - Gestão de Equipas
     # ========================================================================
@@ -92,11 +906,7 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO teams 
-                    (id, name, code, country, founded, logo, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (
+                cursor.execute(TEAM_UPSERT, (
                     team_data.get('id'),
                     team_data.get('name'),
                     team_data.get('code'),
@@ -104,6 +914,7 @@ class DatabaseManager:
                     team_data.get('founded'),
                     team_data.get('logo')
                 ))
+            self._remember_metadata(teams={team_data.get('id'): team_data})
             return True
         except Exception as e:
             print(f"❌ Erro ao inserir equipa: {e}")
@@ -126,22 +937,63 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO leagues 
-                    (id, name, type, country, logo)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(LEAGUE_UPSERT, (
                     league_data.get('id'),
                     league_data.get('name'),
                     league_data.get('type'),
                     league_data.get('country'),
                     league_data.get('logo')
                 ))
+            self._remember_metadata(leagues={league_data.get('id'): league_data})
             return True
         except Exception as e:
             print(f"❌ Erro ao inserir liga: {e}")
             return False
     
+    def _get_id_by_name(self, table: str, name: str) -> Optional[int]:
+        """
+        Resolver nome -> ID com cache partilhada pelo processo
+        
+        Só resultados encontrados ficam em cache (uma equipa/liga pode ser
+        inserida mais tarde). Nomes repetidos resolvem para o menor ID.
+        """
+        if not name:
+            return None
+        
+        key = (self.db_path, table, name)
+        if key in _NAME_CACHE:
+            return _NAME_CACHE[key]
+        
+        with self.get_connection() as conn:
+            row = conn.execute(
+                f"SELECT MIN(id) AS id FROM {table} WHERE name = ?", (name,)
+            ).fetchone()
+        
+        if row['id'] is not None:
+            self._cache_name(table, name, row['id'])
+        return row['id']
+    
+    def _cache_name(self, table: str, name: str, item_id: int):
+        """Guardar nome -> ID, esquecendo o nome anterior do mesmo ID (renomeado)"""
+        previous = _CACHED_NAMES.get((self.db_path, table, item_id))
+        if previous is not None and previous != name \
+                and _NAME_CACHE.get((self.db_path, table, previous)) == item_id:
+            del _NAME_CACHE[(self.db_path, table, previous)]
+        
+        key = (self.db_path, table, name)
+        current = _NAME_CACHE.get(key)
+        if current is None or item_id < current:  # Nomes repetidos: menor ID
+            _NAME_CACHE[key] = item_id
+        _CACHED_NAMES[(self.db_path, table, item_id)] = name
+    
+    def get_team_id_by_name(self, name: str) -> Optional[int]:
+        """ID de uma equipa pelo nome (índice idx_teams_name + cache)"""
+        return self._get_id_by_name('teams', name)
+    
+    def get_league_id_by_name(self, name: str) -> Optional[int]:
+        """ID de uma liga pelo nome (índice idx_leagues_name + cache)"""
+        return self._get_id_by_name('leagues', name)
+    
     def insert_season(self, league_id: int, year: int, 
                      current: bool = True) -> bool:
         """Inserir temporada"""
@@ -153,77 +1005,181 @@ class DatabaseManager:
                     (league_id, year, current)
                     VALUES (?, ?, ?)
                 """, (league_id, year, current))
+            self._remember_metadata(seasons=[(league_id, year)])
             return True
         except Exception as e:
             print(f"❌ Erro ao inserir temporada: {e}")
             return False
     
+    # ========================================================================
+    # METADADOS - Equipas/ligas/temporadas vindas dos jogos (write-skipping)
+    # ========================================================================
+    
+    def _load_metadata(self, conn: sqlite3.Connection, table: str) -> Dict:
+        """
+        Metadados gravados de uma tabela (lidos da BD no primeiro uso)
+        
+        Returns:
+            teams/leagues: {id: valores de METADATA_COLUMNS};
+            seasons: {(league_id, year): None}
+        """
+        cache = self._metadata_cache.get(table)
+        if cache is None:
+            if table == 'seasons':
+                cache = {(row[0], row[1]): None for row in
+                         conn.execute("SELECT league_id, year FROM seasons")}
+            else:
+                columns = ", ".join(METADATA_COLUMNS[table])
+                cache = {row[0]: tuple(row)[1:] for row in
+                         conn.execute(f"SELECT id, {columns} FROM {table}")}
+            self._metadata_cache[table] = cache
+        return cache
+    
+    def _changed_metadata(self, conn: sqlite3.Connection,
+                          teams: Iterable[Dict[str, Any]] = (),
+                          leagues: Iterable[Dict[str, Any]] = (),
+                          seasons: Iterable[Tuple[int, int]] = ()) -> Tuple[Dict, Dict, List]:
+        """
+        Filtrar os metadados que ainda não estão gravados tal e qual
+        
+        Returns:
+            ({id: equipa}, {id: liga}, [(league_id, year)]) novos ou alterados
+        """
+        changed = []
+        for table, items in (('teams', teams), ('leagues', leagues)):
+            cache = self._load_metadata(conn, table)
+            columns = METADATA_COLUMNS[table]
+            changed.append({
+                item['id']: item for item in items
+                if item.get('id') is not None
+                and cache.get(item['id']) != tuple(item.get(c) for c in columns)
+            })
+        
+        cache = self._load_metadata(conn, 'seasons')
+        changed.append([key for key in dict.fromkeys(seasons) if key not in cache])
+        return changed[0], changed[1], changed[2]
+    
+    def _write_metadata(self, conn: sqlite3.Connection, teams: Dict, leagues: Dict,
+                        seasons: List[Tuple[int, int]]):
+        """Gravar metadados já filtrados por _changed_metadata (na transação de conn)"""
+        conn.executemany(TEAM_UPSERT, [
+            (t.get('id'), t.get('name'), t.get('code'), t.get('country'),
+             t.get('founded'), t.get('logo')) for t in teams.values()
+        ])
+        conn.executemany(LEAGUE_UPSERT, [
+            (l.get('id'), l.get('name'), l.get('type'), l.get('country'), l.get('logo'))
+            for l in leagues.values()
+        ])
+        conn.executemany("""
+            INSERT OR IGNORE INTO seasons (league_id, year, current)
+            VALUES (?, ?, ?)
+        """, [(league_id, year, int(year == CURRENT_SEASON)) for league_id, year in seasons])
+    
+    def _remember_metadata(self, teams: Dict = None, leagues: Dict = None,
+                           seasons: Iterable[Tuple[int, int]] = ()):
+        """Atualizar caches depois do commit (uma escrita falhada não fica em cache)"""
+        for table, items in (('teams', teams or {}), ('leagues', leagues or {})):
+            cache = self._metadata_cache.get(table)
+            columns = METADATA_COLUMNS[table]
+            for item_id, item in items.items():
+                if item_id is None:
+                    continue
+                if cache is not None:
+                    cache[item_id] = tuple(item.get(c) for c in columns)
+                if item.get('name'):
+                    self._cache_name(table, item['name'], item_id)
+        
+        cache = self._metadata_cache.get('seasons')
+        if cache is not None:
+            cache.update(dict.fromkeys(seasons))
+    
+    def save_metadata(self, teams: Iterable[Dict[str, Any]] = (),
+                      leagues: Iterable[Dict[str, Any]] = (),
+                      seasons: Iterable[Tuple[int, int]] = ()) -> int:
+        """
+        Gravar equipas/ligas/temporadas só se forem novas ou tiverem mudado
+        
+        Os mesmos metadados chegam com cada jogo: sem esta verificação cada
+        jogo reescrevia (REPLACE + índice de pesquisa) as mesmas linhas.
+        
+        Returns:
+            Linhas escritas (-1 em caso de erro)
+        """
+        try:
+            with self.get_connection() as conn:
+                changed = self._changed_metadata(conn, teams, leagues, seasons)
+                if any(changed):
+                    self._write_metadata(conn, *changed)
+            self._remember_metadata(*changed)
+            return sum(len(items) for items in changed)
+        except Exception as e:
+            print(f"❌ Erro ao gravar metadados: {e}")
+            return -1
+    
+    def refresh_metadata_cache(self):
+        """Esquecer a cache de metadados e de nomes (ex.: BD alterada por outro processo)"""
+        self._metadata_cache.clear()
+        for cache in (_NAME_CACHE, _CACHED_NAMES):
+            for key in [key for key in cache if key[0] == self.db_path]:
+                del cache[key]
+    
     # ========================================================================
     # FIXTURES - Gestão de Jogos
     # ========================================================================
     
-    def insert_fixture(self, fixture_data: Dict[str, Any]) -> bool:
+    def insert_fixture(self, fixture_data: Union[Dict[str, Any], Match]) -> bool:
         """
         Inserir ou atualizar jogo
         
         Args:
-            fixture_data: Dados do jogo processados
+            fixture_data: Dados do jogo processados (dict ou Match)
         """
+        if isinstance(fixture_data, Match):
+            values = fixture_data.db_values()
+        else:
+            values = tuple(fixture_data.get(column) for column in FIXTURE_COLUMNS)
+        
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO fixtures (
-                        id, league_id, season, round, date, timestamp,
-                        home_team_id, away_team_id,
-                        status_short, status_long, status_elapsed,
-                        venue_id, venue_name, venue_city, referee,
-                        home_goals, away_goals,
-                        home_goals_halftime, away_goals_halftime,
-                        home_goals_extratime, away_goals_extratime,
-                        home_goals_penalty, away_goals_penalty,
-                        updated_at
-                    ) VALUES (
-                        ?, ?, ?, ?, ?, ?,
-                        ?, ?,
-                        ?, ?, ?,
-                        ?, ?, ?, ?,
-                        ?, ?,
-                        ?, ?,
-                        ?, ?,
-                        ?, ?,
-                        CURRENT_TIMESTAMP
-                    )
-                """, (
-                    fixture_data.get('id'),
-                    fixture_data.get('league_id'),
-                    fixture_data.get('season'),
-                    fixture_data.get('round'),
-                    fixture_data.get('date'),
-                    fixture_data.get('timestamp'),
-                    fixture_data.get('home_team_id'),
-                    fixture_data.get('away_team_id'),
-                    fixture_data.get('status_short'),
-                    fixture_data.get('status_long'),
-                    fixture_data.get('status_elapsed'),
-                    fixture_data.get('venue_id'),
-                    fixture_data.get('venue_name'),
-                    fixture_data.get('venue_city'),
-                    fixture_data.get('referee'),
-                    fixture_data.get('home_goals'),
-                    fixture_data.get('away_goals'),
-                    fixture_data.get('home_goals_halftime'),
-                    fixture_data.get('away_goals_halftime'),
-                    fixture_data.get('home_goals_extratime'),
-                    fixture_data.get('away_goals_extratime'),
-                    fixture_data.get('home_goals_penalty'),
-                    fixture_data.get('away_goals_penalty')
-                ))
+                cursor.execute(FIXTURE_UPSERT, values)
             return True
         except Exception as e:
             print(f"❌ Erro ao inserir fixture: {e}")
             return False
     
+    def insert_fixtures_bulk(self, matches: Iterable[Match],
+                             teams: Iterable[Dict[str, Any]] = (),
+                             leagues: Iterable[Dict[str, Any]] = (),
+                             seasons: Iterable[Tuple[int, int]] = ()) -> int:
+        """
+        Inserir jogos (e respetivas equipas/ligas/temporadas) numa única transação
+        
+        Args:
+            matches: Jogos (Match)
+            teams: Equipas ({'id', 'name', 'logo', ...})
+            leagues: Ligas ({'id', 'name', 'type', 'country', 'logo'})
+            seasons: (league_id, year) a marcar como existentes
+        
+        Equipas, ligas e temporadas já gravadas tal e qual não são reescritas.
+        
+        Returns:
+            Número de jogos inseridos/atualizados (0 em caso de erro)
+        """
+        rows = [match.db_values() for match in matches]
+        
+        try:
+            with self.get_connection() as conn:
+                changed = self._changed_metadata(conn, teams, leagues, seasons)
+                self._write_metadata(conn, *changed)
+                conn.executemany(FIXTURE_UPSERT, rows)
+        except Exception as e:
+            print(f"❌ Erro ao inserir jogos em lote: {e}")
+            return 0
+        
+        self._remember_metadata(*changed)
+        return len(rows)
+    
     def get_fixture(self, fixture_id: int) -> Optional[Dict]:
         """Obter dados de um jogo"""
         with self.get_connection() as conn:
@@ -232,6 +1188,38 @@ class DatabaseManager:
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    def iter_fixtures(self, status: str = None, league_id: int = None,
+                      season: int = None,
+                      chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                      as_tuples: bool = False,
+                      model: type = None) -> Iterator[Any]:
+        """
+        Percorrer jogos por ordem cronológica (exports e backtests)
+        
+        Args:
+            status: Filtrar por status (ex.: 'FT')
+            league_id: Filtrar por liga
+            season: Filtrar por temporada
+        """
+        query = "SELECT * FROM fixtures WHERE 1 = 1"
+        params = []
+        
+        if status:
+            query += " AND status_short = ?"
+            params.append(status)
+        
+        if league_id:
+            query += " AND league_id = ?"
+            params.append(league_id)
+        
+        if season is not None:
+            query += " AND season = ?"
+            params.append(season)
+        
+        query += " ORDER BY date, id"
+        
+        return self._iter_query(query, params, chunk_size, as_tuples, model)
+    
     def get_fixtures_by_date(self, date: str, league_id: int = None) -> List[Dict]:
         """
         Obter jogos por data
@@ -240,23 +1228,29 @@ class DatabaseManager:
             date: Data no formato 'YYYY-MM-DD'
             league_id: ID da liga (opcional)
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            if league_id:
-                cursor.execute("""
-                    SELECT * FROM fixtures 
-                    WHERE date(date) = date(?) AND league_id = ?
-                    ORDER BY date
-                """, (date, league_id))
-            else:
-                cursor.execute("""
-                    SELECT * FROM fixtures 
-                    WHERE date(date) = date(?)
-                    ORDER BY date
-                """, (date,))
-            
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_fixtures_by_date(date, league_id))
+    
+    def iter_fixtures_by_date(self, date: str, league_id: int = None,
+                              chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                              as_tuples: bool = False,
+                              model: type = None) -> Iterator[Any]:
+        """Versão em streaming de get_fixtures_by_date"""
+        if league_id:
+            query = """
+                SELECT * FROM fixtures 
+                WHERE date(date) = date(?) AND league_id = ?
+                ORDER BY date
+            """
+            params = (date, league_id)
+        else:
+            query = """
+                SELECT * FROM fixtures 
+                WHERE date(date) = date(?)
+                ORDER BY date
+            """
+            params = (date,)
+        
+        return self._iter_query(query, params, chunk_size, as_tuples, model)
     
     def get_team_fixtures(self, team_id: int, league_id: int = None,
                          season: int = CURRENT_SEASON,
@@ -271,26 +1265,50 @@ class DatabaseManager:
             status: Status do jogo ('FT' por padrão)
             limit: Número máximo de jogos
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT * FROM fixtures 
-                WHERE (home_team_id = ? OR away_team_id = ?)
-                AND season = ?
-                AND status_short = ?
-            """
-            params = [team_id, team_id, season, status]
-            
-            if league_id:
-                query += " AND league_id = ?"
-                params.append(league_id)
-            
-            query += " ORDER BY date DESC LIMIT ?"
+        return list(self.iter_team_fixtures(team_id, league_id, season,
+                                            status, limit))
+    
+    def iter_team_fixtures(self, team_id: int, league_id: int = None,
+                           season: int = CURRENT_SEASON,
+                           status: str = 'FT', limit: int = None,
+                           before_date: str = None,
+                           chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                           as_tuples: bool = False,
+                           model: type = None) -> Iterator[Any]:
+        """
+        Versão em streaming de get_team_fixtures
+        
+        Args:
+            season: Temporada (None = todas as temporadas)
+            limit: Número máximo de jogos (None = sem limite)
+            before_date: Apenas jogos anteriores a esta data (point-in-time)
+        """
+        query = """
+            SELECT * FROM fixtures 
+            WHERE (home_team_id = ? OR away_team_id = ?)
+            AND status_short = ?
+        """
+        params = [team_id, team_id, status]
+        
+        if season is not None:
+            query += " AND season = ?"
+            params.append(season)
+        
+        if league_id:
+            query += " AND league_id = ?"
+            params.append(league_id)
+        
+        if before_date:
+            query += " AND date < ?"
+            params.append(before_date)
+        
+        query += " ORDER BY date DESC"
+        
+        if limit is not None:
+            query += " LIMIT ?"
             params.append(limit)
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        
+        return self._iter_query(query, params, chunk_size, as_tuples, model)
     
     def get_head_to_head(self, team1_id: int, team2_id: int,
                         league_id: int = None, limit: int = 10) -> List[Dict]:
@@ -303,26 +1321,505 @@ class DatabaseManager:
             league_id: ID da liga (opcional)
             limit: Número máximo de jogos
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT * FROM fixtures 
-                WHERE ((home_team_id = ? AND away_team_id = ?)
-                   OR (home_team_id = ? AND away_team_id = ?))
-                AND status_short = 'FT'
-            """
-            params = [team1_id, team2_id, team2_id, team1_id]
-            
-            if league_id:
-                query += " AND league_id = ?"
-                params.append(league_id)
-            
-            query += " ORDER BY date DESC LIMIT ?"
+        return list(self.iter_head_to_head(team1_id, team2_id, league_id, limit))
+    
+    def iter_head_to_head(self, team1_id: int, team2_id: int,
+                          league_id: int = None, limit: int = None,
+                          before_date: str = None,
+                          chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                          as_tuples: bool = False,
+                          model: type = None) -> Iterator[Any]:
+        """
+        Versão em streaming de get_head_to_head
+        
+        Args:
+            limit: Número máximo de jogos (None = sem limite)
+            before_date: Apenas jogos anteriores a esta data (point-in-time)
+        """
+        query = """
+            SELECT * FROM fixtures 
+            WHERE ((home_team_id = ? AND away_team_id = ?)
+               OR (home_team_id = ? AND away_team_id = ?))
+            AND status_short = 'FT'
+        """
+        params = [team1_id, team2_id, team2_id, team1_id]
+        
+        if league_id:
+            query += " AND league_id = ?"
+            params.append(league_id)
+        
+        if before_date:
+            query += " AND date < ?"
+            params.append(before_date)
+        
+        query += " ORDER BY date DESC"
+        
+        if limit is not None:
+            query += " LIMIT ?"
             params.append(limit)
-            
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        
+        return self._iter_query(query, params, chunk_size, as_tuples, model)
+    
+    def get_team_matches(self, team_id: int, league_id: int = None,
+                         season: int = CURRENT_SEASON,
+                         limit: int = 10,
+                         before_date: str = None) -> List[Match]:
+        """Últimos jogos terminados de uma equipa como objetos Match"""
+        return list(self.iter_team_fixtures(team_id, league_id, season,
+                                            'FT', limit, before_date,
+                                            model=Match))
+    
+    def get_head_to_head_matches(self, team1_id: int, team2_id: int,
+                                 league_id: int = None,
+                                 limit: int = 10,
+                                 before_date: str = None) -> List[Match]:
+        """Confrontos diretos terminados como objetos Match"""
+        return list(self.iter_head_to_head(team1_id, team2_id, league_id,
+                                           limit, before_date, model=Match))
+    
+    @staticmethod
+    def _finished_filters(league_id: Optional[int], season: Optional[int],
+                          before_date: Optional[str]) -> Tuple[str, List]:
+        """Filtros comuns das agregações de jogos terminados"""
+        clauses, params = "", []
+        if league_id:
+            clauses += " AND league_id = ?"
+            params.append(league_id)
+        if season is not None:
+            clauses += " AND season = ?"
+            params.append(season)
+        if before_date:
+            clauses += " AND date < ?"
+            params.append(before_date)
+        return clauses, params
+    
+    def get_team_form(self, team_id: int, league_id: int = None,
+                      season: int = CURRENT_SEASON,
+                      limit: int = 10,
+                      before_date: str = None) -> TeamForm:
+        """
+        Forma recente agregada diretamente em SQL
+        
+        Usa as colunas geradas ht_goals / total_goals e os índices parciais
+        de jogos terminados (um por lado, juntos por UNION ALL).
+        
+        Args:
+            season: Temporada (None = todas)
+            limit: Últimos N jogos (None = todos)
+            before_date: Apenas jogos anteriores a esta data (point-in-time)
+        """
+        filters, params = self._finished_filters(league_id, season, before_date)
+        
+        with self.get_connection() as conn:
+            row = conn.execute(f"""
+                SELECT
+                    COUNT(*) AS games_played,
+                    COALESCE(SUM(goals_for > goals_against), 0) AS wins,
+                    COALESCE(SUM(goals_for = goals_against), 0) AS draws,
+                    COALESCE(SUM(goals_for < goals_against), 0) AS losses,
+                    COALESCE(SUM(goals_for), 0) AS goals_scored,
+                    COALESCE(SUM(goals_against), 0) AS goals_conceded,
+                    COALESCE(SUM(ht_goals > 0), 0) AS games_with_first_half_goal,
+                    COALESCE(SUM(total_goals >= 2), 0) AS games_over15,
+                    COALESCE(SUM(is_home), 0) AS home_games,
+                    COALESCE(SUM(1 - is_home), 0) AS away_games
+                FROM (
+                    SELECT date, ht_goals, total_goals,
+                           home_goals AS goals_for, away_goals AS goals_against, 1 AS is_home
+                    FROM fixtures
+                    WHERE home_team_id = ? AND status_short = 'FT' {filters}
+                    UNION ALL
+                    SELECT date, ht_goals, total_goals,
+                           away_goals, home_goals, 0
+                    FROM fixtures
+                    WHERE away_team_id = ? AND status_short = 'FT' {filters}
+                    ORDER BY date DESC
+                    LIMIT ?
+                )
+            """, [team_id, *params, team_id, *params,
+                  -1 if limit is None else limit]).fetchone()
+        
+        return TeamForm(team_id, league_id, season, *tuple(row))
+    
+    def get_head_to_head_stats(self, team1_id: int, team2_id: int,
+                               league_id: int = None,
+                               limit: int = 10,
+                               before_date: str = None) -> HeadToHead:
+        """
+        Confrontos diretos agregados diretamente em SQL (sem last_matches)
+        
+        Args:
+            limit: Últimos N confrontos (None = todos)
+            before_date: Apenas jogos anteriores a esta data (point-in-time)
+        """
+        filters, params = self._finished_filters(league_id, None, before_date)
+        
+        with self.get_connection() as conn:
+            row = conn.execute(f"""
+                SELECT
+                    COUNT(*) AS total_matches,
+                    COALESCE(SUM(team1_goals > team2_goals), 0) AS team1_wins,
+                    COALESCE(SUM(team1_goals < team2_goals), 0) AS team2_wins,
+                    COALESCE(SUM(team1_goals = team2_goals), 0) AS draws,
+                    COALESCE(SUM(ht_goals > 0), 0) AS matches_with_first_half_goal,
+                    COALESCE(SUM(total_goals >= 2), 0) AS matches_over15
+                FROM (
+                    SELECT date, ht_goals, total_goals,
+                           home_goals AS team1_goals, away_goals AS team2_goals
+                    FROM fixtures
+                    WHERE home_team_id = ? AND away_team_id = ?
+                    AND status_short = 'FT' {filters}
+                    UNION ALL
+                    SELECT date, ht_goals, total_goals, away_goals, home_goals
+                    FROM fixtures
+                    WHERE home_team_id = ? AND away_team_id = ?
+                    AND status_short = 'FT' {filters}
+                    ORDER BY date DESC
+                    LIMIT ?
+                )
+            """, [team1_id, team2_id, *params, team2_id, team1_id, *params,
+                  -1 if limit is None else limit]).fetchone()
+        
+        return HeadToHead(team1_id, team2_id, league_id, *tuple(row))
+    
+    # ========================================================================
+    # AGREGAÇÕES EM LOTE - Uma query por tipo de feature para vários jogos
+    # ========================================================================
+    
+    def get_team_forms(self, keys: Iterable[Tuple[int, int]],
+                       season: int = CURRENT_SEASON,
+                       limit: int = 10) -> Dict[Tuple[int, int], TeamForm]:
+        """
+        Forma recente de várias equipas numa só query (ver get_team_form)
+        
+        Args:
+            keys: Pares (team_id, league_id); league_id None = todas as ligas
+            season: Temporada
+            limit: Últimos N jogos de cada equipa
+        
+        Returns:
+            {(team_id, league_id): TeamForm} (vazio para equipas sem jogos)
+        """
+        keys = list(dict.fromkeys(keys))
+        forms = {key: TeamForm(key[0], key[1], season) for key in keys}
+        if not keys:
+            return forms
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                WITH {TEAM_KEYS_CTE},
+                games AS (
+                    SELECT k.team_id, k.league_id, f.date, f.ht_goals, f.total_goals,
+                           f.home_goals AS goals_for, f.away_goals AS goals_against,
+                           1 AS is_home
+                    FROM keys k
+                    JOIN fixtures f ON f.home_team_id = k.team_id
+                     AND (k.league_id IS NULL OR f.league_id = k.league_id)
+                     AND f.season = :season AND f.status_short = 'FT'
+                    UNION ALL
+                    SELECT k.team_id, k.league_id, f.date, f.ht_goals, f.total_goals,
+                           f.away_goals, f.home_goals, 0
+                    FROM keys k
+                    JOIN fixtures f ON f.away_team_id = k.team_id
+                     AND (k.league_id IS NULL OR f.league_id = k.league_id)
+                     AND f.season = :season AND f.status_short = 'FT'
+                ),
+                ranked AS (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY team_id, league_id ORDER BY date DESC
+                    ) AS position
+                    FROM games
+                )
+                SELECT
+                    team_id, league_id,
+                    COUNT(*) AS games_played,
+                    SUM(goals_for > goals_against) AS wins,
+                    SUM(goals_for = goals_against) AS draws,
+                    SUM(goals_for < goals_against) AS losses,
+                    SUM(goals_for) AS goals_scored,
+                    SUM(goals_against) AS goals_conceded,
+                    SUM(ht_goals > 0) AS games_with_first_half_goal,
+                    SUM(total_goals >= 2) AS games_over15,
+                    SUM(is_home) AS home_games,
+                    SUM(1 - is_home) AS away_games
+                FROM ranked
+                WHERE position <= :limit
+                GROUP BY team_id, league_id
+            """, {'keys': json.dumps(keys), 'season': season,
+                  'limit': -1 if limit is None else limit}).fetchall()
+        
+        for row in rows:
+            key = (row['team_id'], row['league_id'])
+            forms[key] = TeamForm(key[0], key[1], season,
+                                  *(value or 0 for value in tuple(row)[2:]))
+        return forms
+    
+    def get_head_to_head_stats_many(self, pairs: Iterable[Tuple[int, int, Optional[int]]],
+                                    limit: int = 10) -> Dict[Tuple, HeadToHead]:
+        """
+        Confrontos diretos de vários pares numa só query
+        
+        (A, B) e (B, A) são calculados uma única vez; o resultado é
+        devolvido na perspetiva de cada par pedido.
+        
+        Args:
+            pairs: (team1_id, team2_id, league_id); league_id None = todas
+            limit: Últimos N confrontos de cada par
+        
+        Returns:
+            {(team1_id, team2_id, league_id): HeadToHead}
+        """
+        pairs = list(dict.fromkeys(pairs))
+        canonical = list(dict.fromkeys(
+            (min(t1, t2), max(t1, t2), league) for t1, t2, league in pairs
+        ))
+        found = {}
+        
+        if canonical:
+            with self.get_connection() as conn:
+                rows = conn.execute("""
+                    WITH keys AS (
+                        SELECT json_extract(value, '$[0]') AS team1_id,
+                               json_extract(value, '$[1]') AS team2_id,
+                               json_extract(value, '$[2]') AS league_id
+                        FROM json_each(:keys)
+                    ),
+                    games AS (
+                        SELECT k.team1_id, k.team2_id, k.league_id, f.date,
+                               f.ht_goals, f.total_goals,
+                               f.home_goals AS team1_goals, f.away_goals AS team2_goals
+                        FROM keys k
+                        JOIN fixtures f ON f.home_team_id = k.team1_id
+                         AND f.away_team_id = k.team2_id
+                         AND (k.league_id IS NULL OR f.league_id = k.league_id)
+                         AND f.status_short = 'FT'
+                        UNION ALL
+                        SELECT k.team1_id, k.team2_id, k.league_id, f.date,
+                               f.ht_goals, f.total_goals,
+                               f.away_goals, f.home_goals
+                        FROM keys k
+                        JOIN fixtures f ON f.home_team_id = k.team2_id
+                         AND f.away_team_id = k.team1_id
+                         AND (k.league_id IS NULL OR f.league_id = k.league_id)
+                         AND f.status_short = 'FT'
+                    ),
+                    ranked AS (
+                        SELECT *, ROW_NUMBER() OVER (
+                            PARTITION BY team1_id, team2_id, league_id ORDER BY date DESC
+                        ) AS position
+                        FROM games
+                    )
+                    SELECT
+                        team1_id, team2_id, league_id,
+                        COUNT(*) AS total_matches,
+                        SUM(team1_goals > team2_goals) AS team1_wins,
+                        SUM(team1_goals < team2_goals) AS team2_wins,
+                        SUM(team1_goals = team2_goals) AS draws,
+                        SUM(ht_goals > 0) AS matches_with_first_half_goal,
+                        SUM(total_goals >= 2) AS matches_over15
+                    FROM ranked
+                    WHERE position <= :limit
+                    GROUP BY team1_id, team2_id, league_id
+                """, {'keys': json.dumps(canonical),
+                      'limit': -1 if limit is None else limit}).fetchall()
+            found = {(row['team1_id'], row['team2_id'], row['league_id']): row
+                     for row in rows}
+        
+        result = {}
+        for t1, t2, league in pairs:
+            row = found.get((min(t1, t2), max(t1, t2), league))
+            if row is None:
+                result[(t1, t2, league)] = HeadToHead(t1, t2, league)
+                continue
+            wins = (row['team1_wins'], row['team2_wins'])
+            if t1 > t2:
+                wins = wins[::-1]  # Par pedido ao contrário do canónico
+            result[(t1, t2, league)] = HeadToHead(
+                t1, t2, league, row['total_matches'], *wins, row['draws'],
+                row['matches_with_first_half_goal'], row['matches_over15']
+            )
+        return result
+    
+    def get_team_avg_statistics_many(self, keys: Iterable[Tuple[int, int]],
+                                     season: int = CURRENT_SEASON,
+                                     last_n_games: int = 10) -> Dict[Tuple[int, int], Dict]:
+        """
+        Estatísticas médias de várias equipas numa só query
+        (mesmo formato de get_team_avg_statistics)
+        
+        Returns:
+            {(team_id, league_id): médias}
+        """
+        keys = list(dict.fromkeys(keys))
+        empty = dict.fromkeys(STATISTICS_AVERAGES) | {'games_count': 0}
+        averages = {key: dict(empty) for key in keys}
+        if not keys:
+            return averages
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                WITH {TEAM_KEYS_CTE},
+                ranked AS (
+                    SELECT k.team_id, k.league_id,
+                           fs.shots_on_goal, fs.total_shots, fs.shots_insidebox,
+                           fs.corner_kicks, fs.ball_possession, fs.dangerous_attacks,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY k.team_id, k.league_id ORDER BY f.date DESC
+                           ) AS position
+                    FROM keys k
+                    JOIN fixture_statistics fs ON fs.team_id = k.team_id
+                    JOIN fixtures f ON f.id = fs.fixture_id
+                     AND f.league_id = k.league_id AND f.season = :season
+                     AND f.status_short = 'FT'
+                )
+                SELECT
+                    team_id, league_id,
+                    AVG(shots_on_goal) as avg_shots_on_goal,
+                    AVG(total_shots) as avg_total_shots,
+                    AVG(shots_insidebox) as avg_shots_insidebox,
+                    AVG(corner_kicks) as avg_corners,
+                    AVG(ball_possession) as avg_possession,
+                    AVG(dangerous_attacks) as avg_dangerous_attacks,
+                    COUNT(*) as games_count
+                FROM ranked
+                WHERE position <= :limit
+                GROUP BY team_id, league_id
+            """, {'keys': json.dumps(keys), 'season': season,
+                  'limit': last_n_games}).fetchall()
+        
+        for row in rows:
+            data = dict(row)
+            key = (data.pop('team_id'), data.pop('league_id'))
+            averages[key] = data
+        return averages
+    
+    def get_goals_by_minute_distribution_many(self, keys: Iterable[Tuple[int, int]],
+                                              season: int = CURRENT_SEASON) -> Dict[Tuple[int, int], Dict]:
+        """
+        Distribuição de golos por minuto de várias equipas numa só query
+        (mesmo formato de get_goals_by_minute_distribution; {} sem golos)
+        
+        Returns:
+            {(team_id, league_id): distribuição}
+        """
+        keys = list(dict.fromkeys(keys))
+        distributions = {key: {} for key in keys}
+        if not keys:
+            return distributions
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                WITH {TEAM_KEYS_CTE}
+                SELECT 
+                    k.team_id, k.league_id,
+                    {GOAL_PERIOD_COLUMNS}
+                FROM keys k
+                JOIN fixture_events e ON e.team_id = k.team_id
+                JOIN fixtures f ON e.fixture_id = f.id
+                WHERE e.type = 'Goal'
+                AND e.detail NOT IN ('Missed Penalty')
+                AND f.league_id = k.league_id
+                AND f.season = :season
+                AND f.status_short = 'FT'
+                GROUP BY k.team_id, k.league_id
+            """, {'keys': json.dumps(keys), 'season': season}).fetchall()
+        
+        for row in rows:
+            distributions[(row['team_id'], row['league_id'])] = self._distribution_from_row(row)
+        return distributions
+    
+    # ========================================================================
+    # PESQUISA - Índice FTS5 (equipas, estádios, árbitros, jornadas)
+    # ========================================================================
+    
+    def _search_schemas(self, conn: sqlite3.Connection) -> List[str]:
+        """main + BDs de arquivo anexadas que já têm índice de pesquisa"""
+        schemas = []
+        for row in conn.execute("PRAGMA database_list").fetchall():
+            schema = row[1]
+            if schema == 'temp':
+                continue
+            found = conn.execute(
+                f"SELECT 1 FROM {schema}.sqlite_master WHERE name = 'fixture_search'"
+            ).fetchone()
+            if found:
+                schemas.append(schema)
+        return schemas
+    
+    def search_fixtures(self, text: str, limit: int = 20,
+                        status: str = None) -> List[Dict]:
+        """
+        Pesquisar jogos por equipas, estádio, cidade, árbitro ou jornada
+        
+        Inclui as temporadas arquivadas anexadas (archive_seasons). Cada
+        palavra é tratada como prefixo: "benf lisb" encontra jogos do
+        Benfica em Lisboa.
+        
+        Args:
+            text: Texto livre (sem sintaxe FTS)
+            limit: Máximo de resultados
+            status: Filtrar por status_short (ex.: 'FT')
+        
+        Returns:
+            Jogos (colunas de fixtures + home_team/away_team + rank),
+            do mais relevante para o menos relevante
+        """
+        query = _fts_query(text)
+        if query is None:
+            return []
+        
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS.values())
+        status_filter = "AND f.status_short = ?" if status else ""
+        
+        try:
+            with self.get_connection() as conn:
+                parts, params = [], []
+                for schema in self._search_schemas(conn):
+                    parts.append(f"""
+                        SELECT f.*, s.home_team, s.away_team,
+                               bm25(s.fixture_search, {weights}) AS rank
+                        FROM {schema}.fixture_search s
+                        JOIN {schema}.fixtures f ON f.id = s.rowid
+                        WHERE s.fixture_search MATCH ? {status_filter}
+                    """)
+                    params += [query, status] if status else [query]
+                
+                rows = conn.execute(
+                    " UNION ALL ".join(parts) + " ORDER BY rank, date DESC LIMIT ?",
+                    params + [limit]
+                ).fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.OperationalError as e:
+            print(f"❌ Erro na pesquisa de jogos: {e}")
+            return []
+    
+    def search_teams(self, text: str, limit: int = 20) -> List[Dict]:
+        """Pesquisar equipas por nome/país (prefixos, sem acentos)"""
+        query = _fts_query(text)
+        if query is None:
+            return []
+        
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT t.*, bm25(team_search, 10.0, 1.0) AS rank
+                    FROM team_search s
+                    JOIN teams t ON t.id = s.rowid
+                    WHERE team_search MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                """, (query, limit)).fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.OperationalError as e:
+            print(f"❌ Erro na pesquisa de equipas: {e}")
+            return []
+    
+    def rebuild_search_index(self) -> Dict[str, int]:
+        """Reconstruir os índices de pesquisa a partir de teams/fixtures"""
+        with self.get_connection() as conn:
+            teams, fixtures = self._fill_search_index(conn)
+        print(f"✅ Índice de pesquisa: {teams} equipas, {fixtures} jogos")
+        return {'teams': teams, 'fixtures': fixtures}
     
     # ========================================================================
     # FIXTURE STATISTICS - Estatísticas detalhadas
@@ -332,44 +1829,25 @@ class DatabaseManager:
         """Inserir estatísticas de um jogo"""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO fixture_statistics (
-                        fixture_id, team_id,
-                        shots_on_goal, shots_off_goal, total_shots,
-                        blocked_shots, shots_insidebox, shots_outsidebox,
-                        ball_possession, total_passes, passes_accurate, passes_percentage,
-                        attacks, dangerous_attacks,
-                        corner_kicks, offsides, fouls,
-                        yellow_cards, red_cards, goalkeeper_saves,
-                        expected_goals
-                    ) VALUES (
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-                    )
-                """, (
-                    stats_data.get('fixture_id'),
-                    stats_data.get('team_id'),
-                    stats_data.get('shots_on_goal'),
-                    stats_data.get('shots_off_goal'),
-                    stats_data.get('total_shots'),
-                    stats_data.get('blocked_shots'),
-                    stats_data.get('shots_insidebox'),
-                    stats_data.get('shots_outsidebox'),
-                    stats_data.get('ball_possession'),
-                    stats_data.get('total_passes'),
-                    stats_data.get('passes_accurate'),
-                    stats_data.get('passes_percentage'),
-                    stats_data.get('attacks'),
-                    stats_data.get('dangerous_attacks'),
-                    stats_data.get('corner_kicks'),
-                    stats_data.get('offsides'),
-                    stats_data.get('fouls'),
-                    stats_data.get('yellow_cards'),
-                    stats_data.get('red_cards'),
-                    stats_data.get('goalkeeper_saves'),
-                    stats_data.get('expected_goals')
-                ))
+                cursor = conn.cursor()
+                cursor.execute(STATISTICS_UPSERT, tuple(
+                    stats_data.get(column) for column in STATISTICS_COLUMNS
+                ))
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao inserir estatísticas: {e}")
+            return False
+    
+    def insert_fixture_statistics_bulk(self, rows: List[Tuple]) -> bool:
+        """
+        Inserir estatísticas já convertidas numa única transação
+        
+        Args:
+            rows: Tuplos pela ordem de STATISTICS_COLUMNS (models.statistics_rows)
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(STATISTICS_UPSERT, rows)
             return True
         except Exception as e:
             print(f"❌ Erro ao inserir estatísticas: {e}")
@@ -387,33 +1865,48 @@ class DatabaseManager:
     
     def get_team_avg_statistics(self, team_id: int, league_id: int,
                                season: int = CURRENT_SEASON,
-                               last_n_games: int = 10) -> Dict:
+                               last_n_games: int = 10,
+                               before_date: str = None) -> Dict:
         """
         Calcular estatísticas médias de uma equipa
         
+        Args:
+            before_date: Apenas jogos anteriores a esta data (point-in-time)
+        
         Returns:
             Dicionário com médias de todas as estatísticas
         """
+        date_filter = "AND f.date < ?" if before_date else ""
+        params = [team_id, league_id, season]
+        if before_date:
+            params.append(before_date)
+        params.append(last_n_games)
+        
+        # LIMIT dentro da subquery: médias só dos últimos N jogos com estatísticas
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT 
-                    AVG(fs.shots_on_goal) as avg_shots_on_goal,
-                    AVG(fs.total_shots) as avg_total_shots,
-                    AVG(fs.shots_insidebox) as avg_shots_insidebox,
-                    AVG(fs.corner_kicks) as avg_corners,
-                    AVG(fs.ball_possession) as avg_possession,
-                    AVG(fs.dangerous_attacks) as avg_dangerous_attacks,
+                    AVG(shots_on_goal) as avg_shots_on_goal,
+                    AVG(total_shots) as avg_total_shots,
+                    AVG(shots_insidebox) as avg_shots_insidebox,
+                    AVG(corner_kicks) as avg_corners,
+                    AVG(ball_possession) as avg_possession,
+                    AVG(dangerous_attacks) as avg_dangerous_attacks,
                     COUNT(*) as games_count
-                FROM fixture_statistics fs
-                JOIN fixtures f ON fs.fixture_id = f.id
-                WHERE fs.team_id = ?
-                AND f.league_id = ?
-                AND f.season = ?
-                AND f.status_short = 'FT'
-                ORDER BY f.date DESC
-                LIMIT ?
-            """, (team_id, league_id, season, last_n_games))
+                FROM (
+                    SELECT fs.*
+                    FROM fixture_statistics fs
+                    JOIN fixtures f ON fs.fixture_id = f.id
+                    WHERE fs.team_id = ?
+                    AND f.league_id = ?
+                    AND f.season = ?
+                    AND f.status_short = 'FT'
+                    {date_filter}
+                    ORDER BY f.date DESC
+                    LIMIT ?
+                )
+            """, params)
             
             row = cursor.fetchone()
             return dict(row) if row else {}
@@ -422,65 +1915,163 @@ class DatabaseManager:
     # FIXTURE EVENTS - Eventos do jogo
     # ========================================================================
     
+    def _lookup_id(self, cursor: sqlite3.Cursor, table: str,
+                   name: Optional[str]) -> Optional[int]:
+        """ID de um texto numa tabela de lookup (cria se não existir)"""
+        if name is None:
+            return None
+        
+        key = (table, name)
+        lookup_id = self._lookup_cache.get(key)
+        if lookup_id is None:
+            cursor.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            cursor.execute(f"SELECT id FROM {table} WHERE name = ?", (name,))
+            lookup_id = self._lookup_cache[key] = cursor.fetchone()[0]
+        return lookup_id
+    
+    def _player_ref(self, cursor: sqlite3.Cursor, api_id: Optional[int],
+                    name: Optional[str]) -> Optional[int]:
+        """ID interno de um jogador (par ID da API + nome)"""
+        if api_id is None and name is None:
+            return None
+        
+        key = ('players', api_id, name)
+        player_ref = self._lookup_cache.get(key)
+        if player_ref is None:
+            cursor.execute(
+                "SELECT id FROM players WHERE api_id IS ? AND name IS ?",
+                (api_id, name)
+            )
+            row = cursor.fetchone()
+            if row:
+                player_ref = row[0]
+            else:
+                cursor.execute(
+                    "INSERT INTO players (api_id, name) VALUES (?, ?)", (api_id, name)
+                )
+                player_ref = cursor.lastrowid
+            self._lookup_cache[key] = player_ref
+        return player_ref
+    
     def insert_fixture_event(self, event_data: Dict[str, Any]) -> bool:
-        """Inserir evento de um jogo"""
+        """Inserir evento de um jogo (textos convertidos em IDs de lookup)"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO fixture_events (
-                        fixture_id, team_id,
-                        time_elapsed, time_extra,
-                        type, detail,
-                        player_id, player_name,
-                        assist_id, assist_name,
-                        comments
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                cursor.execute(EVENT_INSERT, (
                     event_data.get('fixture_id'),
                     event_data.get('team_id'),
                     event_data.get('time_elapsed'),
                     event_data.get('time_extra'),
-                    event_data.get('type'),
-                    event_data.get('detail'),
-                    event_data.get('player_id'),
-                    event_data.get('player_name'),
-                    event_data.get('assist_id'),
-                    event_data.get('assist_name'),
-                    event_data.get('comments')
+                    self._lookup_id(cursor, 'event_types', event_data.get('type')),
+                    self._lookup_id(cursor, 'event_details', event_data.get('detail')),
+                    self._player_ref(cursor, event_data.get('player_id'),
+                                     event_data.get('player_name')),
+                    self._player_ref(cursor, event_data.get('assist_id'),
+                                     event_data.get('assist_name')),
+                    self._lookup_id(cursor, 'event_comments', event_data.get('comments'))
                 ))
             return True
         except Exception as e:
+            # A transação falhou: IDs novos em cache podem não ter sido gravados
+            self._lookup_cache.clear()
             print(f"❌ Erro ao inserir evento: {e}")
             return False
     
+    def replace_fixture_events(self, fixture_id: int, rows: List[Tuple]) -> int:
+        """
+        Substituir os eventos de um jogo numa única transação
+        
+        Se os eventos são os mesmos que já estão guardados, nada é escrito
+        (nem as equipas ficam marcadas em dirty_teams).
+        
+        Args:
+            rows: Tuplos pela ordem de MatchEvent (models.event_rows)
+        
+        Returns:
+            Número de eventos guardados (-1 em caso de erro)
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                new_rows = [
+                    (fixture, team, elapsed, extra,
+                     self._lookup_id(cursor, 'event_types', event_type),
+                     self._lookup_id(cursor, 'event_details', detail),
+                     self._player_ref(cursor, player_id, player_name),
+                     self._player_ref(cursor, assist_id, assist_name),
+                     self._lookup_id(cursor, 'event_comments', comments))
+                    for (fixture, team, elapsed, extra, event_type, detail,
+                         player_id, player_name, assist_id, assist_name, comments) in rows
+                ]
+                
+                cursor.execute("""
+                    SELECT fixture_id, team_id, time_elapsed, time_extra,
+                           type_id, detail_id, player_ref, assist_ref, comment_id
+                    FROM fixture_events_data WHERE fixture_id = ?
+                """, (fixture_id,))
+                if Counter(map(tuple, cursor.fetchall())) == Counter(new_rows):
+                    return len(rows)
+                
+                cursor.execute("DELETE FROM fixture_events_data WHERE fixture_id = ?",
+                               (fixture_id,))
+                cursor.executemany(EVENT_INSERT, new_rows)
+            return len(rows)
+        except Exception as e:
+            # A transação falhou: IDs novos em cache podem não ter sido gravados
+            self._lookup_cache.clear()
+            print(f"❌ Erro ao inserir eventos: {e}")
+            return -1
+    
+    def delete_fixture_events(self, fixture_id: int) -> bool:
+        """Apagar todos os eventos de um jogo"""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM fixture_events_data WHERE fixture_id = ?",
+                               (fixture_id,))
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao apagar eventos: {e}")
+            return False
+    
     def get_fixture_events(self, fixture_id: int, 
                           event_type: str = None) -> List[Dict]:
         """Obter eventos de um jogo"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            if event_type:
-                cursor.execute("""
-                    SELECT * FROM fixture_events 
-                    WHERE fixture_id = ? AND type = ?
-                    ORDER BY time_elapsed
-                """, (fixture_id, event_type))
-            else:
-                cursor.execute("""
-                    SELECT * FROM fixture_events 
-                    WHERE fixture_id = ?
-                    ORDER BY time_elapsed
-                """, (fixture_id,))
-            
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_fixture_events(fixture_id, event_type))
+    
+    def iter_fixture_events(self, fixture_id: int, event_type: str = None,
+                            chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                            as_tuples: bool = False,
+                            model: type = None) -> Iterator[Any]:
+        """Versão em streaming de get_fixture_events"""
+        if event_type:
+            query = """
+                SELECT * FROM fixture_events 
+                WHERE fixture_id = ? AND type = ?
+                ORDER BY time_elapsed
+            """
+            params = (fixture_id, event_type)
+        else:
+            query = """
+                SELECT * FROM fixture_events 
+                WHERE fixture_id = ?
+                ORDER BY time_elapsed
+            """
+            params = (fixture_id,)
+        
+        return self._iter_query(query, params, chunk_size, as_tuples, model)
     
     def get_goals_by_minute_distribution(self, team_id: int, 
                                         league_id: int,
-                                        season: int = CURRENT_SEASON) -> Dict:
+                                        season: int = CURRENT_SEASON,
+                                        before_date: str = None) -> Dict:
         """
         Obter distribuição de golos por período de tempo
         
+        Args:
+            before_date: Apenas jogos anteriores a esta data (point-in-time)
+        
         Returns:
             {
                 '0-15': {'count': 5, 'percentage': 15.0},
@@ -488,17 +2079,16 @@ class DatabaseManager:
                 ...
             }
         """
+        date_filter = "AND f.date < ?" if before_date else ""
+        params = [team_id, league_id, season]
+        if before_date:
+            params.append(before_date)
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT 
-                    SUM(CASE WHEN time_elapsed <= 15 THEN 1 ELSE 0 END) as g_0_15,
-                    SUM(CASE WHEN time_elapsed > 15 AND time_elapsed <= 30 THEN 1 ELSE 0 END) as g_16_30,
-                    SUM(CASE WHEN time_elapsed > 30 AND time_elapsed <= 45 THEN 1 ELSE 0 END) as g_31_45,
-                    SUM(CASE WHEN time_elapsed > 45 AND time_elapsed <= 60 THEN 1 ELSE 0 END) as g_46_60,
-                    SUM(CASE WHEN time_elapsed > 60 AND time_elapsed <= 75 THEN 1 ELSE 0 END) as g_61_75,
-                    SUM(CASE WHEN time_elapsed > 75 AND time_elapsed <= 90 THEN 1 ELSE 0 END) as g_76_90,
-                    COUNT(*) as total_goals
+                    {GOAL_PERIOD_COLUMNS}
                 FROM fixture_events e
                 JOIN fixtures f ON e.fixture_id = f.id
                 WHERE e.team_id = ?
@@ -507,43 +2097,388 @@ class DatabaseManager:
                 AND f.league_id = ?
                 AND f.season = ?
                 AND f.status_short = 'FT'
-            """, (team_id, league_id, season))
+                {date_filter}
+            """, params)
             
             row = cursor.fetchone()
             if not row or row['total_goals'] == 0:
                 return {}
             
-            total = row['total_goals']
-            return {
-                '0-15': {
-                    'count': row['g_0_15'], 
-                    'percentage': (row['g_0_15'] / total * 100) if total > 0 else 0
-                },
-                '16-30': {
-                    'count': row['g_16_30'],
-                    'percentage': (row['g_16_30'] / total * 100) if total > 0 else 0
-                },
-                '31-45': {
-                    'count': row['g_31_45'],
-                    'percentage': (row['g_31_45'] / total * 100) if total > 0 else 0
-                },
-                '46-60': {
-                    'count': row['g_46_60'],
-                    'percentage': (row['g_46_60'] / total * 100) if total > 0 else 0
-                },
-                '61-75': {
-                    'count': row['g_61_75'],
-                    'percentage': (row['g_61_75'] / total * 100) if total > 0 else 0
-                },
-                '76-90': {
-                    'count': row['g_76_90'],
-                    'percentage': (row['g_76_90'] / total * 100) if total > 0 else 0
-                },
-                'total': total,
-                'first_half_percentage': (
-                    (row['g_0_15'] + row['g_16_30'] + row['g_31_45']) / total * 100
-                ) if total > 0 else 0
+            return self._distribution_from_row(row)
+    
+    @staticmethod
+    def _distribution_from_row(row: sqlite3.Row) -> Dict:
+        """Converter contagens por período em {período: {count, percentage}}"""
+        total = row['total_goals']
+        distribution = {}
+        for label, _, _ in GOAL_PERIODS:
+            count = row[f"g_{label.replace('-', '_')}"]
+            distribution[label] = {
+                'count': count,
+                'percentage': (count / total * 100) if total > 0 else 0
             }
+        distribution['total'] = total
+        distribution['first_half_percentage'] = (
+            (row['g_0_15'] + row['g_16_30'] + row['g_31_45']) / total * 100
+        ) if total > 0 else 0
+        return distribution
+    
+    # ========================================================================
+    # FETCH LEDGER - Estado do enriquecimento por jogo
+    # ========================================================================
+    
+    def mark_fixture_fetched(self, fixture_id: int, kind: str,
+                             found: bool) -> bool:
+        """
+        Registar um pedido de estatísticas/eventos de um jogo
+        
+        Args:
+            fixture_id: ID do jogo
+            kind: 'stats' ou 'events'
+            found: Se a API devolveu dados (False = resposta vazia)
+        """
+        if kind not in LEDGER_KINDS:
+            raise ValueError(f"Tipo de enriquecimento inválido: {kind}")
+        
+        try:
+            with self.get_connection() as conn:
+                conn.execute(f"""
+                    INSERT INTO fixture_fetch_ledger (
+                        fixture_id, status_short,
+                        has_{kind}, {kind}_fetched_at, {kind}_attempts
+                    ) VALUES (
+                        ?, (SELECT status_short FROM fixtures WHERE id = ?),
+                        ?, CURRENT_TIMESTAMP, 1
+                    )
+                    ON CONFLICT (fixture_id) DO UPDATE SET
+                        status_short = COALESCE(excluded.status_short, status_short),
+                        has_{kind} = has_{kind} OR excluded.has_{kind},
+                        {kind}_fetched_at = CURRENT_TIMESTAMP,
+                        {kind}_attempts = {kind}_attempts + 1,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (fixture_id, fixture_id, int(found)))
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao atualizar ledger do jogo {fixture_id}: {e}")
+            return False
+    
+    def get_fixture_ledger(self, fixture_id: int) -> Optional[Dict]:
+        """Entrada do ledger de um jogo (None se nunca foi enriquecido)"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM fixture_fetch_ledger WHERE fixture_id = ?",
+                (fixture_id,)
+            ).fetchone()
+            return dict(row) if row else None
+    
+    def get_enrichment_needs(self, fixture_ids: Iterable[int]) -> Dict[int, Dict[str, bool]]:
+        """
+        Jogos que ainda precisam de estatísticas e/ou eventos
+        
+        Um pedido é necessário se nunca foi feito, ou se a API respondeu
+        vazio há mais de FETCH_LEDGER_PARAMS['empty_retry_hours'] e ainda
+        não se esgotaram as tentativas. Jogos já completos não aparecem.
+        
+        Args:
+            fixture_ids: IDs dos jogos terminados a verificar
+        
+        Returns:
+            {fixture_id: {'stats': bool, 'events': bool}}
+        """
+        ids = list(dict.fromkeys(fixture_ids))
+        if not ids:
+            return {}
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT ids.value AS fixture_id,
+                       {LEDGER_DUE.format(kind='stats')} AS stats,
+                       {LEDGER_DUE.format(kind='events')} AS events
+                FROM json_each(:ids) ids
+                LEFT JOIN fixture_fetch_ledger l ON l.fixture_id = ids.value
+            """, {'ids': json.dumps(ids), **_ledger_due_params()}).fetchall()
+        
+        return {
+            row['fixture_id']: {'stats': bool(row['stats']), 'events': bool(row['events'])}
+            for row in rows if row['stats'] or row['events']
+        }
+    
+    def get_enrichment_targets(self, fixture_ids: Iterable[int],
+                               stats_last_n: int, min_total_goals: int,
+                               season: int = CURRENT_SEASON) -> Dict[int, Dict[str, bool]]:
+        """
+        Que jogos terminados o scoring vai de facto consumir
+        
+        - stats: o jogo está entre os últimos stats_last_n jogos FT de
+          alguma das suas equipas (na mesma liga, na temporada season)
+        - events: jogo da temporada season com pelo menos min_total_goals
+        
+        Jogos de outras temporadas (ex.: H2H antigos) só precisam do resultado.
+        
+        Returns:
+            {fixture_id: {'stats': bool, 'events': bool}} (só jogos FT)
+        """
+        ids = list(dict.fromkeys(fixture_ids))
+        if not ids:
+            return {}
+        
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                WITH target AS (
+                    SELECT f.id, f.league_id, f.season, f.home_team_id,
+                           f.away_team_id, f.total_goals
+                    FROM json_each(:ids) ids
+                    JOIN fixtures f ON f.id = ids.value
+                    WHERE f.status_short = 'FT'
+                ),
+                team_leagues AS (
+                    SELECT home_team_id AS team_id, league_id FROM target WHERE season = :season
+                    UNION
+                    SELECT away_team_id, league_id FROM target WHERE season = :season
+                ),
+                recent AS (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY team_id, league_id ORDER BY date DESC
+                        ) AS position
+                        FROM (
+                            SELECT t.team_id, t.league_id, f.id, f.date
+                            FROM team_leagues t
+                            JOIN fixtures f ON f.home_team_id = t.team_id
+                             AND f.league_id = t.league_id AND f.season = :season
+                             AND f.status_short = 'FT'
+                            UNION ALL
+                            SELECT t.team_id, t.league_id, f.id, f.date
+                            FROM team_leagues t
+                            JOIN fixtures f ON f.away_team_id = t.team_id
+                             AND f.league_id = t.league_id AND f.season = :season
+                             AND f.status_short = 'FT'
+                        )
+                    )
+                    WHERE position <= :last_n
+                )
+                SELECT id AS fixture_id,
+                       id IN (SELECT id FROM recent) AS stats,
+                       season = :season AND COALESCE(total_goals, 0) >= :min_goals AS events
+                FROM target
+            """, {'ids': json.dumps(ids), 'season': season,
+                  'last_n': stats_last_n, 'min_goals': min_total_goals}).fetchall()
+        
+        return {
+            row['fixture_id']: {'stats': bool(row['stats']), 'events': bool(row['events'])}
+            for row in rows
+        }
+    
+    def get_enrichment_backlog(self, keys: Iterable[Tuple[int, int]],
+                               stats_last_n: int, min_total_goals: int,
+                               season: int = CURRENT_SEASON) -> Dict[Tuple[int, int], int]:
+        """
+        Estimativa de pedidos de enriquecimento por equipa (planeamento)
+        
+        Conta, nos últimos stats_last_n jogos FT da equipa na liga, as
+        estatísticas e eventos ainda em dívida no ledger, mais 2 pedidos por
+        cada jogo que falta na BD para chegar a stats_last_n (virão no fetch).
+        
+        Returns:
+            {(team_id, league_id): pedidos estimados}
+        """
+        keys = list(dict.fromkeys(keys))
+        backlog = {key: 2 * stats_last_n for key in keys}
+        if not keys:
+            return backlog
+        
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                WITH {TEAM_KEYS_CTE},
+                games AS (
+                    SELECT k.team_id, k.league_id, f.id, f.date, f.total_goals
+                    FROM keys k
+                    JOIN fixtures f ON f.home_team_id = k.team_id
+                     AND f.league_id = k.league_id
+                     AND f.season = :season AND f.status_short = 'FT'
+                    UNION ALL
+                    SELECT k.team_id, k.league_id, f.id, f.date, f.total_goals
+                    FROM keys k
+                    JOIN fixtures f ON f.away_team_id = k.team_id
+                     AND f.league_id = k.league_id
+                     AND f.season = :season AND f.status_short = 'FT'
+                ),
+                ranked AS (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY team_id, league_id ORDER BY date DESC
+                    ) AS position
+                    FROM games
+                )
+                SELECT r.team_id, r.league_id,
+                       COUNT(*) AS games,
+                       SUM({LEDGER_DUE.format(kind='stats')}) AS stats,
+                       SUM(COALESCE(r.total_goals, 0) >= :min_goals
+                           AND {LEDGER_DUE.format(kind='events')}) AS events
+                FROM ranked r
+                LEFT JOIN fixture_fetch_ledger l ON l.fixture_id = r.id
+                WHERE r.position <= :last_n
+                GROUP BY r.team_id, r.league_id
+            """, {'keys': json.dumps(keys), 'season': season,
+                  'last_n': stats_last_n, 'min_goals': min_total_goals,
+                  **_ledger_due_params()}).fetchall()
+        
+        for row in rows:
+            missing = max(0, stats_last_n - row['games'])
+            backlog[(row['team_id'], row['league_id'])] = (
+                row['stats'] + row['events'] + 2 * missing
+            )
+        return backlog
+    
+    def get_ledger_summary(self) -> Dict:
+        """Contagens do ledger (jogos com/sem estatísticas e eventos)"""
+        with self.get_connection() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*) AS fixtures,
+                       COALESCE(SUM(has_stats), 0) AS with_stats,
+                       COALESCE(SUM(has_events), 0) AS with_events,
+                       COALESCE(SUM(stats_attempts + events_attempts), 0) AS requests
+                FROM fixture_fetch_ledger
+            """).fetchone()
+            return dict(row)
+    
+    # ========================================================================
+    # BACKFILL - Checkpoints por liga x temporada
+    # ========================================================================
+    
+    def get_backfill_checkpoint(self, league_id: int, season: int) -> Optional[Dict]:
+        """Checkpoint de uma liga/temporada (None se nunca foi iniciada)"""
+        with self.get_connection() as conn:
+            row = conn.execute("""
+                SELECT * FROM backfill_checkpoints
+                WHERE league_id = ? AND season = ?
+            """, (league_id, season)).fetchone()
+            return dict(row) if row else None
+    
+    def get_backfill_checkpoints(self) -> List[Dict]:
+        """Todos os checkpoints, por liga e temporada (mais recente primeiro)"""
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT * FROM backfill_checkpoints
+                ORDER BY league_id, season DESC
+            """).fetchall()
+            return [dict(row) for row in rows]
+    
+    def save_backfill_checkpoint(self, league_id: int, season: int, status: str,
+                                 fixtures_total: int = None,
+                                 fixtures_finished: int = None,
+                                 enrich_requests: int = 0) -> bool:
+        """
+        Atualizar o checkpoint de uma liga/temporada
+        
+        Args:
+            status: 'pending', 'fixtures' ou 'done'
+            fixtures_total / fixtures_finished: None mantém o valor guardado
+            enrich_requests: Pedidos de enriquecimento a somar ao total
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute("""
+                    INSERT INTO backfill_checkpoints (
+                        league_id, season, status,
+                        fixtures_total, fixtures_finished, enrich_requests
+                    ) VALUES (?, ?, ?, COALESCE(?, 0), COALESCE(?, 0), ?)
+                    ON CONFLICT (league_id, season) DO UPDATE SET
+                        status = excluded.status,
+                        fixtures_total = COALESCE(?, fixtures_total),
+                        fixtures_finished = COALESCE(?, fixtures_finished),
+                        enrich_requests = enrich_requests + excluded.enrich_requests,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (league_id, season, status, fixtures_total, fixtures_finished,
+                      enrich_requests, fixtures_total, fixtures_finished))
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao guardar checkpoint {league_id}/{season}: {e}")
+            return False
+    
+    def get_upcoming_fixture_counts(self, days: int = 7) -> Dict[int, int]:
+        """Jogos por disputar nos próximos dias, por liga"""
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT league_id, COUNT(*) AS upcoming
+                FROM fixtures
+                WHERE status_short IN ('NS', 'TBD')
+                  AND date(date) BETWEEN date('now') AND date('now', ?)
+                GROUP BY league_id
+            """, (f'+{days} days',)).fetchall()
+            return {row['league_id']: row['upcoming'] for row in rows}
+    
+    def get_fixture_ids_by_demand(self, league_id: int, season: int,
+                                  days: int = 7) -> List[int]:
+        """
+        Jogos terminados de uma liga/temporada, primeiro os que alimentam
+        mais jogos próximos (equipas que jogam nos próximos dias)
+        
+        Returns:
+            IDs por procura decrescente e, em empate, do mais recente
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                WITH upcoming AS (
+                    SELECT team_id, COUNT(*) AS games FROM (
+                        SELECT home_team_id AS team_id FROM fixtures
+                        WHERE status_short IN ('NS', 'TBD')
+                          AND date(date) BETWEEN date('now') AND date('now', :window)
+                        UNION ALL
+                        SELECT away_team_id FROM fixtures
+                        WHERE status_short IN ('NS', 'TBD')
+                          AND date(date) BETWEEN date('now') AND date('now', :window)
+                    )
+                    GROUP BY team_id
+                )
+                SELECT f.id
+                FROM fixtures f
+                LEFT JOIN upcoming h ON h.team_id = f.home_team_id
+                LEFT JOIN upcoming a ON a.team_id = f.away_team_id
+                WHERE f.league_id = :league AND f.season = :season
+                  AND f.status_short = 'FT'
+                ORDER BY COALESCE(h.games, 0) + COALESCE(a.games, 0) DESC, f.date DESC
+            """, {'league': league_id, 'season': season,
+                  'window': f'+{days} days'}).fetchall()
+            return [row['id'] for row in rows]
+    
+    # ========================================================================
+    # API USAGE - Pedidos por dia e origem
+    # ========================================================================
+    
+    def record_api_usage(self, source: str, requests: int, day: str = None) -> bool:
+        """
+        Somar pedidos feitos à API ao uso do dia
+        
+        Args:
+            source: 'live' ou 'backfill'
+            requests: Pedidos a acrescentar
+            day: Data (YYYY-MM-DD, default: hoje)
+        """
+        if requests <= 0:
+            return True
+        
+        try:
+            with self.get_connection() as conn:
+                conn.execute("""
+                    INSERT INTO api_usage (day, source, requests)
+                    VALUES (COALESCE(?, date('now', 'localtime')), ?, ?)
+                    ON CONFLICT (day, source) DO UPDATE SET
+                        requests = requests + excluded.requests,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (day, source, requests))
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao registar uso da API: {e}")
+            return False
+    
+    def get_api_usage(self, day: str = None) -> Dict[str, int]:
+        """Pedidos de um dia por origem (default: hoje)"""
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT source, requests FROM api_usage
+                WHERE day = COALESCE(?, date('now', 'localtime'))
+            """, (day,)).fetchall()
+            return {row['source']: row['requests'] for row in rows}
     
     # ========================================================================
     # TEAM STATISTICS - Estatísticas agregadas da temporada
@@ -564,29 +2499,52 @@ class DatabaseManager:
     # ========================================================================
     
     def insert_prediction(self, prediction_data: Dict[str, Any]) -> bool:
-        """Inserir previsão"""
+        """Inserir previsão (uma por jogo: recalcular atualiza a linha e updated_at, mantém created_at)"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    INSERT OR REPLACE INTO predictions (
+                    INSERT INTO predictions (
                         fixture_id, date, league_id, league_name,
-                        home_team, away_team,
+                        home_team, away_team, home_team_id, away_team_id,
                         score_over_05_ht, confidence_over_05_ht, recommendation_over_05_ht,
                         h2h_score, home_form_score, away_form_score,
                         offensive_pressure_score, minute_distribution_score,
                         score_over_15_ft, confidence_over_15_ft, recommendation_over_15_ft,
                         h2h_score_o15, home_form_score_o15, away_form_score_o15,
                         offensive_pressure_score_o15,
-                        reasoning
+                        reasoning, input_seq
                     ) VALUES (
-                        ?, ?, ?, ?, ?, ?,
+                        ?, ?, ?, ?, ?, ?, ?, ?,
                         ?, ?, ?,
                         ?, ?, ?, ?, ?,
                         ?, ?, ?,
                         ?, ?, ?, ?,
-                        ?
+                        ?, ?
                     )
+                    ON CONFLICT(fixture_id) DO UPDATE SET
+                        date = excluded.date, league_id = excluded.league_id,
+                        league_name = excluded.league_name, home_team = excluded.home_team,
+                        away_team = excluded.away_team,
+                        home_team_id = excluded.home_team_id,
+                        away_team_id = excluded.away_team_id,
+                        score_over_05_ht = excluded.score_over_05_ht,
+                        confidence_over_05_ht = excluded.confidence_over_05_ht,
+                        recommendation_over_05_ht = excluded.recommendation_over_05_ht,
+                        h2h_score = excluded.h2h_score,
+                        home_form_score = excluded.home_form_score,
+                        away_form_score = excluded.away_form_score,
+                        offensive_pressure_score = excluded.offensive_pressure_score,
+                        minute_distribution_score = excluded.minute_distribution_score,
+                        score_over_15_ft = excluded.score_over_15_ft,
+                        confidence_over_15_ft = excluded.confidence_over_15_ft,
+                        recommendation_over_15_ft = excluded.recommendation_over_15_ft,
+                        h2h_score_o15 = excluded.h2h_score_o15,
+                        home_form_score_o15 = excluded.home_form_score_o15,
+                        away_form_score_o15 = excluded.away_form_score_o15,
+                        offensive_pressure_score_o15 = excluded.offensive_pressure_score_o15,
+                        reasoning = excluded.reasoning, input_seq = excluded.input_seq,
+                        updated_at = CURRENT_TIMESTAMP
                 """, (
                     prediction_data.get('fixture_id'),
                     prediction_data.get('date'),
@@ -594,6 +2552,8 @@ class DatabaseManager:
                     prediction_data.get('league_name'),
                     prediction_data.get('home_team'),
                     prediction_data.get('away_team'),
+                    prediction_data.get('home_team_id'),
+                    prediction_data.get('away_team_id'),
                     prediction_data.get('score_over_05_ht'),
                     prediction_data.get('confidence_over_05_ht'),
                     prediction_data.get('recommendation_over_05_ht'),
@@ -609,23 +2569,56 @@ class DatabaseManager:
                     prediction_data.get('home_form_score_o15'),
                     prediction_data.get('away_form_score_o15'),
                     prediction_data.get('offensive_pressure_score_o15'),
-                    prediction_data.get('reasoning')
+                    prediction_data.get('reasoning'),
+                    prediction_data.get('input_seq')
                 ))
             return True
         except Exception as e:
             print(f"❌ Erro ao inserir previsão: {e}")
             return False
     
+    def get_change_seq(self) -> int:
+        """Sequência da última alteração registada em dirty_teams"""
+        with self.get_connection() as conn:
+            return conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) AS seq FROM dirty_teams"
+            ).fetchone()['seq']
+    
+    def get_current_prediction(self, fixture_id: int) -> Optional[Dict]:
+        """
+        Previsão guardada de um jogo, se nenhuma das equipas mudou desde o cálculo
+        
+        Returns:
+            Linha de predictions, ou None se não existe ou está desatualizada
+        """
+        with self.get_connection() as conn:
+            row = conn.execute("""
+                SELECT p.* FROM predictions p
+                WHERE p.fixture_id = ? AND p.input_seq IS NOT NULL
+                  AND NOT EXISTS (
+                      SELECT 1 FROM dirty_teams d
+                      WHERE d.team_id IN (p.home_team_id, p.away_team_id)
+                        AND d.league_id = p.league_id
+                        AND d.seq > p.input_seq
+                  )
+                ORDER BY p.id DESC LIMIT 1
+            """, (fixture_id,)).fetchone()
+            return dict(row) if row else None
+    
     def get_predictions_by_date(self, date: str) -> List[Dict]:
         """Obter previsões por data"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM predictions 
-                WHERE date(date) = date(?)
-                ORDER BY score_over_05_ht DESC
-            """, (date,))
-            return [dict(row) for row in cursor.fetchall()]
+        return list(self.iter_predictions_by_date(date))
+    
+    def iter_predictions_by_date(self, date: str,
+                                 chunk_size: int = DB_STREAM_CHUNK_SIZE,
+                                 as_tuples: bool = False,
+                                 model: type = None) -> Iterator[Any]:
+        """Versão em streaming de get_predictions_by_date"""
+        return self._iter_query("""
+            SELECT * FROM predictions 
+            WHERE date(date) = date(?)
+            ORDER BY score_over_05_ht DESC
+        """, (date,), chunk_size, as_tuples, model)
     
     def validate_prediction(self, fixture_id: int) -> bool:
         """
@@ -732,6 +2725,260 @@ class DatabaseManager:
                 'accuracy_ft': (row['correct_ft'] / row['total'] * 100)
             }
     
+    # ========================================================================
+    # MANUTENÇÃO - ANALYZE, PRAGMA optimize, incremental vacuum
+    # ========================================================================
+    
+    @staticmethod
+    def _page_stats(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """(page_count, freelist_count)"""
+        return (conn.execute("PRAGMA page_count").fetchone()[0],
+                conn.execute("PRAGMA freelist_count").fetchone()[0])
+    
+    def _log_maintenance(self, conn: sqlite3.Connection, task: str,
+                         elapsed: float, before: Tuple[int, int],
+                         after: Tuple[int, int], details: Dict = None):
+        conn.execute("""
+            INSERT INTO maintenance_log (
+                task, duration_ms,
+                page_count_before, page_count_after,
+                freelist_before, freelist_after,
+                details
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (task, elapsed * 1000, before[0], after[0], before[1], after[1],
+              json.dumps(details or {})))
+    
+    def get_last_maintenance(self, task: str) -> Optional[Dict]:
+        """Última execução de uma tarefa de manutenção"""
+        with self.get_connection() as conn:
+            row = conn.execute("""
+                SELECT * FROM maintenance_log WHERE task = ?
+                ORDER BY id DESC LIMIT 1
+            """, (task,)).fetchone()
+            if not row:
+                return None
+            last = dict(row)
+            last['details'] = json.loads(last['details'] or '{}')
+            return last
+    
+    def _maintenance_row_counts(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in MAINTENANCE_TABLES
+        }
+    
+    def analyze(self) -> Dict:
+        """
+        Atualizar estatísticas do query planner (ANALYZE + PRAGMA optimize)
+        
+        Returns:
+            {'duration_ms', 'rows'}
+        """
+        with self.get_connection() as conn:
+            before = self._page_stats(conn)
+            start = time.perf_counter()
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize")
+            elapsed = time.perf_counter() - start
+            
+            rows = self._maintenance_row_counts(conn)
+            self._log_maintenance(conn, 'analyze', elapsed, before,
+                                  self._page_stats(conn), {'rows': rows})
+        
+        print(f"📈 ANALYZE concluído em {elapsed * 1000:.0f} ms")
+        return {'duration_ms': elapsed * 1000, 'rows': rows}
+    
+    def incremental_vacuum(self, pages: int = None) -> Dict:
+        """
+        Devolver páginas livres ao sistema (PRAGMA incremental_vacuum)
+        
+        Só corre em BDs com auto_vacuum=INCREMENTAL; as restantes têm de ser
+        convertidas antes com convert_auto_vacuum() (VACUUM completo).
+        
+        Args:
+            pages: Máximo de páginas a libertar (None = todas)
+        
+        Returns:
+            {'pages_freed', 'bytes_freed', ...} ou {} se a BD não está em
+            modo INCREMENTAL
+        """
+        conn = self._connect()
+        conn.isolation_level = None  # incremental_vacuum fora de transações
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                print("⚠️  BD sem auto_vacuum=INCREMENTAL: converter com "
+                      "scripts/maintenance.py --convert")
+                return {}
+            
+            before = self._page_stats(conn)
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            start = time.perf_counter()
+            # execute() só faz um passo (uma página); executescript corre até ao fim
+            conn.executescript(f"PRAGMA incremental_vacuum({int(pages or 0)})")
+            elapsed = time.perf_counter() - start
+            after = self._page_stats(conn)
+            
+            result = self._vacuum_result(elapsed, before, after, page_size)
+            self._log_maintenance(conn, 'vacuum', elapsed, before, after)
+            
+            print(f"🧹 {result['pages_freed']} páginas libertadas "
+                  f"({result['bytes_freed'] / 1024:.0f} KB)")
+            return result
+        finally:
+            conn.close()
+    
+    def convert_auto_vacuum(self) -> Dict:
+        """
+        Converter a BD para auto_vacuum=INCREMENTAL (VACUUM completo)
+        
+        Reescreve o ficheiro inteiro e bloqueia a BD enquanto corre; é um
+        passo explícito (scripts/maintenance.py --convert), nunca feito
+        pela manutenção de rotina.
+        
+        Returns:
+            {'converted', 'pages_freed', 'bytes_freed', ...}
+            ({'converted': False} se a BD já estava em modo INCREMENTAL)
+        """
+        conn = self._connect()
+        conn.isolation_level = None  # VACUUM não corre dentro de transações
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+                print("✅ BD já está em auto_vacuum=INCREMENTAL")
+                return {'converted': False}
+            
+            print("🔄 A converter BD para auto_vacuum=INCREMENTAL (VACUUM completo)...")
+            before = self._page_stats(conn)
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            start = time.perf_counter()
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            elapsed = time.perf_counter() - start
+            after = self._page_stats(conn)
+            
+            result = {'converted': True,
+                      **self._vacuum_result(elapsed, before, after, page_size)}
+            self._log_maintenance(conn, 'convert', elapsed, before, after)
+            
+            print(f"✅ BD convertida: {result['page_count_before']} → "
+                  f"{result['page_count_after']} páginas")
+            return result
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _vacuum_result(elapsed: float, before: Tuple[int, int],
+                       after: Tuple[int, int], page_size: int) -> Dict:
+        return {
+            'duration_ms': elapsed * 1000,
+            'page_count_before': before[0],
+            'page_count_after': after[0],
+            'freelist_before': before[1],
+            'freelist_after': after[1],
+            'pages_freed': before[0] - after[0],
+            'bytes_freed': (before[0] - after[0]) * page_size,
+        }
+    
+    def get_index_report(self) -> List[Dict]:
+        """
+        Índices das tabelas, estatísticas do ANALYZE e que queries os usam
+        
+        O SQLite não conta acessos a índices; o uso é inferido do
+        EXPLAIN QUERY PLAN das queries representativas (INDEX_PROBES).
+        """
+        with self.get_connection() as conn:
+            used_by: Dict[str, List[str]] = {}
+            for probe, (sql, params) in INDEX_PROBES.items():
+                for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+                    detail = row[3]
+                    for keyword in ('USING INDEX ', 'USING COVERING INDEX '):
+                        if keyword in detail:
+                            name = detail.split(keyword, 1)[1].split(' ')[0]
+                            used_by.setdefault(name, []).append(probe)
+            
+            stat1 = {}
+            if conn.execute("""
+                SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'
+            """).fetchone():
+                stat1 = {row[0]: row[1] for row in conn.execute(
+                    "SELECT idx, stat FROM sqlite_stat1 WHERE idx IS NOT NULL"
+                )}
+            
+            report = []
+            for row in conn.execute("""
+                SELECT name, tbl_name FROM sqlite_master
+                WHERE type = 'index' AND name NOT LIKE 'sqlite_%'
+                ORDER BY tbl_name, name
+            """):
+                name, table = row[0], row[1]
+                columns = [c[2] for c in conn.execute(f"PRAGMA index_info({name})")]
+                report.append({
+                    'index': name,
+                    'table': table,
+                    'columns': columns,
+                    'stat': stat1.get(name),
+                    'used_by': sorted(set(used_by.get(name, []))),
+                })
+            return report
+    
+    def run_maintenance(self, force: bool = False) -> Dict:
+        """
+        Correr as tarefas de manutenção em atraso
+        
+        - ANALYZE + PRAGMA optimize: sem estatísticas ou tabelas de jogos
+          mudaram mais de analyze_growth_pct (linhas) desde o último
+        - Incremental vacuum: passou vacuum_interval_hours desde o último
+          e há pelo menos vacuum_min_free_pages páginas livres (só em BDs
+          já com auto_vacuum=INCREMENTAL; ver convert_auto_vacuum)
+        
+        Args:
+            force: Correr tudo independentemente do agendamento
+        
+        Returns:
+            {tarefa: resultado} das tarefas executadas
+        """
+        if self.read_only:
+            print("⚠️  Manutenção ignorada (BD só de leitura)")
+            return {}
+        
+        params = MAINTENANCE_PARAMS
+        done = {}
+        
+        try:
+            with self.get_connection() as conn:
+                rows = self._maintenance_row_counts(conn)
+                freelist = self._page_stats(conn)[1]
+                incremental = conn.execute(
+                    "PRAGMA auto_vacuum"
+                ).fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+            
+            last = self.get_last_maintenance('analyze')
+            analyze_due = force or last is None
+            if last and not analyze_due:
+                previous = sum(last['details'].get('rows', {}).values())
+                growth = abs(sum(rows.values()) - previous) / max(previous, 1) * 100
+                analyze_due = growth >= params['analyze_growth_pct']
+            if analyze_due:
+                done['analyze'] = self.analyze()
+            
+            # Sem modo INCREMENTAL só um VACUUM completo liberta páginas:
+            # fica para scripts/maintenance.py --convert
+            vacuum_due = incremental and force
+            if incremental and not vacuum_due and freelist >= params['vacuum_min_free_pages']:
+                with self.get_connection() as conn:
+                    # run_at é CURRENT_TIMESTAMP (UTC): comparar em SQL
+                    recent = conn.execute("""
+                        SELECT 1 FROM maintenance_log
+                        WHERE task = 'vacuum' AND run_at > datetime('now', ?)
+                    """, (f"-{params['vacuum_interval_hours']} hours",)).fetchone()
+                vacuum_due = recent is None
+            if vacuum_due:
+                done['vacuum'] = self.incremental_vacuum()
+            
+        except Exception as e:
+            print(f"❌ Erro na manutenção: {e}")
+        
+        return done
+    
     def get_database_stats(self) -> Dict:
         """Obter estatísticas gerais da BD"""
         with self.get_connection() as conn:
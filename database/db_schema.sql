@@ -3,6 +3,10 @@
 -- Objetivo: Análise Over 0.5 HT (golo na 1ª parte) e Over 1.5 FT (2+ golos)
 -- ============================================================================
 
+-- Páginas livres recuperáveis com PRAGMA incremental_vacuum
+-- (só tem efeito em BDs novas; as existentes: scripts/maintenance.py --convert)
+PRAGMA auto_vacuum = INCREMENTAL;
+
 -- ============================================================================
 -- TABELA: teams
 -- Armazena informações básicas das equipas
@@ -85,6 +89,10 @@ CREATE TABLE IF NOT EXISTS fixtures (
     home_goals_penalty INTEGER,
     away_goals_penalty INTEGER,
     
+    -- Colunas geradas (calculadas pelo SQLite em cada escrita)
+    ht_goals INTEGER GENERATED ALWAYS AS (home_goals_halftime + away_goals_halftime) STORED,
+    total_goals INTEGER GENERATED ALWAYS AS (home_goals + away_goals) STORED,
+    
     -- Timestamps
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -146,11 +154,36 @@ CREATE TABLE IF NOT EXISTS fixture_statistics (
 );
 
 -- ============================================================================
--- TABELA: fixture_events
--- Eventos do jogo com minuto exato
+-- TABELAS DE LOOKUP dos eventos (dicionário de strings repetidas)
+-- Cada texto é guardado uma única vez; os eventos guardam só o ID
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS event_types (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE  -- Goal, Card, subst, Var
+);
+
+CREATE TABLE IF NOT EXISTS event_details (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE  -- Normal Goal, Own Goal, Penalty, Yellow Card, etc.
+);
+
+CREATE TABLE IF NOT EXISTS event_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    api_id INTEGER,  -- ID do jogador na API (pode faltar)
+    name TEXT
+);
+
+-- ============================================================================
+-- TABELA: fixture_events_data
+-- Eventos do jogo com minuto exato (colunas de texto codificadas em IDs)
 -- ESSENCIAL para análise de distribuição de golos por minuto
 -- ============================================================================
-CREATE TABLE IF NOT EXISTS fixture_events (
+CREATE TABLE IF NOT EXISTS fixture_events_data (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     fixture_id INTEGER NOT NULL,
     team_id INTEGER NOT NULL,
@@ -160,26 +193,53 @@ CREATE TABLE IF NOT EXISTS fixture_events (
     time_extra INTEGER,
     
     -- Tipo de evento
-    type TEXT NOT NULL,  -- Goal, Card, subst, Var
-    detail TEXT,  -- Normal Goal, Own Goal, Penalty, Yellow Card, etc.
+    type_id INTEGER NOT NULL,
+    detail_id INTEGER,
     
-    -- Jogador
-    player_id INTEGER,
-    player_name TEXT,
-    
-    -- Assistência (para golos)
-    assist_id INTEGER,
-    assist_name TEXT,
+    -- Jogador e assistência (IDs da tabela players)
+    player_ref INTEGER,
+    assist_ref INTEGER,
     
     -- Informação adicional
-    comments TEXT,
+    comment_id INTEGER,
     
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     FOREIGN KEY (fixture_id) REFERENCES fixtures(id),
-    FOREIGN KEY (team_id) REFERENCES teams(id)
+    FOREIGN KEY (team_id) REFERENCES teams(id),
+    FOREIGN KEY (type_id) REFERENCES event_types(id),
+    FOREIGN KEY (detail_id) REFERENCES event_details(id),
+    FOREIGN KEY (player_ref) REFERENCES players(id),
+    FOREIGN KEY (assist_ref) REFERENCES players(id),
+    FOREIGN KEY (comment_id) REFERENCES event_comments(id)
 );
 
+-- ============================================================================
+-- VIEW: fixture_events
+-- Mesmas colunas da antiga tabela fixture_events (só leitura)
+-- ============================================================================
+CREATE VIEW IF NOT EXISTS fixture_events AS
+SELECT
+    e.id,
+    e.fixture_id,
+    e.team_id,
+    e.time_elapsed,
+    e.time_extra,
+    t.name AS type,
+    d.name AS detail,
+    p.api_id AS player_id,
+    p.name AS player_name,
+    a.api_id AS assist_id,
+    a.name AS assist_name,
+    c.name AS comments,
+    e.created_at
+FROM fixture_events_data e
+JOIN event_types t ON t.id = e.type_id
+LEFT JOIN event_details d ON d.id = e.detail_id
+LEFT JOIN players p ON p.id = e.player_ref
+LEFT JOIN players a ON a.id = e.assist_ref
+LEFT JOIN event_comments c ON c.id = e.comment_id;
+
 -- ============================================================================
 -- TABELA: team_statistics
 -- Estatísticas agregadas da equipa na temporada
@@ -277,6 +337,8 @@ CREATE TABLE IF NOT EXISTS predictions (
     league_name TEXT NOT NULL,
     home_team TEXT NOT NULL,
     away_team TEXT NOT NULL,
+    home_team_id INTEGER,
+    away_team_id INTEGER,
     
     -- OVER 0.5 HT (Golo na 1ª Parte)
     score_over_05_ht REAL NOT NULL,
@@ -304,14 +366,18 @@ CREATE TABLE IF NOT EXISTS predictions (
     -- Reasoning
     reasoning TEXT,
     
+    -- Última alteração de dirty_teams vista quando foi calculada
+    input_seq INTEGER,
+    
     -- Validação (após o jogo)
     actual_result_ht INTEGER,  -- 1 se houve golo HT, 0 se não
     actual_result_ft INTEGER,  -- Total de golos FT
     prediction_correct_ht BOOLEAN,
     prediction_correct_ft BOOLEAN,
     
-    -- Timestamps
+    -- Timestamps (created_at: primeiro cálculo; updated_at: último recálculo)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     validated_at TIMESTAMP,
     
     FOREIGN KEY (fixture_id) REFERENCES fixtures(id),
@@ -347,24 +413,145 @@ CREATE TABLE IF NOT EXISTS prediction_accuracy (
     UNIQUE(date, league_id)
 );
 
+-- ============================================================================
+-- TABELA: maintenance_log
+-- Histórico de ANALYZE / incremental vacuum (agendamento da manutenção)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS maintenance_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task TEXT NOT NULL,  -- analyze, vacuum, convert
+    run_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duration_ms REAL,
+    
+    -- Páginas antes/depois (fragmentação recuperada)
+    page_count_before INTEGER,
+    page_count_after INTEGER,
+    freelist_before INTEGER,
+    freelist_after INTEGER,
+    
+    details TEXT  -- JSON (ex.: linhas por tabela no momento do ANALYZE)
+);
+
+-- ============================================================================
+-- TABELA: fixture_fetch_ledger
+-- Estado do enriquecimento de cada jogo (estatísticas/eventos já obtidos)
+-- Jogos terminados não mudam: com dados completos não voltam a ser pedidos
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS fixture_fetch_ledger (
+    fixture_id INTEGER PRIMARY KEY,
+    status_short TEXT,  -- Status do jogo no último fetch
+    
+    has_stats BOOLEAN DEFAULT 0,
+    stats_fetched_at TIMESTAMP,
+    stats_attempts INTEGER DEFAULT 0,
+    
+    has_events BOOLEAN DEFAULT 0,
+    events_fetched_at TIMESTAMP,
+    events_attempts INTEGER DEFAULT 0,
+    
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- TABELA: backfill_checkpoints
+-- Progresso do backfill histórico por liga x temporada (scripts/backfill.py)
+-- status: 'pending' -> 'fixtures' (jogos guardados) -> 'done' (enriquecidos)
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    
+    fixtures_total INTEGER DEFAULT 0,     -- Jogos devolvidos pela API
+    fixtures_finished INTEGER DEFAULT 0,  -- Dos quais terminados (FT)
+    enrich_requests INTEGER DEFAULT 0,    -- Pedidos de estatísticas/eventos feitos
+    
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (league_id, season)
+);
+
+-- ============================================================================
+-- TABELA: api_usage
+-- Pedidos à API por dia e origem ('live' = análise do dia, 'backfill')
+-- Partilhada entre processos para repartir a quota diária
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS api_usage (
+    day DATE NOT NULL,
+    source TEXT NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (day, source)
+);
+
+-- ============================================================================
+-- TABELA: dirty_teams
+-- Última alteração dos dados de análise de cada equipa/liga (resultado FT
+-- novo ou corrigido, estatísticas, eventos), preenchida por triggers.
+-- Uma previsão só é recalculada se uma das equipas tem seq > input_seq.
+-- Um jogo entre A e B marca as duas equipas, o que cobre também o par (H2H).
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS dirty_teams (
+    team_id INTEGER NOT NULL,
+    league_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,  -- Sequência crescente, partilhada por todas as equipas
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (team_id, league_id)
+);
+
+-- ============================================================================
+-- PESQUISA (FTS5): fixture_search / team_search
+-- rowid = ID do jogo / equipa; mantidas pelos triggers no fim do ficheiro
+-- ============================================================================
+CREATE VIRTUAL TABLE IF NOT EXISTS fixture_search USING fts5(
+    home_team,
+    away_team,
+    venue_name,
+    venue_city,
+    referee,
+    round,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS team_search USING fts5(
+    name,
+    country,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
 -- ============================================================================
 -- ÍNDICES para performance
 -- ============================================================================
 
+-- Teams / Leagues (resolução de nomes)
+CREATE INDEX IF NOT EXISTS idx_teams_name ON teams(name);
+CREATE INDEX IF NOT EXISTS idx_leagues_name ON leagues(name);
+
 -- Fixtures
 CREATE INDEX IF NOT EXISTS idx_fixtures_date ON fixtures(date);
 CREATE INDEX IF NOT EXISTS idx_fixtures_teams ON fixtures(home_team_id, away_team_id);
 CREATE INDEX IF NOT EXISTS idx_fixtures_league_season ON fixtures(league_id, season);
 CREATE INDEX IF NOT EXISTS idx_fixtures_status ON fixtures(status_short);
 
+-- Jogos terminados (forma e H2H): índices parciais só com status FT
+CREATE INDEX IF NOT EXISTS idx_fixtures_ft_home
+    ON fixtures(home_team_id, league_id, season, date) WHERE status_short = 'FT';
+CREATE INDEX IF NOT EXISTS idx_fixtures_ft_away
+    ON fixtures(away_team_id, league_id, season, date) WHERE status_short = 'FT';
+CREATE INDEX IF NOT EXISTS idx_fixtures_ft_pair
+    ON fixtures(home_team_id, away_team_id, date) WHERE status_short = 'FT';
+
 -- Statistics
 CREATE INDEX IF NOT EXISTS idx_fixture_stats_fixture ON fixture_statistics(fixture_id);
 CREATE INDEX IF NOT EXISTS idx_fixture_stats_team ON fixture_statistics(team_id);
 
 -- Events
-CREATE INDEX IF NOT EXISTS idx_fixture_events_fixture ON fixture_events(fixture_id);
-CREATE INDEX IF NOT EXISTS idx_fixture_events_type ON fixture_events(type);
-CREATE INDEX IF NOT EXISTS idx_fixture_events_time ON fixture_events(time_elapsed);
+CREATE INDEX IF NOT EXISTS idx_events_data_fixture ON fixture_events_data(fixture_id);
+CREATE INDEX IF NOT EXISTS idx_events_data_type_team ON fixture_events_data(type_id, team_id);
+CREATE INDEX IF NOT EXISTS idx_players_api ON players(api_id, name);
 
 -- Team Statistics
 CREATE INDEX IF NOT EXISTS idx_team_stats_team ON team_statistics(team_id);
@@ -374,6 +561,7 @@ CREATE INDEX IF NOT EXISTS idx_team_stats_league_season ON team_statistics(leagu
 CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions(date);
 CREATE INDEX IF NOT EXISTS idx_predictions_fixture ON predictions(fixture_id);
 CREATE INDEX IF NOT EXISTS idx_predictions_league ON predictions(league_id);
+CREATE INDEX IF NOT EXISTS idx_dirty_teams_seq ON dirty_teams(seq);
 
 -- ============================================================================
 -- VIEWS úteis
@@ -425,4 +613,160 @@ CREATE TRIGGER IF NOT EXISTS update_team_stats_timestamp
 AFTER UPDATE ON team_statistics
 BEGIN
     UPDATE team_statistics SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
-END;
\ No newline at end of file
+END;
+
+-- Índice de pesquisa: INSERT OR REPLACE não dispara triggers de DELETE,
+-- por isso a linha antiga é apagada no trigger de INSERT
+CREATE TRIGGER IF NOT EXISTS fixture_search_insert
+AFTER INSERT ON fixtures
+BEGIN
+    DELETE FROM fixture_search WHERE rowid = NEW.id;
+    INSERT INTO fixture_search
+        (rowid, home_team, away_team, venue_name, venue_city, referee, round)
+    VALUES (
+        NEW.id,
+        (SELECT name FROM teams WHERE id = NEW.home_team_id),
+        (SELECT name FROM teams WHERE id = NEW.away_team_id),
+        NEW.venue_name, NEW.venue_city, NEW.referee, NEW.round
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS fixture_search_update
+AFTER UPDATE OF home_team_id, away_team_id, venue_name, venue_city, referee, round
+ON fixtures
+BEGIN
+    UPDATE fixture_search SET
+        home_team = (SELECT name FROM teams WHERE id = NEW.home_team_id),
+        away_team = (SELECT name FROM teams WHERE id = NEW.away_team_id),
+        venue_name = NEW.venue_name,
+        venue_city = NEW.venue_city,
+        referee = NEW.referee,
+        round = NEW.round
+    WHERE rowid = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fixture_search_delete
+AFTER DELETE ON fixtures
+BEGIN
+    DELETE FROM fixture_search WHERE rowid = OLD.id;
+END;
+
+-- Dirty set: BEFORE INSERT ainda vê a linha que o INSERT OR REPLACE vai
+-- substituir, por isso um jogo re-obtido sem alterações não marca nada
+CREATE TRIGGER IF NOT EXISTS dirty_fixture_insert
+BEFORE INSERT ON fixtures
+WHEN NEW.status_short = 'FT' AND NOT EXISTS (
+    SELECT 1 FROM fixtures
+    WHERE id = NEW.id AND status_short = 'FT'
+      AND home_goals IS NEW.home_goals AND away_goals IS NEW.away_goals
+      AND home_goals_halftime IS NEW.home_goals_halftime
+      AND away_goals_halftime IS NEW.away_goals_halftime
+)
+BEGIN
+    INSERT OR REPLACE INTO dirty_teams (team_id, league_id, seq)
+    VALUES (NEW.home_team_id, NEW.league_id,
+            (SELECT COALESCE(MAX(seq), 0) + 1 FROM dirty_teams));
+    INSERT OR REPLACE INTO dirty_teams (team_id, league_id, seq)
+    VALUES (NEW.away_team_id, NEW.league_id,
+            (SELECT COALESCE(MAX(seq), 0) + 1 FROM dirty_teams));
+END;
+
+CREATE TRIGGER IF NOT EXISTS dirty_fixture_update
+AFTER UPDATE OF status_short, home_goals, away_goals,
+                home_goals_halftime, away_goals_halftime
+ON fixtures
+WHEN NEW.status_short = 'FT' AND (
+    OLD.status_short IS NOT NEW.status_short
+    OR OLD.home_goals IS NOT NEW.home_goals OR OLD.away_goals IS NOT NEW.away_goals
+    OR OLD.home_goals_halftime IS NOT NEW.home_goals_halftime
+    OR OLD.away_goals_halftime IS NOT NEW.away_goals_halftime
+)
+BEGIN
+    INSERT OR REPLACE INTO dirty_teams (team_id, league_id, seq)
+    VALUES (NEW.home_team_id, NEW.league_id,
+            (SELECT COALESCE(MAX(seq), 0) + 1 FROM dirty_teams));
+    INSERT OR REPLACE INTO dirty_teams (team_id, league_id, seq)
+    VALUES (NEW.away_team_id, NEW.league_id,
+            (SELECT COALESCE(MAX(seq), 0) + 1 FROM dirty_teams));
+END;
+
+-- Estatísticas/eventos reescritos sem alterações também não marcam nada
+-- (versões anteriores destes triggers marcavam em qualquer INSERT)
+DROP TRIGGER IF EXISTS dirty_statistics_insert;
+DROP TRIGGER IF EXISTS dirty_events_insert;
+
+CREATE TRIGGER IF NOT EXISTS dirty_statistics_change
+BEFORE INSERT ON fixture_statistics
+WHEN NOT EXISTS (
+    SELECT 1 FROM fixture_statistics
+    WHERE fixture_id = NEW.fixture_id AND team_id = NEW.team_id
+      AND shots_on_goal IS NEW.shots_on_goal AND shots_off_goal IS NEW.shots_off_goal
+      AND total_shots IS NEW.total_shots AND blocked_shots IS NEW.blocked_shots
+      AND shots_insidebox IS NEW.shots_insidebox AND shots_outsidebox IS NEW.shots_outsidebox
+      AND ball_possession IS NEW.ball_possession AND total_passes IS NEW.total_passes
+      AND passes_accurate IS NEW.passes_accurate AND passes_percentage IS NEW.passes_percentage
+      AND attacks IS NEW.attacks AND dangerous_attacks IS NEW.dangerous_attacks
+      AND corner_kicks IS NEW.corner_kicks AND offsides IS NEW.offsides
+      AND fouls IS NEW.fouls AND yellow_cards IS NEW.yellow_cards
+      AND red_cards IS NEW.red_cards AND goalkeeper_saves IS NEW.goalkeeper_saves
+      AND expected_goals IS NEW.expected_goals
+)
+BEGIN
+    INSERT OR REPLACE INTO dirty_teams (team_id, league_id, seq)
+    SELECT NEW.team_id, league_id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM dirty_teams)
+    FROM fixtures WHERE id = NEW.fixture_id;
+END;
+
+-- replace_fixture_events só apaga e reinsere quando o conjunto de eventos mudou
+CREATE TRIGGER IF NOT EXISTS dirty_events_change
+BEFORE INSERT ON fixture_events_data
+WHEN NOT EXISTS (
+    SELECT 1 FROM fixture_events_data
+    WHERE fixture_id = NEW.fixture_id AND team_id = NEW.team_id
+      AND time_elapsed IS NEW.time_elapsed AND time_extra IS NEW.time_extra
+      AND type_id IS NEW.type_id AND detail_id IS NEW.detail_id
+      AND player_ref IS NEW.player_ref AND assist_ref IS NEW.assist_ref
+      AND comment_id IS NEW.comment_id
+)
+BEGIN
+    INSERT OR REPLACE INTO dirty_teams (team_id, league_id, seq)
+    SELECT NEW.team_id, league_id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM dirty_teams)
+    FROM fixtures WHERE id = NEW.fixture_id;
+END;
+
+-- Equipa nova ou renomeada: atualizar os nomes nos jogos indexados
+-- (upsert com o mesmo nome custa só a leitura de team_search)
+CREATE TRIGGER IF NOT EXISTS team_search_insert
+AFTER INSERT ON teams
+BEGIN
+    UPDATE fixture_search SET home_team = NEW.name
+    WHERE (SELECT name FROM team_search WHERE rowid = NEW.id) IS NOT NEW.name
+      AND rowid IN (SELECT id FROM fixtures WHERE home_team_id = NEW.id);
+    UPDATE fixture_search SET away_team = NEW.name
+    WHERE (SELECT name FROM team_search WHERE rowid = NEW.id) IS NOT NEW.name
+      AND rowid IN (SELECT id FROM fixtures WHERE away_team_id = NEW.id);
+    DELETE FROM team_search WHERE rowid = NEW.id;
+    INSERT INTO team_search (rowid, name, country)
+    VALUES (NEW.id, NEW.name, NEW.country);
+END;
+
+-- Nome/país alterados com UPDATE direto (o upsert passa pelo trigger de INSERT)
+CREATE TRIGGER IF NOT EXISTS team_search_update
+AFTER UPDATE OF name, country ON teams
+BEGIN
+    UPDATE fixture_search SET home_team = NEW.name
+    WHERE NEW.name IS NOT OLD.name
+      AND rowid IN (SELECT id FROM fixtures WHERE home_team_id = NEW.id);
+    UPDATE fixture_search SET away_team = NEW.name
+    WHERE NEW.name IS NOT OLD.name
+      AND rowid IN (SELECT id FROM fixtures WHERE away_team_id = NEW.id);
+    DELETE FROM team_search WHERE rowid = NEW.id;
+    INSERT INTO team_search (rowid, name, country)
+    VALUES (NEW.id, NEW.name, NEW.country);
+END;
+
+CREATE TRIGGER IF NOT EXISTS team_search_delete
+AFTER DELETE ON teams
+BEGIN
+    DELETE FROM team_search WHERE rowid = OLD.id;
+END;
@@ -1,57 +1,177 @@
 """
 Modelos de dados para a base de dados SQLite
+
+Classes compactas (slots) preenchidas diretamente a partir de linhas
+sqlite3 ou de payloads da API, em vez de um dict por linha.
 """
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Optional, Iterable, List, Tuple, Dict, Any, Callable
+
+
+def model_row_factory(model) -> Callable:
+    """
+    Criar row_factory sqlite3 que constrói instâncias de `model`
+
+    As posições das colunas são resolvidas uma única vez por cursor;
+    colunas da query que não existem no modelo são ignoradas.
+    """
+    names = model.__match_args__
+    cache = {}
+
+    def factory(cursor, row):
+        key = id(cursor.description)
+        positions = cache.get(key)
+        if positions is None:
+            columns = [d[0] for d in cursor.description]
+            positions = tuple(
+                (name, columns.index(name)) for name in names if name in columns
+            )
+            cache.clear()
+            cache[key] = positions
+        return model(**{name: row[i] for name, i in positions})
+
+    return factory
+
+
+class _RowModel:
+    """Métodos comuns aos modelos que espelham uma tabela"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        """Construir a partir de sqlite3.Row ou dict (colunas extra são ignoradas)"""
+        keys = row.keys()
+        return cls(**{f: row[f] for f in cls.__match_args__ if f in keys})
 
-@dataclass
-class Team:
+    def to_dict(self) -> Dict[str, Any]:
+        """Converter para dict (compatibilidade com código existente)"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def db_values(self) -> Tuple:
+        """Valores pela ordem das colunas do modelo (tuplo plano, sem cópias)"""
+        return tuple(getattr(self, name) for name in self.__match_args__)
+
+
+@dataclass(slots=True)
+class Team(_RowModel):
     """Modelo para equipas"""
     id: int
     name: str
-    logo: str
-    country: str
-    
-@dataclass
-class League:
+    code: Optional[str] = None
+    country: Optional[str] = None
+    founded: Optional[int] = None
+    logo: Optional[str] = None
+
+
+@dataclass(slots=True)
+class League(_RowModel):
     """Modelo para ligas"""
     id: int
     name: str
-    country: str
-    season: int
+    type: Optional[str] = None
+    country: Optional[str] = None
+    logo: Optional[str] = None
+
 
-@dataclass
-class Match:
-    """Modelo para jogos"""
+@dataclass(slots=True)
+class Match(_RowModel):
+    """Modelo para jogos (tabela fixtures)"""
     id: int
     league_id: int
     season: int
-    date: datetime
-    home_team_id: int
-    away_team_id: int
-    home_team_name: str
-    away_team_name: str
-    status: str  # NS (Not Started), 1H, HT, 2H, FT, etc.
-    
+    round: Optional[str] = None
+    date: Optional[str] = None
+    timestamp: Optional[int] = None
+
+    # Equipas
+    home_team_id: Optional[int] = None
+    away_team_id: Optional[int] = None
+
+    # Status: NS (Not Started), 1H, HT, 2H, FT, etc.
+    status_short: Optional[str] = None
+    status_long: Optional[str] = None
+    status_elapsed: Optional[int] = None
+
+    # Estádio e Árbitro
+    venue_id: Optional[int] = None
+    venue_name: Optional[str] = None
+    venue_city: Optional[str] = None
+    referee: Optional[str] = None
+
     # Resultados
-    home_goals_fulltime: Optional[int] = None
-    away_goals_fulltime: Optional[int] = None
+    home_goals: Optional[int] = None
+    away_goals: Optional[int] = None
     home_goals_halftime: Optional[int] = None
     away_goals_halftime: Optional[int] = None
-    
-    # Estatísticas
-    home_goals_first_half: Optional[int] = None
-    away_goals_first_half: Optional[int] = None
-    total_goals_first_half: Optional[int] = None
-    
-@dataclass
-class MatchStatistics:
-    """Estatísticas detalhadas de um jogo"""
-    match_id: int
+    home_goals_extratime: Optional[int] = None
+    away_goals_extratime: Optional[int] = None
+    home_goals_penalty: Optional[int] = None
+    away_goals_penalty: Optional[int] = None
+
+    @classmethod
+    def from_api(cls, fixture_raw: Dict) -> 'Match':
+        """Construir a partir do payload /fixtures da API"""
+        fixture_info = fixture_raw.get('fixture', {})
+        league_info = fixture_raw.get('league', {})
+        teams_info = fixture_raw.get('teams', {})
+        goals_info = fixture_raw.get('goals', {})
+        score_info = fixture_raw.get('score', {})
+
+        status = fixture_info.get('status', {})
+        venue = fixture_info.get('venue', {})
+        halftime = score_info.get('halftime', {})
+        extratime = score_info.get('extratime', {})
+        penalty = score_info.get('penalty', {})
+
+        return cls(
+            fixture_info.get('id'),
+            league_info.get('id'),
+            league_info.get('season'),
+            league_info.get('round'),
+            fixture_info.get('date'),
+            fixture_info.get('timestamp'),
+            teams_info.get('home', {}).get('id'),
+            teams_info.get('away', {}).get('id'),
+            status.get('short'),
+            status.get('long'),
+            status.get('elapsed'),
+            venue.get('id'),
+            venue.get('name'),
+            venue.get('city'),
+            fixture_info.get('referee'),
+            goals_info.get('home'),
+            goals_info.get('away'),
+            halftime.get('home'),
+            halftime.get('away'),
+            extratime.get('home'),
+            extratime.get('away'),
+            penalty.get('home'),
+            penalty.get('away'),
+        )
+
+    @property
+    def first_half_goals(self) -> int:
+        return (self.home_goals_halftime or 0) + (self.away_goals_halftime or 0)
+
+    @property
+    def total_goals(self) -> int:
+        return (self.home_goals or 0) + (self.away_goals or 0)
+
+    def goals_for(self, team_id: int) -> Tuple[int, int]:
+        """(golos marcados, golos sofridos) pela equipa neste jogo"""
+        if team_id == self.home_team_id:
+            return self.home_goals or 0, self.away_goals or 0
+        return self.away_goals or 0, self.home_goals or 0
+
+
+@dataclass(slots=True)
+class MatchStatistics(_RowModel):
+    """Estatísticas detalhadas de um jogo (tabela fixture_statistics)"""
+    fixture_id: int
     team_id: int
-    
+
     # Estatísticas gerais
     shots_on_goal: Optional[int] = None
     shots_off_goal: Optional[int] = None
@@ -59,88 +179,279 @@ class MatchStatistics:
     blocked_shots: Optional[int] = None
     shots_insidebox: Optional[int] = None
     shots_outsidebox: Optional[int] = None
-    fouls: Optional[int] = None
+    ball_possession: Optional[int] = None
+    total_passes: Optional[int] = None
+    passes_accurate: Optional[int] = None
+    passes_percentage: Optional[int] = None
+    attacks: Optional[int] = None
+    dangerous_attacks: Optional[int] = None
     corner_kicks: Optional[int] = None
     offsides: Optional[int] = None
-    ball_possession: Optional[str] = None
+    fouls: Optional[int] = None
     yellow_cards: Optional[int] = None
     red_cards: Optional[int] = None
     goalkeeper_saves: Optional[int] = None
-    total_passes: Optional[int] = None
-    passes_accurate: Optional[int] = None
-    passes_percentage: Optional[str] = None
+    expected_goals: Optional[float] = None
 
-@dataclass
+
+@dataclass(slots=True)
+class MatchEvent(_RowModel):
+    """Evento de um jogo (view fixture_events)"""
+    fixture_id: int
+    team_id: int
+    time_elapsed: int
+    time_extra: Optional[int] = None
+    type: Optional[str] = None
+    detail: Optional[str] = None
+    player_id: Optional[int] = None
+    player_name: Optional[str] = None
+    assist_id: Optional[int] = None
+    assist_name: Optional[str] = None
+    comments: Optional[str] = None
+
+
+# ============================================================================
+# PAYLOADS DA API -> TUPLOS DE LINHAS (conversão numa só passagem)
+# ============================================================================
+
+def _count_value(value) -> Optional[int]:
+    """Contagem ou percentagem ("55%") da API -> int (texto inválido -> None)"""
+    if value is None or type(value) is int:
+        return value
+    if isinstance(value, str):
+        value = value.rstrip('%').strip()
+        return int(value) if value.isdigit() else None
+    return int(value)
+
+
+def _decimal_value(value) -> Optional[float]:
+    """Valor decimal da API (ex.: expected_goals "1.37") -> float"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+# Tipo de estatística da API -> (coluna de fixture_statistics, conversão)
+STATISTIC_TYPES = {
+    'Shots on Goal': ('shots_on_goal', _count_value),
+    'Shots off Goal': ('shots_off_goal', _count_value),
+    'Total Shots': ('total_shots', _count_value),
+    'Blocked Shots': ('blocked_shots', _count_value),
+    'Shots insidebox': ('shots_insidebox', _count_value),
+    'Shots outsidebox': ('shots_outsidebox', _count_value),
+    'Ball Possession': ('ball_possession', _count_value),
+    'Total passes': ('total_passes', _count_value),
+    'Passes accurate': ('passes_accurate', _count_value),
+    'Passes %': ('passes_percentage', _count_value),
+    'Corner Kicks': ('corner_kicks', _count_value),
+    'Offsides': ('offsides', _count_value),
+    'Fouls': ('fouls', _count_value),
+    'Yellow Cards': ('yellow_cards', _count_value),
+    'Red Cards': ('red_cards', _count_value),
+    'Goalkeeper Saves': ('goalkeeper_saves', _count_value),
+    'expected_goals': ('expected_goals', _decimal_value),
+}
+
+# Compilado uma vez: tipo da API -> (posição no tuplo, conversão)
+_STATISTIC_SLOTS = {
+    api_type: (MatchStatistics.__match_args__.index(column), convert)
+    for api_type, (column, convert) in STATISTIC_TYPES.items()
+}
+_STATISTICS_WIDTH = len(MatchStatistics.__match_args__)
+
+
+def statistics_rows(fixture_id: int, stats_raw: Iterable[Dict]) -> List[Tuple]:
+    """
+    Resposta de /fixtures/statistics -> uma linha por equipa
+
+    Returns:
+        Tuplos pela ordem de MatchStatistics.__match_args__
+    """
+    rows = []
+    slots = _STATISTIC_SLOTS
+    for team_stats in stats_raw:
+        row = [None] * _STATISTICS_WIDTH
+        row[0] = fixture_id
+        row[1] = (team_stats.get('team') or {}).get('id')
+        for stat in team_stats.get('statistics') or ():
+            slot = slots.get(stat.get('type'))
+            if slot is not None:
+                row[slot[0]] = slot[1](stat.get('value'))
+        rows.append(tuple(row))
+    return rows
+
+
+def event_rows(fixture_id: int, events_raw: Iterable[Dict]) -> List[Tuple]:
+    """
+    Resposta de /fixtures/events -> uma linha por evento
+
+    Returns:
+        Tuplos pela ordem de MatchEvent.__match_args__
+    """
+    empty = {}
+    rows = []
+    for event in events_raw:
+        time = event.get('time') or empty
+        player = event.get('player') or empty
+        assist = event.get('assist') or empty
+        rows.append((
+            fixture_id,
+            (event.get('team') or empty).get('id'),
+            time.get('elapsed'),
+            time.get('extra'),
+            event.get('type'),
+            event.get('detail'),
+            player.get('id'),
+            player.get('name'),
+            assist.get('id'),
+            assist.get('name'),
+            event.get('comments'),
+        ))
+    return rows
+
+
+@dataclass(slots=True)
 class TeamForm:
     """Forma recente de uma equipa"""
     team_id: int
     league_id: int
     season: int
-    
-    # Últimos 10 jogos
-    games_played: int
-    wins: int
-    draws: int
-    losses: int
-    
+
+    # Últimos N jogos
+    games_played: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+
     # Golos
-    goals_scored: int
-    goals_conceded: int
-    goals_scored_first_half: int
-    goals_conceded_first_half: int
-    
-    # Percentagens
-    first_half_goal_percentage: float  # % de jogos com golo na 1ª parte
-    avg_goals_per_game: float
-    avg_goals_first_half: float
-    
+    goals_scored: int = 0
+    goals_conceded: int = 0
+
+    # Jogos com golo na 1ª parte / com Over 1.5 FT
+    games_with_first_half_goal: int = 0
+    games_over15: int = 0
+
     # Casa vs Fora
-    home_games: int
-    away_games: int
-    home_first_half_goals: int
-    away_first_half_goals: int
+    home_games: int = 0
+    away_games: int = 0
+
+    @classmethod
+    def from_matches(cls, team_id: int, league_id: int, season: int,
+                     matches: Iterable[Match]) -> 'TeamForm':
+        """Agregar forma a partir de uma sequência de jogos terminados"""
+        form = cls(team_id, league_id, season)
+        for match in matches:
+            form.games_played += 1
+            scored, conceded = match.goals_for(team_id)
+            form.goals_scored += scored
+            form.goals_conceded += conceded
+
+            if scored > conceded:
+                form.wins += 1
+            elif scored == conceded:
+                form.draws += 1
+            else:
+                form.losses += 1
+
+            if match.first_half_goals > 0:
+                form.games_with_first_half_goal += 1
+            if match.total_goals >= 2:
+                form.games_over15 += 1
+
+            if match.home_team_id == team_id:
+                form.home_games += 1
+            else:
+                form.away_games += 1
+        return form
 
-@dataclass
+    @property
+    def first_half_goal_percentage(self) -> float:
+        if not self.games_played:
+            return 0
+        return self.games_with_first_half_goal / self.games_played * 100
+
+
+@dataclass(slots=True)
 class HeadToHead:
     """Confrontos diretos entre duas equipas"""
     team1_id: int
     team2_id: int
+    league_id: Optional[int] = None
+
+    total_matches: int = 0
+    team1_wins: int = 0
+    team2_wins: int = 0
+    draws: int = 0
+
+    # Golos na 1ª parte / Over 1.5 FT nos confrontos diretos
+    matches_with_first_half_goal: int = 0
+    matches_over15: int = 0
+
+    last_matches: Tuple[Match, ...] = ()  # Últimos jogos entre as equipas
+
+    @classmethod
+    def from_matches(cls, team1_id: int, team2_id: int, league_id: Optional[int],
+                     matches: Iterable[Match]) -> 'HeadToHead':
+        """Agregar confrontos diretos a partir de uma sequência de jogos"""
+        matches = tuple(matches)
+        h2h = cls(team1_id, team2_id, league_id, last_matches=matches)
+        for match in matches:
+            h2h.total_matches += 1
+            scored, conceded = match.goals_for(team1_id)
+            if scored > conceded:
+                h2h.team1_wins += 1
+            elif scored < conceded:
+                h2h.team2_wins += 1
+            else:
+                h2h.draws += 1
+
+            if match.first_half_goals > 0:
+                h2h.matches_with_first_half_goal += 1
+            if match.total_goals >= 2:
+                h2h.matches_over15 += 1
+        return h2h
+
+    @property
+    def first_half_goal_percentage(self) -> float:
+        if not self.total_matches:
+            return 0
+        return self.matches_with_first_half_goal / self.total_matches * 100
+
+
+@dataclass(slots=True)
+class DailyPrediction(_RowModel):
+    """Previsão diária para um jogo (tabela predictions)"""
+    fixture_id: int
+    date: str
     league_id: int
-    
-    # Últimos 5 confrontos
-    total_matches: int
-    team1_wins: int
-    team2_wins: int
-    draws: int
-    
-    # Golos na 1ª parte nos confrontos diretos
-    matches_with_first_half_goal: int
-    first_half_goal_percentage: float
-    avg_first_half_goals: float
-    
-    last_matches: list  # Lista dos últimos jogos entre as equipas
-
-@dataclass
-class DailyPrediction:
-    """Previsão diária para um jogo"""
-    match_id: int
-    date: datetime
     league_name: str
     home_team: str
     away_team: str
-    
-    # Scores
-    overall_score: float  # Score final (0-100)
-    confidence_level: str  # HIGH, MEDIUM, LOW
-    
-    # Scores parciais
-    h2h_score: float
-    home_form_score: float
-    away_form_score: float
-    first_half_stats_score: float
-    
+    home_team_id: Optional[int] = None
+    away_team_id: Optional[int] = None
+
+    # Over 0.5 HT
+    score_over_05_ht: float = 0
+    confidence_over_05_ht: Optional[str] = None
+    recommendation_over_05_ht: Optional[str] = None
+    h2h_score: Optional[float] = None
+    home_form_score: Optional[float] = None
+    away_form_score: Optional[float] = None
+    offensive_pressure_score: Optional[float] = None
+    minute_distribution_score: Optional[float] = None
+
+    # Over 1.5 FT
+    score_over_15_ft: float = 0
+    confidence_over_15_ft: Optional[str] = None
+    recommendation_over_15_ft: Optional[str] = None
+    h2h_score_o15: Optional[float] = None
+    home_form_score_o15: Optional[float] = None
+    away_form_score_o15: Optional[float] = None
+    offensive_pressure_score_o15: Optional[float] = None
+
     # Análise
-    recommendation: str  # YES, NO, MAYBE
-    reasoning: str  # Explicação da recomendação
-    
-    created_at: datetime = datetime.now()
\ No newline at end of file
+    reasoning: Optional[str] = None
+    input_seq: Optional[int] = None  # Última alteração de dirty_teams vista
@@ -0,0 +1,231 @@
+"""
+Query Profiler - Football Betting AI
+Instrumentação opcional das queries do DatabaseManager (DB_PROFILE=1)
+
+Cada statement é cronometrado desde o execute até ao último fetch, com
+contagem de linhas, e atribuído ao método do DatabaseManager que o fez.
+Statements acima de DB_SLOW_QUERY_MS vão para o slow-query log com o
+respetivo EXPLAIN QUERY PLAN. No fim do processo é impresso um resumo
+por método.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+import atexit
+import sqlite3
+import sys
+import os
+import time
+import weakref
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import DB_SLOW_QUERY_MS, DB_SLOW_QUERY_LOG
+
+# Funções de infraestrutura: a query é atribuída a quem as chamou
+PLUMBING = {'get_connection', '_iter_query', '__enter__', '__exit__'}
+
+
+def _caller_name() -> str:
+    """Método do DatabaseManager (ou função externa) que originou a query"""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        if filename == 'db_manager.py':
+            if code.co_name not in PLUMBING:
+                return code.co_name
+        elif fallback is None and filename != 'profiler.py':
+            fallback = f"{filename}:{code.co_name}"
+        frame = frame.f_back
+    return fallback or '?'
+
+
+def _compact_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+class QueryProfiler:
+    """Acumula tempos por método e escreve o slow-query log"""
+
+    def __init__(self, slow_ms: float = DB_SLOW_QUERY_MS,
+                 log_path: str = DB_SLOW_QUERY_LOG):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.methods: Dict[str, Dict] = {}
+        self.slow_count = 0
+        atexit.register(self.print_summary)
+
+    def record(self, conn: sqlite3.Connection, method: str, sql: str,
+               params, elapsed: float, rows: int):
+        """Registar um statement terminado"""
+        entry = self.methods.setdefault(method, {
+            'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'full_scans': 0
+        })
+        elapsed_ms = elapsed * 1000
+        entry['calls'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+        entry['rows'] += rows
+
+        if elapsed_ms >= self.slow_ms:
+            plan = self._explain(conn, sql, params)
+            if any(line.startswith('SCAN ') for line in plan):
+                entry['full_scans'] += 1
+            self._log_slow(method, sql, elapsed_ms, rows, plan)
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str, params) -> List[str]:
+        """EXPLAIN QUERY PLAN do statement (apenas SELECT/WITH)"""
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return []
+        try:
+            cursor = sqlite3.Cursor(conn)
+            cursor.row_factory = None
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+            return [row[3] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            return [f"(EXPLAIN falhou: {e})"]
+
+    def _log_slow(self, method: str, sql: str, elapsed_ms: float,
+                  rows: int, plan: List[str]):
+        self.slow_count += 1
+        try:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(f"[{datetime.now().isoformat(timespec='seconds')}] "
+                        f"{elapsed_ms:.1f} ms | {rows} linhas | {method}\n")
+                f.write(f"    {_compact_sql(sql)}\n")
+                for line in plan:
+                    f.write(f"    PLAN {line}\n")
+        except OSError as e:
+            print(f"⚠️ Erro ao escrever slow-query log: {e}")
+
+    def get_summary(self) -> List[Dict]:
+        """Resumo por método, ordenado por tempo total"""
+        summary = [dict(method=method, **entry) for method, entry in self.methods.items()]
+        return sorted(summary, key=lambda e: e['total_ms'], reverse=True)
+
+    def print_summary(self):
+        """Imprimir resumo por método (chamado no fim do processo)"""
+        if not self.methods:
+            return
+
+        print("\n" + "="*80)
+        print("⏱️  PERFIL DE QUERIES (DatabaseManager)")
+        print("="*80)
+        print(f"{'Método':<36} {'Calls':>7} {'Total ms':>10} {'Média':>8} "
+              f"{'Máx':>8} {'Linhas':>9} {'Scans':>6}")
+        for e in self.get_summary():
+            print(f"{e['method'][:36]:<36} {e['calls']:>7} {e['total_ms']:>10.1f} "
+                  f"{e['total_ms'] / e['calls']:>8.2f} {e['max_ms']:>8.1f} "
+                  f"{e['rows']:>9} {e['full_scans']:>6}")
+        if self.slow_count:
+            print(f"\n🐢 {self.slow_count} queries lentas (>= {self.slow_ms:.0f} ms) "
+                  f"em {self.log_path}")
+
+
+_profiler: Optional[QueryProfiler] = None
+
+
+def get_profiler() -> QueryProfiler:
+    """Profiler partilhado pelo processo"""
+    global _profiler
+    if _profiler is None:
+        _profiler = QueryProfiler()
+    return _profiler
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Cursor que mede execute + fetch de cada statement"""
+
+    def _start(self, sql: str, params):
+        self._finish()
+        self._sql = sql
+        self._params = params
+        self._method = _caller_name()
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def _finish(self):
+        sql = getattr(self, '_sql', None)
+        if sql is None:
+            return
+        self._sql = None
+        rows = self._rows if self._rows else max(self.rowcount, 0)
+        get_profiler().record(self.connection, self._method, sql,
+                              self._params, self._elapsed, rows)
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._elapsed += time.perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._start(sql, parameters)
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql, None)
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+    def __next__(self):
+        row = self._timed(super().__next__)
+        self._rows += 1
+        return row
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size or self.arraysize)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except sqlite3.Error:
+            pass
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """Conexão cujos cursores são ProfilingCursor (usar com sqlite3.connect(factory=...))"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursors = weakref.WeakSet()
+
+    def cursor(self, factory=ProfilingCursor):
+        cursor = super().cursor(factory)
+        if isinstance(cursor, ProfilingCursor):
+            self._cursors.add(cursor)
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        # Fechar statements pendentes antes da conexão (EXPLAIN precisa dela)
+        for cursor in list(self._cursors):
+            cursor._finish()
+        super().close()
@@ -9,9 +9,9 @@ from typing import List, Dict
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QScrollArea, QFrame, QMessageBox, QProgressBar,
-    QTextEdit, QDialog, QSplitter
+    QTextEdit, QDialog, QSplitter, QLineEdit, QListWidget
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QPalette, QColor
 
 # Importar o sistema existente (vamos adaptar os imports depois)
@@ -21,6 +21,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class AnalysisThread(QThread):
     """Thread para executar análises sem bloquear a UI"""
     progress = pyqtSignal(int, str)  # progresso, mensagem
+    prediction_ready = pyqtSignal(dict)  # cada previsão assim que sai do pipeline
     finished = pyqtSignal(list)  # lista de previsões
     error = pyqtSignal(str)
     
@@ -32,8 +33,13 @@ class AnalysisThread(QThread):
         try:
             self.progress.emit(10, "🔍 Buscando jogos de hoje...")
             
-            # Aqui vamos integrar com o sistema existente
-            predictions = self.app.analyze_today_matches()
+            predictions = []
+            for prediction in self.app.iter_today_predictions():
+                predictions.append(prediction)
+                self.prediction_ready.emit(prediction)
+                self.progress.emit(50, f"⚽ {len(predictions)} jogos analisados...")
+            
+            predictions.sort(key=lambda x: x['overall_score'], reverse=True)
             
             self.progress.emit(100, "✅ Análise concluída!")
             self.finished.emit(predictions)
@@ -228,17 +234,11 @@ class MatchDetailsDialog(QDialog):
             home_team = self.prediction.get('home_team', '')
             away_team = self.prediction.get('away_team', '')
             
-            # Buscar IDs das equipas
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT id FROM teams WHERE name = ?", (home_team,))
-                home_result = cursor.fetchone()
-                home_team_id = home_result['id'] if home_result else None
-                
-                cursor.execute("SELECT id FROM teams WHERE name = ?", (away_team,))
-                away_result = cursor.fetchone()
-                away_team_id = away_result['id'] if away_result else None
+            # IDs das equipas (da previsão ou pelo nome, com cache)
+            home_team_id = (self.prediction.get('home_team_id')
+                            or db.get_team_id_by_name(home_team))
+            away_team_id = (self.prediction.get('away_team_id')
+                            or db.get_team_id_by_name(away_team))
             
             if not home_team_id or not away_team_id:
                 return "⚠️ Não foi possível encontrar IDs das equipas"
@@ -410,6 +410,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.predictions = []
         self.app_instance = None  # Vamos injetar depois
+        self.search_db = None  # Criada na primeira pesquisa
         self.setup_ui()
     
     def setup_ui(self):
@@ -427,6 +428,26 @@ class MainWindow(QMainWindow):
         header = self.create_header()
         main_layout.addWidget(header)
         
+        # Pesquisa de equipas / jogos (todas as temporadas guardadas)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(
+            "🔎 Pesquisar equipa, estádio, árbitro ou jornada..."
+        )
+        self.search_input.setMinimumHeight(32)
+        main_layout.addWidget(self.search_input)
+        
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(220)
+        self.search_results.setVisible(False)
+        main_layout.addWidget(self.search_results)
+        
+        # Pesquisar só quando o utilizador pára de escrever
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
         # Barra de progresso
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -539,6 +560,7 @@ class MainWindow(QMainWindow):
         # Criar thread de análise
         self.analysis_thread = AnalysisThread(self.app_instance)
         self.analysis_thread.progress.connect(self.update_progress)
+        self.analysis_thread.prediction_ready.connect(self.add_prediction)
         self.analysis_thread.finished.connect(self.display_predictions)
         self.analysis_thread.error.connect(self.show_error)
         self.analysis_thread.start()
@@ -548,10 +570,15 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(value)
         self.status_label.setText(message)
     
+    def add_prediction(self, prediction: Dict):
+        """Mostrar uma previsão assim que fica pronta (ordem de chegada)"""
+        self.matches_layout.addWidget(MatchCard(prediction))
+    
     def display_predictions(self, predictions: List[Dict]):
-        """Mostrar previsões na interface"""
+        """Mostrar previsões na interface (ordenadas por score)"""
         self.predictions = predictions
         self.progress_bar.setVisible(False)
+        self.clear_matches()
         
         if not predictions:
             self.status_label.setText("❌ Nenhum jogo encontrado para hoje")
@@ -567,6 +594,37 @@ class MainWindow(QMainWindow):
         # Spacer no final
         self.matches_layout.addStretch()
     
+    def run_search(self):
+        """Pesquisar jogos no índice FTS e mostrar os resultados"""
+        text = self.search_input.text().strip()
+        self.search_results.clear()
+        
+        if len(text) < 2:
+            self.search_results.setVisible(False)
+            return
+        
+        if self.search_db is None:
+            from database.db_manager import DatabaseManager
+            self.search_db = DatabaseManager(
+                archive_seasons=DatabaseManager.get_archived_seasons()
+            )
+        
+        results = self.search_db.search_fixtures(text, limit=50)
+        if not results:
+            self.search_results.addItem("Sem resultados")
+        
+        for fixture in results:
+            score = ""
+            if fixture.get('home_goals') is not None:
+                score = (f"{fixture['home_goals']}-{fixture['away_goals']} "
+                         f"(HT {fixture['home_goals_halftime']}-{fixture['away_goals_halftime']})")
+            self.search_results.addItem(
+                f"{fixture['date'][:10]} | {fixture['home_team']} vs {fixture['away_team']} "
+                f"{score} | {fixture.get('round') or ''} | {fixture.get('venue_name') or ''}"
+            )
+        
+        self.search_results.setVisible(True)
+    
     def clear_matches(self):
         """Limpar todos os jogos exibidos"""
         while self.matches_layout.count():
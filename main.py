@@ -6,17 +6,48 @@ Aplicação principal
 import os
 import sys
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterator, List
 
 # Adicionar diretório raiz ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config.config import LEAGUES, CURRENT_SEASON
 from database.db_manager import DatabaseManager
+from database.models import DailyPrediction
 from api.api_client import APIFootballClient
 from analysis.data_processor import DataProcessor
+from analysis.match_day import MatchDayPlanner
+from analysis.pipeline import MatchDayPipeline
 from analysis.scoring import ScoringSystem
 
+# Chaves do dict de previsão -> colunas de predictions
+PREDICTION_COLUMNS = {
+    'match_id': 'fixture_id',
+    'date': 'date',
+    'league_id': 'league_id',
+    'league_name': 'league_name',
+    'home_team': 'home_team',
+    'away_team': 'away_team',
+    'home_team_id': 'home_team_id',
+    'away_team_id': 'away_team_id',
+    'overall_score': 'score_over_05_ht',
+    'confidence_level': 'confidence_over_05_ht',
+    'recommendation': 'recommendation_over_05_ht',
+    'h2h_score': 'h2h_score',
+    'home_form_score': 'home_form_score',
+    'away_form_score': 'away_form_score',
+    'offensive_pressure_score': 'offensive_pressure_score',
+    'minute_distribution_score': 'minute_distribution_score',
+    'overall_score_o15': 'score_over_15_ft',
+    'confidence_level_o15': 'confidence_over_15_ft',
+    'recommendation_o15': 'recommendation_over_15_ft',
+    'h2h_score_o15': 'h2h_score_o15',
+    'home_form_score_o15': 'home_form_score_o15',
+    'away_form_score_o15': 'away_form_score_o15',
+    'reasoning': 'reasoning',
+    'input_seq': 'input_seq',
+}
+
 class FootballBettingAI:
     """Aplicação principal de análise de apostas"""
     
@@ -25,63 +56,127 @@ class FootballBettingAI:
         
         self.db = DatabaseManager()
         self.api = APIFootballClient()
-        self.processor = DataProcessor()
+        self.processor = DataProcessor(db=self.db, api=self.api)
+        self.planner = MatchDayPlanner(self.processor)
         self.scoring = ScoringSystem()
         
         print("✅ Sistema inicializado com sucesso!\n")
     
-    def analyze_today_matches(self, league_ids: List[int] = None) -> List[Dict]:
+    def iter_today_predictions(self, league_ids: List[int] = None,
+                               budget: int = None) -> Iterator[Dict]:
         """
-        Analisar jogos de hoje
+        Analisar jogos de hoje em streaming (pipeline com filas limitadas)
         
         Args:
             league_ids: Lista de IDs das ligas a analisar (None = todas)
+            budget: Pedidos à API que a análise pode gastar (default: quota restante)
         
-        Returns:
-            Lista de análises dos jogos
+        Yields:
+            Cada previsão assim que fica guardada (ordem de conclusão)
         """
         if league_ids is None:
             league_ids = list(LEAGUES.values())
         
         print(f"📅 Analisando jogos de {datetime.now().strftime('%d/%m/%Y')}\n")
+        requests_before = self.api.request_count
         
-        all_predictions = []
-        
+        day_fixtures = []
         for league_id in league_ids:
             league_name = [name for name, id in LEAGUES.items() if id == league_id][0]
-            print(f"🏆 Liga: {league_name} (ID: {league_id})")
             
             # Buscar jogos de hoje desta liga
             today_fixtures = self.api.get_today_fixtures(league_id)
+            print(f"🏆 {league_name}: {len(today_fixtures)} jogos hoje")
+            day_fixtures += [(fixture, league_name) for fixture in today_fixtures]
+        
+        # Orçamento: custo estimado por jogo vs. quota restante
+        plan = self.planner.budget(self.planner.build(day_fixtures), budget)
+        self.planner.print_budget(plan)
+        requests_planned = self.api.request_count
+        
+        pipeline = MatchDayPipeline(
+            self.processor,
+            score_fn=self.build_prediction,
+            persist_fn=self.save_prediction,
+            reuse_fn=self.current_prediction
+        )
+        # finally: o consumidor pode parar a meio (break, erro, GUI fechada)
+        # e os pedidos já feitos contam na mesma para a quota
+        try:
+            yield from pipeline.run(plan=plan)
+        finally:
+            plan.actual_requests = self.api.request_count - requests_planned
+            self.planner.report(plan)
+            print(f"♻️  Previsões: {pipeline.counts['recomputed']} recalculadas, "
+                  f"{pipeline.counts['reused']} sem alterações")
             
-            if not today_fixtures:
-                print(f"   ℹ️  Sem jogos hoje nesta liga\n")
-                continue
-            
-            print(f"   📋 Encontrados {len(today_fixtures)} jogos\n")
+            # Uso da quota diária (partilhado com o backfill agendado)
+            self.db.record_api_usage('live', self.api.request_count - requests_before)
             
-            # Analisar cada jogo
-            for fixture in today_fixtures:
-                try:
-                    prediction = self.analyze_single_match(fixture, league_name)
-                    if prediction:
-                        all_predictions.append(prediction)
-                except Exception as e:
-                    print(f"   ❌ Erro ao analisar jogo: {e}\n")
-                    continue
+            # Estatísticas do planner / páginas livres após a ingestão do dia
+            self.db.run_maintenance()
+    
+    def analyze_today_matches(self, league_ids: List[int] = None,
+                              budget: int = None) -> List[Dict]:
+        """
+        Analisar jogos de hoje
+        
+        Args:
+            league_ids: Lista de IDs das ligas a analisar (None = todas)
+            budget: Pedidos à API que a análise pode gastar (default: quota restante)
+        
+        Returns:
+            Lista de análises dos jogos, ordenada por score
+        """
+        all_predictions = list(self.iter_today_predictions(league_ids, budget))
         
         # Ordenar por score
         all_predictions.sort(key=lambda x: x['overall_score'], reverse=True)
         
         return all_predictions
     
-    def analyze_single_match(self, fixture: Dict, league_name: str) -> Dict:
+    def analyze_single_match(self, fixture: Dict, league_name: str,
+                             analysis_data: Dict = None) -> Dict:
         """
-        Analisar um único jogo
+        Analisar um único jogo e guardar a previsão
         
         Args:
             fixture: Dados do jogo da API
             league_name: Nome da liga
+            analysis_data: Dados já montados em lote (None = obter agora)
+        
+        Returns:
+            Dicionário com análise completa
+        """
+        return self.save_prediction(
+            self.build_prediction(fixture, league_name, analysis_data)
+        )
+    
+    def current_prediction(self, fixture: Dict) -> Dict:
+        """
+        Previsão já guardada de um jogo, se as equipas não mudaram desde então
+        
+        Returns:
+            Dicionário no formato de build_prediction, ou None (recalcular)
+        """
+        row = self.db.get_current_prediction(fixture.get('fixture', {}).get('id'))
+        if row is None:
+            return None
+        
+        prediction = {key: row[column] for key, column in PREDICTION_COLUMNS.items()}
+        prediction['first_half_stats_score'] = None
+        return prediction
+    
+    def build_prediction(self, fixture: Dict, league_name: str,
+                         analysis_data: Dict = None, input_seq: int = None) -> Dict:
+        """
+        Calcular a previsão de um jogo (sem guardar)
+        
+        Args:
+            fixture: Dados do jogo da API
+            league_name: Nome da liga
+            analysis_data: Dados já montados em lote (None = obter agora)
+            input_seq: get_change_seq() lido antes de montar analysis_data
         
         Returns:
             Dicionário com análise completa
@@ -101,11 +196,13 @@ class FootballBettingAI:
         print(f"   ⚽ Analisando: {home_team_name} vs {away_team_name}")
         
         # Obter dados de análise
-        analysis_data = self.processor.get_match_analysis_data(
-            home_team_id,
-            away_team_id,
-            league_data.get('id')
-        )
+        if analysis_data is None:
+            input_seq = self.db.get_change_seq()
+            analysis_data = self.processor.get_match_analysis_data(
+                home_team_id,
+                away_team_id,
+                league_data.get('id')
+            )
         
         # Calcular score
         analysis_result = self.scoring.analyze_match(analysis_data)
@@ -114,9 +211,12 @@ class FootballBettingAI:
         prediction = {
             'match_id': fixture_data.get('id'),
             'date': fixture_data.get('date'),
+            'league_id': league_data.get('id'),
             'league_name': league_name,
             'home_team': home_team_name,
             'away_team': away_team_name,
+            'home_team_id': home_team_id,
+            'away_team_id': away_team_id,
             
             # Over 0.5 HT
             'overall_score': analysis_result['overall_score'],
@@ -134,12 +234,28 @@ class FootballBettingAI:
             'away_form_score_o15': analysis_result['away_form_score_o15'],
             'recommendation_o15': analysis_result['recommendation_o15'],
             
+            'offensive_pressure_score': analysis_result['offensive_pressure_score'],
+            'minute_distribution_score': analysis_result['minute_distribution_score'],
             'first_half_stats_score': None,
-            'reasoning': analysis_result['reasoning']
+            'reasoning': analysis_result['reasoning'],
+            'input_seq': input_seq
         }
         
-        # Guardar na base de dados
-        self.db.insert_prediction(prediction)
+        return prediction
+    
+    def save_prediction(self, prediction: Dict) -> Dict:
+        """
+        Guardar uma previsão na base de dados (nomes das colunas de predictions)
+        
+        Args:
+            prediction: Resultado de build_prediction
+        
+        Returns:
+            A mesma previsão
+        """
+        self.db.insert_prediction(DailyPrediction(**{
+            column: prediction.get(key) for key, column in PREDICTION_COLUMNS.items()
+        }).to_dict())
         
         # Print resultado
         score_emoji_ht = "🟢" if prediction['overall_score'] >= 75 else "🟡" if prediction['overall_score'] >= 60 else "🔴"
@@ -252,21 +368,11 @@ class FootballBettingAI:
         
         # Buscar dados para visualização
         try:
-            home_team_id = None
-            away_team_id = None
-            
-            # Buscar IDs das equipas na BD
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id FROM teams WHERE name = ?", (prediction['home_team'],))
-                result = cursor.fetchone()
-                if result:
-                    home_team_id = result['id']
-                
-                cursor.execute("SELECT id FROM teams WHERE name = ?", (prediction['away_team'],))
-                result = cursor.fetchone()
-                if result:
-                    away_team_id = result['id']
+            # IDs vêm com a previsão; nomes só para previsões antigas
+            home_team_id = (prediction.get('home_team_id')
+                            or self.db.get_team_id_by_name(prediction['home_team']))
+            away_team_id = (prediction.get('away_team_id')
+                            or self.db.get_team_id_by_name(prediction['away_team']))
             
             if home_team_id and away_team_id:
                 # 1. Confrontos diretos
@@ -281,13 +387,8 @@ class FootballBettingAI:
                     print(viz)
                 
                 # 2. Forma da equipa da casa (apenas campeonato)
-                league_id = None
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT id FROM leagues WHERE name = ?", (prediction['league_name'],))
-                    result = cursor.fetchone()
-                    if result:
-                        league_id = result['id']
+                league_id = (prediction.get('league_id')
+                             or self.db.get_league_id_by_name(prediction['league_name']))
 
                 if league_id:
                     home_matches = self.db.get_team_recent_matches_by_league(home_team_id, league_id, limit=10)
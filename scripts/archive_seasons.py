@@ -0,0 +1,83 @@
+"""
+Arquivo de Temporadas - Football Betting AI
+Move temporadas fechadas para BDs próprias (archive/football_betting_<ano>.db)
+para manter a BD principal pequena.
+
+Uso:
+    python scripts/archive_seasons.py --list
+    python scripts/archive_seasons.py 2022 2023
+    python scripts/archive_seasons.py --before 2025 --no-vacuum
+"""
+
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from config.config import CURRENT_SEASON
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquivar temporadas fechadas")
+    parser.add_argument('seasons', nargs='*', type=int,
+                        help="Temporadas a arquivar")
+    parser.add_argument('--before', type=int,
+                        help="Arquivar todas as temporadas anteriores a este ano")
+    parser.add_argument('--list', action='store_true',
+                        help="Listar temporadas na BD principal e no arquivo")
+    parser.add_argument('--no-vacuum', action='store_true',
+                        help="Não fazer VACUUM à BD principal no fim")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT season, COUNT(*) as count FROM fixtures
+            GROUP BY season ORDER BY season
+        """)
+        hot_seasons = {row['season']: row['count'] for row in cursor.fetchall()}
+
+    if args.list or not (args.seasons or args.before):
+        print("\n📊 Temporadas na BD principal:")
+        for season, count in hot_seasons.items():
+            print(f"   • {season}: {count} jogos")
+
+        print("\n🗄️  Temporadas arquivadas:")
+        archived = db.get_archived_seasons()
+        for season in archived:
+            print(f"   • {season}: {db.get_archive_path(season)}")
+        if not archived:
+            print("   (nenhuma)")
+        return
+
+    seasons = set(args.seasons)
+    if args.before:
+        seasons.update(s for s in hot_seasons if s < args.before)
+
+    for season in sorted(seasons):
+        if season >= CURRENT_SEASON:
+            print(f"⚠️  {season}: temporada atual, ignorada")
+            continue
+        if season not in hot_seasons:
+            print(f"ℹ️  {season}: sem jogos na BD principal")
+            continue
+
+        print(f"\n🗄️  A arquivar temporada {season}...")
+        moved = db.archive_season(season, vacuum=False)
+        for table, count in moved.items():
+            print(f"   • {table}: {count} linhas movidas")
+
+    if not args.no_vacuum:
+        print("\n🧹 VACUUM da BD principal...")
+        with db.get_connection() as conn:
+            conn.isolation_level = None
+            conn.execute("VACUUM")
+
+    print("\n✅ Arquivo concluído!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Backfill Histórico - Football Betting AI
+Carrega temporadas passadas das LEAGUES (liga x temporada): todos os jogos
+com um único pedido por liga/temporada, guardados numa transação, e depois
+estatísticas/eventos dos jogos terminados, sob o rate limiter do cliente.
+
+O progresso fica em backfill_checkpoints (e, por jogo, no fixture_fetch_ledger):
+depois de um crash ou de esgotar a quota diária basta correr de novo.
+
+Uso:
+    python scripts/backfill.py                          # todas as ligas, 3 temporadas
+    python scripts/backfill.py --leagues "Premier League" 94 --seasons 2
+    python scripts/backfill.py --no-enrich              # só jogos (1 pedido por liga/temporada)
+    python scripts/backfill.py --status                 # ver checkpoints
+"""
+
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from api.api_client import APIFootballClient
+from analysis.data_processor import DataProcessor
+from config.config import BACKFILL_PARAMS, CURRENT_SEASON, DATABASE_PATH, LEAGUES
+
+LEAGUE_NAMES = {league_id: name for name, league_id in LEAGUES.items()}
+
+
+def resolve_leagues(values) -> list:
+    """Nomes (chaves de LEAGUES) ou IDs -> IDs de liga"""
+    if not values:
+        return list(LEAGUES.values())
+
+    league_ids = []
+    for value in values:
+        if value in LEAGUES:
+            league_ids.append(LEAGUES[value])
+        elif value.isdigit():
+            league_ids.append(int(value))
+        else:
+            raise SystemExit(f"❌ Liga desconhecida: {value} (opções: {', '.join(LEAGUES)})")
+    return league_ids
+
+
+def backfill_league_season(processor: DataProcessor, league_id: int, season: int,
+                           enrich: bool = True, reserve: int = 0,
+                           params: dict = BACKFILL_PARAMS) -> bool:
+    """
+    Carregar uma liga/temporada a partir do seu checkpoint
+
+    Returns:
+        False se parou por falta de quota (retomar mais tarde)
+    """
+    db, api = processor.db, processor.api
+    label = f"{LEAGUE_NAMES.get(league_id, league_id)} {season}"
+    checkpoint = db.get_backfill_checkpoint(league_id, season)
+    status = checkpoint['status'] if checkpoint else 'pending'
+
+    # Temporadas terminadas não mudam; a atual volta a ser percorrida
+    if status == 'done' and season != CURRENT_SEASON:
+        print(f"   ⏭️  {label}: já concluída")
+        return True
+
+    # 1. Jogos da temporada (um pedido, uma transação)
+    if status == 'pending' or season == CURRENT_SEASON:
+        if api.quota_exhausted(reserve):
+            return False
+
+        fixtures = api.get_league_fixtures(league_id, season)
+        if not fixtures:
+            if api.quota_exhausted(reserve):
+                return False
+            print(f"   ℹ️  {label}: sem jogos na API")
+            db.save_backfill_checkpoint(league_id, season, 'pending')
+            return True
+
+        finished = processor.save_fixtures_bulk(fixtures)
+        if finished is None:
+            print(f"   ❌ {label}: jogos não guardados, fica para a próxima execução")
+            return True
+        db.save_backfill_checkpoint(league_id, season, 'fixtures',
+                                    fixtures_total=len(fixtures),
+                                    fixtures_finished=len(finished))
+        print(f"   📥 {label}: {len(fixtures)} jogos guardados ({len(finished)} terminados)")
+
+    if not enrich:
+        return True
+
+    # 2. Estatísticas/eventos dos jogos terminados (o ledger salta os já obtidos),
+    #    primeiro os das equipas que jogam nos próximos dias
+    fixture_ids = db.get_fixture_ids_by_demand(league_id, season,
+                                               days=params['demand_days'])
+    start = 0
+
+    while start < len(fixture_ids):
+        # Até 2 pedidos por jogo: o bloco nunca passa da quota que resta
+        chunk = params['enrich_chunk']
+        if api.daily_remaining is not None:
+            chunk = min(chunk, (api.daily_remaining - reserve) // 2)
+        if chunk < 1:
+            print(f"   ⏸️  {label}: quota esgotada em {start}/{len(fixture_ids)} jogos")
+            return False
+
+        result = processor.enrich_fixtures(fixture_ids[start:start + chunk],
+                                           season=season,
+                                           stats_last_n=params['stats_last_n'])
+        db.save_backfill_checkpoint(league_id, season, 'fixtures',
+                                    enrich_requests=result['stats'] + result['events'])
+        start += chunk
+
+    db.save_backfill_checkpoint(league_id, season, 'done')
+    print(f"   ✅ {label}: concluída ({len(fixture_ids)} jogos terminados)")
+    return True
+
+
+def print_status(db: DatabaseManager):
+    print("\n📒 Checkpoints do backfill:")
+    checkpoints = db.get_backfill_checkpoints()
+    for cp in checkpoints:
+        print(f"   • {LEAGUE_NAMES.get(cp['league_id'], cp['league_id']):<16} {cp['season']} "
+              f"{cp['status']:<9} jogos {cp['fixtures_total']:>4} "
+              f"(FT {cp['fixtures_finished']:>4}) | pedidos enriq. {cp['enrich_requests']:>5} | "
+              f"{cp['updated_at']}")
+    if not checkpoints:
+        print("   (vazio)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill histórico das ligas configuradas")
+    parser.add_argument('--db', default=DATABASE_PATH, help="Ficheiro da BD")
+    parser.add_argument('--leagues', nargs='+',
+                        help="Nomes (como em LEAGUES) ou IDs (default: todas)")
+    parser.add_argument('--seasons', type=int, default=BACKFILL_PARAMS['seasons'],
+                        help="Número de temporadas, a contar da atual")
+    parser.add_argument('--reserve', type=int, default=BACKFILL_PARAMS['quota_reserve'],
+                        help="Pedidos diários a deixar livres")
+    parser.add_argument('--no-enrich', action='store_true',
+                        help="Guardar só os jogos, sem estatísticas/eventos")
+    parser.add_argument('--status', action='store_true',
+                        help="Mostrar checkpoints e sair")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    if args.status:
+        print_status(db)
+        return
+
+    processor = DataProcessor(db=db, api=APIFootballClient())
+    league_ids = resolve_leagues(args.leagues)
+    seasons = range(CURRENT_SEASON, CURRENT_SEASON - args.seasons, -1)
+
+    print(f"\n🗄️  Backfill: {len(league_ids)} ligas x {args.seasons} temporadas")
+    complete = True
+    try:
+        for league_id in league_ids:
+            for season in seasons:
+                if not backfill_league_season(processor, league_id, season,
+                                              enrich=not args.no_enrich,
+                                              reserve=args.reserve):
+                    complete = False
+                    break
+            if not complete:
+                break
+    finally:
+        # Os pedidos já feitos contam para a quota mesmo que a corrida falhe
+        db.record_api_usage('backfill', processor.api.request_count)
+
+    print(f"\n📊 {processor.api.request_count} pedidos feitos"
+          + (f" | quota restante: {processor.api.daily_remaining}"
+             if processor.api.daily_remaining is not None else ""))
+    if complete:
+        print("✅ Backfill concluído!")
+    else:
+        print("⏸️  Quota esgotada - correr de novo para retomar a partir dos checkpoints")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Agendador do Backfill - Football Betting AI
+Reparte o backfill histórico (scripts/backfill.py) por vários dias sem
+tirar quota à análise dos jogos do dia:
+
+- live_quota_share da quota diária fica reservada para a análise do dia
+  (o uso real de cada origem fica em api_usage, partilhada entre processos)
+- quota_reserve pedidos por dia nunca são gastos pelo backfill
+- as ligas/temporadas com mais jogos nos próximos dias vêm primeiro e,
+  dentro de cada uma, os jogos das equipas que vão jogar
+
+Uso:
+    python scripts/backfill_scheduler.py            # gastar a quota de backfill de hoje
+    python scripts/backfill_scheduler.py --plan     # prioridades e dias estimados
+    python scripts/backfill_scheduler.py --loop     # correr todos os dias até terminar
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import argparse
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from api.api_client import APIFootballClient
+from analysis.data_processor import DataProcessor
+from config.config import (
+    API_REQUESTS_PER_DAY, BACKFILL_PARAMS, CURRENT_SEASON, DATABASE_PATH
+)
+from scripts.backfill import LEAGUE_NAMES, backfill_league_season, resolve_leagues
+
+
+def daily_budget(db: DatabaseManager, api: APIFootballClient,
+                 params: Dict = BACKFILL_PARAMS) -> Dict[str, int]:
+    """
+    Quota de hoje repartida entre análise do dia e backfill
+
+    Returns:
+        {'limit', 'used', 'live_reserved', 'reserve', 'backfill'}: live_reserved
+        é o que ainda falta à análise do dia gastar da sua parte; reserve são
+        os pedidos que ficam sempre livres; backfill é o que o backfill pode
+        gastar agora
+    """
+    limit = api.daily_limit or API_REQUESTS_PER_DAY
+    usage = db.get_api_usage()
+    used = sum(usage.values())
+    if api.daily_remaining is not None:
+        # A API conta também pedidos de outros processos/clientes
+        used = max(used, limit - api.daily_remaining)
+
+    live_reserved = max(0, int(limit * params['live_quota_share']) - usage.get('live', 0))
+    return {
+        'limit': limit,
+        'used': used,
+        'live_reserved': live_reserved,
+        'reserve': params['quota_reserve'],
+        'backfill': max(0, limit - used - live_reserved - params['quota_reserve']),
+    }
+
+
+def prioritized_units(db: DatabaseManager, league_ids: List[int], seasons: int,
+                      params: Dict = BACKFILL_PARAMS) -> List[Tuple[int, int, float]]:
+    """
+    Ligas/temporadas por fazer, da mais útil para os próximos jogos à menos
+
+    A temporada atual alimenta forma, pressão e distribuição; as anteriores
+    só os confrontos diretos, por isso pesam menos (1 / (anos atrás + 1)).
+
+    Returns:
+        (league_id, season, prioridade)
+    """
+    upcoming = db.get_upcoming_fixture_counts(params['demand_days'])
+    units = []
+
+    for league_id in league_ids:
+        for offset in range(seasons):
+            season = CURRENT_SEASON - offset
+            checkpoint = db.get_backfill_checkpoint(league_id, season)
+            if checkpoint and checkpoint['status'] == 'done' and season != CURRENT_SEASON:
+                continue
+            # +1: ligas sem calendário carregado ainda contam
+            priority = (upcoming.get(league_id, 0) + 1) / (offset + 1)
+            units.append((league_id, season, priority))
+
+    return sorted(units, key=lambda unit: (-unit[2], -unit[1], unit[0]))
+
+
+def estimate_requests(db: DatabaseManager, league_id: int, season: int,
+                      params: Dict = BACKFILL_PARAMS) -> int:
+    """Pedidos que ainda faltam a uma liga/temporada (até 2 por jogo terminado)"""
+    checkpoint = db.get_backfill_checkpoint(league_id, season)
+    if checkpoint is None or checkpoint['status'] == 'pending':
+        return 1 + 2 * params['fixtures_per_season']
+    return max(0, 2 * checkpoint['fixtures_finished'] - checkpoint['enrich_requests'])
+
+
+def print_plan(db: DatabaseManager, api: APIFootballClient,
+               units: List[Tuple[int, int, float]]):
+    budget = daily_budget(db, api)
+    per_day = max(1, budget['limit'] - budget['reserve']
+                  - int(budget['limit'] * BACKFILL_PARAMS['live_quota_share']))
+    total = 0
+
+    print(f"\n🗓️  Quota de hoje: {budget['used']}/{budget['limit']} usados | "
+          f"reservados à análise: {budget['live_reserved']} | backfill: {budget['backfill']}")
+    print(f"\n{'Liga':<18} {'Época':>6} {'Prioridade':>10} {'Pedidos':>9}")
+    for league_id, season, priority in units:
+        requests = estimate_requests(db, league_id, season)
+        total += requests
+        print(f"{LEAGUE_NAMES.get(league_id, league_id):<18} {season:>6} "
+              f"{priority:>10.2f} {requests:>9}")
+
+    days = max(0, total - budget['backfill']) / per_day
+    print(f"\n📊 ~{total} pedidos por fazer → hoje + {days:.1f} dias "
+          f"({per_day} pedidos/dia de backfill)")
+
+
+def run_day(processor: DataProcessor, league_ids: List[int], seasons: int,
+            enrich: bool = True) -> bool:
+    """
+    Gastar a quota de backfill de hoje, por ordem de prioridade
+
+    Returns:
+        True se já não há nada por fazer
+    """
+    db, api = processor.db, processor.api
+    api.get_api_status()  # Quota real do dia (não conta para o limite)
+    requests_before = api.request_count
+
+    budget = daily_budget(db, api)
+    if api.daily_remaining is None:
+        # Sem resposta do status: usar a contabilidade local de api_usage
+        api.daily_remaining = budget['limit'] - budget['used']
+
+    print(f"\n🗓️  {datetime.now().strftime('%d/%m/%Y')}: {budget['backfill']} pedidos para backfill "
+          f"({budget['live_reserved']} reservados à análise do dia, {budget['reserve']} livres)")
+
+    done = True
+    try:
+        for league_id, season, _ in prioritized_units(db, league_ids, seasons):
+            # reserve: o backfill pára antes de tocar na parte da análise do dia
+            # e nos pedidos que ficam sempre livres
+            if not backfill_league_season(processor, league_id, season, enrich=enrich,
+                                          reserve=budget['live_reserved'] + budget['reserve']):
+                done = False
+                break
+    finally:
+        db.record_api_usage('backfill', api.request_count - requests_before)
+
+    return done
+
+
+def seconds_until_tomorrow() -> float:
+    """Segundos até pouco depois da meia-noite (renovação da quota)"""
+    now = datetime.now()
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=5, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill repartido por vários dias")
+    parser.add_argument('--db', default=DATABASE_PATH, help="Ficheiro da BD")
+    parser.add_argument('--leagues', nargs='+',
+                        help="Nomes (como em LEAGUES) ou IDs (default: todas)")
+    parser.add_argument('--seasons', type=int, default=BACKFILL_PARAMS['seasons'],
+                        help="Número de temporadas, a contar da atual")
+    parser.add_argument('--no-enrich', action='store_true',
+                        help="Guardar só os jogos, sem estatísticas/eventos")
+    parser.add_argument('--plan', action='store_true',
+                        help="Mostrar prioridades e estimativa de dias e sair")
+    parser.add_argument('--loop', action='store_true',
+                        help="Repetir todos os dias até o backfill terminar")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    api = APIFootballClient()
+    league_ids = resolve_leagues(args.leagues)
+
+    if args.plan:
+        print_plan(db, api, prioritized_units(db, league_ids, args.seasons))
+        return
+
+    processor = DataProcessor(db=db, api=api)
+    while True:
+        done = run_day(processor, league_ids, args.seasons, enrich=not args.no_enrich)
+        if done:
+            print("\n✅ Backfill concluído!")
+            break
+        if not args.loop:
+            print("\n⏸️  Quota de backfill de hoje esgotada - continua amanhã")
+            break
+
+        wait = seconds_until_tomorrow()
+        print(f"\n😴 A aguardar {wait / 3600:.1f} h pela quota de amanhã...")
+        time.sleep(wait)
+        api.daily_remaining = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Backup Online - Football Betting AI
+Copia a BD com a backup API do SQLite, em passos, sem parar a ingestão.
+
+Uso:
+    python scripts/backup_database.py backups/football_betting.db
+    python scripts/backup_database.py --snapshot        # snapshot só de leitura
+    python scripts/backup_database.py --list
+    python scripts/backup_database.py dest.db --pages 1024 --sleep 0
+"""
+
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from config.config import (
+    DATABASE_PATH, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP, SNAPSHOT_DIR, SNAPSHOT_KEEP
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backup online da BD")
+    parser.add_argument('dest', nargs='?', help="Ficheiro de destino do backup")
+    parser.add_argument('--db', default=DATABASE_PATH, help="BD de origem")
+    parser.add_argument('--snapshot', action='store_true',
+                        help=f"Criar snapshot datado em {SNAPSHOT_DIR}/")
+    parser.add_argument('--keep', type=int, default=SNAPSHOT_KEEP,
+                        help="Snapshots a manter")
+    parser.add_argument('--list', action='store_true', help="Listar snapshots")
+    parser.add_argument('--pages', type=int, default=BACKUP_PAGES_PER_STEP,
+                        help="Páginas por passo (-1 = tudo de uma vez)")
+    parser.add_argument('--sleep', type=float, default=BACKUP_STEP_SLEEP,
+                        help="Segundos entre passos")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n📸 Snapshots:")
+        snapshots = DatabaseManager.list_snapshots()
+        for path in snapshots:
+            print(f"   • {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+        if not snapshots:
+            print("   (nenhum)")
+        return
+
+    if not args.dest and not args.snapshot:
+        parser.error("indique o destino ou --snapshot")
+
+    # Só leitura: a origem não é migrada nem alterada pelo backup
+    db = DatabaseManager(args.db, read_only=True)
+
+    if args.snapshot:
+        path = db.create_snapshot(keep=args.keep)
+        if path:
+            print(f"📸 Snapshot: {path}")
+    else:
+        db.backup_to(args.dest, pages=args.pages, sleep=args.sleep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark do Parsing de Estatísticas/Eventos - Football Betting AI
+Converte respostas de /fixtures/statistics e /fixtures/events em linhas
+(statistics_rows / event_rows) e guarda-as numa cópia em memória da BD.
+
+Sem --archive, as respostas são geradas a partir dos jogos terminados da
+BD (resultados repetíveis); com --archive usa as respostas arquivadas.
+
+Uso:
+    python scripts/bench_parsing.py
+    python scripts/bench_parsing.py --limit 1000 --repeat 5
+    python scripts/bench_parsing.py --archive       # respostas de api_payloads.db
+"""
+
+import argparse
+import random
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from database.models import Match, STATISTIC_TYPES, event_rows, statistics_rows
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import DATABASE_PATH, RAW_PAYLOAD_DB_PATH
+
+EVENT_SAMPLES = (
+    ('Goal', 'Normal Goal'), ('Goal', 'Penalty'), ('Card', 'Yellow Card'),
+    ('Card', 'Red Card'), ('subst', 'Substitution 1'), ('Var', 'Goal cancelled'),
+)
+
+
+def synthetic_payloads(matches, seed: int = 42):
+    """(fixture_id, estatísticas, eventos) no formato da API para cada jogo"""
+    rng = random.Random(seed)
+    payloads = []
+
+    for match in matches:
+        stats = []
+        for team_id in (match.home_team_id, match.away_team_id):
+            statistics = []
+            for api_type in STATISTIC_TYPES:
+                if api_type in ('Ball Possession', 'Passes %'):
+                    value = f"{rng.randint(30, 70)}%"
+                elif api_type == 'expected_goals':
+                    value = f"{rng.random() * 3:.2f}"
+                else:
+                    value = rng.choice((None, 0, rng.randint(1, 20)))
+                statistics.append({'type': api_type, 'value': value})
+            stats.append({'team': {'id': team_id}, 'statistics': statistics})
+
+        events = []
+        for _ in range(rng.randint(4, 14)):
+            event_type, detail = rng.choice(EVENT_SAMPLES)
+            player = rng.randint(1, 400)
+            events.append({
+                'time': {'elapsed': rng.randint(1, 90), 'extra': None},
+                'team': {'id': rng.choice((match.home_team_id, match.away_team_id))},
+                'player': {'id': player, 'name': f"Jogador {player}"},
+                'assist': {'id': None, 'name': None},
+                'type': event_type,
+                'detail': detail,
+                'comments': None,
+            })
+        payloads.append((match.id, stats, events))
+
+    return payloads
+
+
+def archived_payloads(path: str, limit: int):
+    """(fixture_id, estatísticas, eventos) a partir do arquivo de payloads"""
+    from api.payload_store import PayloadStore
+
+    store = PayloadStore(path)
+    by_fixture = {}
+    for endpoint in ('fixtures/statistics', 'fixtures/events'):
+        for _, params, _, data in store.iter_payloads(endpoint):
+            fixture_id = int(params['fixture'])
+            entry = by_fixture.setdefault(fixture_id, [fixture_id, [], []])
+            entry[1 if endpoint == 'fixtures/statistics' else 2] = data.get('response') or []
+
+    return [tuple(entry) for entry in list(by_fixture.values())[:limit]]
+
+
+def run_parse(payloads) -> float:
+    """Só a conversão payload -> tuplos; devolve segundos"""
+    start = time.perf_counter()
+    for fixture_id, stats, events in payloads:
+        statistics_rows(fixture_id, stats)
+        event_rows(fixture_id, events)
+    return time.perf_counter() - start
+
+
+def run_save(processor: DataProcessor, payloads) -> float:
+    """Conversão + escrita na BD (save_fixture_statistics/events); devolve segundos"""
+    start = time.perf_counter()
+    for fixture_id, stats, events in payloads:
+        processor.save_fixture_statistics(fixture_id, stats)
+        processor.save_fixture_events(fixture_id, events)
+    return time.perf_counter() - start
+
+
+def report(label: str, timings, count: int):
+    best = min(timings)
+    print(f"   {label:<9} melhor: {best * 1000:.1f} ms "
+          f"({best / max(count, 1) * 1e6:.1f} µs/jogo) | "
+          f"todas: {', '.join(f'{t * 1000:.1f}' for t in timings)} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parsing de estatísticas/eventos")
+    parser.add_argument('--snapshot', default=DATABASE_PATH,
+                        help="BD a copiar para memória")
+    parser.add_argument('--limit', type=int, default=500,
+                        help="Número de jogos")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Repetições (conta a melhor)")
+    parser.add_argument('--archive', nargs='?', const=RAW_PAYLOAD_DB_PATH,
+                        help="Usar respostas arquivadas (default: api_payloads.db)")
+    args = parser.parse_args()
+
+    db = DatabaseManager.in_memory(args.snapshot)
+
+    if args.archive:
+        payloads = archived_payloads(args.archive, args.limit)
+        source = f"arquivo {args.archive}"
+    else:
+        matches = list(db.iter_fixtures(status='FT', model=Match))[:args.limit]
+        payloads = synthetic_payloads(matches)
+        source = "sintéticos"
+
+    rows = sum(len(stats) + len(events) for _, stats, events in payloads)
+    print(f"\n⏱️  {len(payloads)} jogos ({rows} linhas) | payloads: {source}")
+    report("parsing", [run_parse(payloads) for _ in range(args.repeat)], len(payloads))
+
+    processor = DataProcessor(db=db, api=APIFootballClient(payload_store=False))
+
+    # Os prints de erro da BD não entram na medição
+    timings = []
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            for _ in range(args.repeat):
+                timings.append(run_save(processor, payloads))
+        finally:
+            sys.stdout = stdout
+    report("+ BD", timings, len(payloads))
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark do Pipeline de Scoring - Football Betting AI
+Corre FeatureBuilder + ScoringSystem sobre os jogos terminados de uma
+cópia em memória da BD (sem I/O de disco, resultados repetíveis).
+
+Uso:
+    python scripts/bench_scoring.py
+    python scripts/bench_scoring.py --limit 200 --repeat 5
+    python scripts/bench_scoring.py --disk      # comparar com a BD em ficheiro
+"""
+
+import argparse
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from database.models import Match
+from analysis.feature_store import FeatureBuilder
+from analysis.scoring import ScoringSystem
+from config.config import DATABASE_PATH
+
+
+def run_pipeline(db: DatabaseManager, matches, scoring: ScoringSystem) -> float:
+    """Calcular features e scores de todos os jogos; devolve segundos"""
+    builder = FeatureBuilder(db)
+    start = time.perf_counter()
+    for match in matches:
+        scoring.analyze_features(builder.build(match))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de scoring")
+    parser.add_argument('--snapshot', default=DATABASE_PATH,
+                        help="BD a copiar para memória")
+    parser.add_argument('--limit', type=int, default=100,
+                        help="Número de jogos a analisar")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Repetições (conta a melhor)")
+    parser.add_argument('--disk', action='store_true',
+                        help="Usar a BD em ficheiro em vez da cópia em memória")
+    args = parser.parse_args()
+
+    if args.disk:
+        db = DatabaseManager(args.snapshot)
+    else:
+        db = DatabaseManager.in_memory(args.snapshot)
+
+    matches = list(db.iter_fixtures(model=Match))[:args.limit]
+    scoring = ScoringSystem()
+
+    # Os prints do scoring não entram na medição
+    timings = []
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            for _ in range(args.repeat):
+                timings.append(run_pipeline(db, matches, scoring))
+        finally:
+            sys.stdout = stdout
+
+    backend = "ficheiro" if args.disk else "memória"
+    best = min(timings)
+    print(f"\n⏱️  {len(matches)} jogos | backend: {backend}")
+    print(f"   melhor: {best * 1000:.1f} ms ({best / max(len(matches), 1) * 1000:.2f} ms/jogo)")
+    print(f"   todas:  {', '.join(f'{t * 1000:.1f}' for t in timings)} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
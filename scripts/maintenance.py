@@ -0,0 +1,94 @@
+"""
+Manutenção da BD - Football Betting AI
+ANALYZE + PRAGMA optimize depois de ingestões grandes, incremental vacuum
+agendado e relatório de uso de índices.
+
+Uso:
+    python scripts/maintenance.py              # apenas tarefas em atraso
+    python scripts/maintenance.py --force      # correr tudo
+    python scripts/maintenance.py --convert    # passar a auto_vacuum=INCREMENTAL (VACUUM completo)
+    python scripts/maintenance.py --indexes    # relatório de índices
+    python scripts/maintenance.py --history
+"""
+
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.db_manager import DatabaseManager
+from config.config import DATABASE_PATH
+
+
+def print_index_report(db: DatabaseManager):
+    print("\n📇 Índices:")
+    unused = []
+    for entry in db.get_index_report():
+        stat = entry['stat'] or 'sem ANALYZE'
+        print(f"   • {entry['index']} ON {entry['table']}({', '.join(entry['columns'])})")
+        print(f"       stat: {stat}")
+        if entry['used_by']:
+            print(f"       usado por: {', '.join(entry['used_by'])}")
+        else:
+            unused.append(entry['index'])
+    if unused:
+        print(f"\n⚠️  Sem uso nas queries representativas: {', '.join(unused)}")
+
+
+def print_history(db: DatabaseManager):
+    print("\n🗒️  Histórico de manutenção:")
+    with db.get_connection() as conn:
+        rows = conn.execute("""
+            SELECT task, run_at, duration_ms, page_count_before, page_count_after,
+                   freelist_before, freelist_after
+            FROM maintenance_log ORDER BY id DESC LIMIT 20
+        """).fetchall()
+    for row in rows:
+        print(f"   • {row['run_at']} {row['task']:<8} {row['duration_ms']:>8.0f} ms | "
+              f"páginas {row['page_count_before']} → {row['page_count_after']} | "
+              f"livres {row['freelist_before']} → {row['freelist_after']}")
+    if not rows:
+        print("   (vazio)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção da BD")
+    parser.add_argument('--db', default=DATABASE_PATH, help="Ficheiro da BD")
+    parser.add_argument('--force', action='store_true',
+                        help="Correr ANALYZE e vacuum mesmo que não estejam em atraso")
+    parser.add_argument('--convert', action='store_true',
+                        help="Converter a BD para auto_vacuum=INCREMENTAL (VACUUM completo, "
+                             "reescreve o ficheiro)")
+    parser.add_argument('--indexes', action='store_true',
+                        help="Mostrar relatório de índices")
+    parser.add_argument('--history', action='store_true',
+                        help="Mostrar histórico de manutenção")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+
+    if args.indexes:
+        print_index_report(db)
+        return
+    if args.history:
+        print_history(db)
+        return
+    if args.convert:
+        db.convert_auto_vacuum()
+        return
+
+    done = db.run_maintenance(force=args.force)
+    if not done:
+        print("✅ Nada em atraso")
+        return
+
+    vacuum = done.get('vacuum')
+    if vacuum:
+        print(f"\n🧹 Fragmentação: {vacuum['freelist_before']} páginas livres → "
+              f"{vacuum['freelist_after']} | ficheiro {vacuum['page_count_before']} → "
+              f"{vacuum['page_count_after']} páginas")
+    print("\n✅ Manutenção concluída!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Reprocessamento Offline - Football Betting AI
+Reconstrói fixtures, estatísticas e eventos a partir do arquivo de
+respostas brutas da API (api_payloads.db), sem gastar requests.
+
+Uso:
+    python scripts/reprocess_payloads.py --stats
+    python scripts/reprocess_payloads.py --endpoint fixtures/events
+    python scripts/reprocess_payloads.py --db backfill.db --since 2025-10-01
+    python scripts/reprocess_payloads.py --prune --keep-days 30
+
+Depois de reprocessar, as respostas com mais de --keep-days dias são apagadas.
+"""
+
+import argparse
+from datetime import timedelta
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.payload_store import PayloadStore
+from api.api_client import APIFootballClient
+from analysis.data_processor import DataProcessor
+from database.db_manager import DatabaseManager
+from config.config import RAW_PAYLOAD_DB_PATH, RAW_PAYLOAD_RETENTION_DAYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprocessar payloads arquivados da API")
+    parser.add_argument('--archive', default=RAW_PAYLOAD_DB_PATH,
+                        help="Ficheiro do arquivo de payloads")
+    parser.add_argument('--db', help="BD de destino (default: BD principal)")
+    parser.add_argument('--endpoint', help="Reprocessar apenas este endpoint")
+    parser.add_argument('--since', help="Apenas payloads obtidos a partir desta data (ISO)")
+    parser.add_argument('--stats', action='store_true',
+                        help="Mostrar o conteúdo do arquivo e sair")
+    parser.add_argument('--prune', action='store_true',
+                        help="Só apagar as respostas antigas e sair")
+    parser.add_argument('--keep-days', type=int, default=RAW_PAYLOAD_RETENTION_DAYS,
+                        help="Dias de respostas a manter no arquivo")
+    args = parser.parse_args()
+
+    store = PayloadStore(args.archive)
+    keep = timedelta(days=args.keep_days)
+
+    if args.stats:
+        print("\n📦 Payloads arquivados:")
+        for endpoint, info in store.get_stats().items():
+            print(f"   • {endpoint}: {info['count']} respostas "
+                  f"({info['bytes'] / 1024:.1f} KB comprimidos)")
+        return
+
+    if args.prune:
+        print(f"\n🧹 {store.prune(keep)} respostas com mais de {args.keep_days} dias apagadas")
+        return
+
+    # Sem API real: nenhum request é feito nem volta a ser arquivado
+    processor = DataProcessor(db=DatabaseManager(args.db),
+                              api=APIFootballClient(payload_store=False))
+
+    payloads = records = 0
+    for endpoint, params, fetched_at, data in store.iter_payloads(args.endpoint, args.since):
+        records += processor.reprocess_payload(endpoint, params, data)
+        payloads += 1
+
+    print(f"\n✅ {payloads} payloads reprocessados ({records} registos)")
+    print(f"🧹 {store.prune(keep)} respostas com mais de {args.keep_days} dias apagadas")
+
+    processor.db.run_maintenance()
+
+
+if __name__ == "__main__":
+    main()
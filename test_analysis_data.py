@@ -0,0 +1,180 @@
+"""
+Teste dos Dados de Análise em Lote (get_matches_analysis_data vs queries por equipa)
+"""
+
+import random
+from dataclasses import replace
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from analysis.feature_store import pressure_from_averages
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON, ENRICHMENT_POLICY
+
+print("\n" + "="*80)
+print("🧪 TESTE DOS DADOS DE ANÁLISE EM LOTE")
+print("="*80 + "\n")
+
+LAST_N = ENRICHMENT_POLICY['stats']['last_n_games']
+
+
+def fixture_raw(fixture_id, home, away, kickoff, goals, halftime,
+                league=39, season=CURRENT_SEASON, status='FT'):
+    """Jogo no formato de /fixtures"""
+    finished = status == 'FT'
+    return {
+        'fixture': {'id': fixture_id, 'date': kickoff,
+                    'status': {'short': status, 'long': 'Match Finished' if finished else 'Not Started',
+                               'elapsed': 90 if finished else None}},
+        'league': {'id': league, 'name': f"Liga {league}", 'country': 'England',
+                   'season': season, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': goals[0] if finished else None, 'away': goals[1] if finished else None},
+        'score': {'halftime': {'home': halftime[0] if finished else None,
+                               'away': halftime[1] if finished else None}},
+    }
+
+
+# Seis equipas, duas voltas completas na liga 39; alguns jogos noutra liga,
+# na temporada anterior e um por jogar
+rng = random.Random(42)
+raws = []
+fixture_id = 1000
+for cycle in range(2):
+    for home in range(1, 7):
+        for away in range(1, 7):
+            if home == away:
+                continue
+            fixture_id += 1
+            goals = (rng.randint(0, 4), rng.randint(0, 3))
+            halftime = (rng.randint(0, goals[0]), rng.randint(0, goals[1]))
+            day = 1 + (fixture_id - 1001) % 28
+            month = 8 + (fixture_id - 1001) // 28
+            raws.append(fixture_raw(fixture_id, home, away,
+                                    f"2025-{month:02d}-{day:02d}T{12 + cycle}:00:00+00:00",
+                                    goals, halftime))
+raws.append(fixture_raw(2001, 3, 4, "2025-09-03T20:00:00+00:00", (5, 5), (4, 4), league=140))
+raws.append(fixture_raw(2002, 1, 2, "2024-09-03T20:00:00+00:00", (6, 0), (3, 0),
+                        season=CURRENT_SEASON - 1))
+raws.append(fixture_raw(2003, 1, 2, "2026-05-01T20:00:00+00:00", (0, 0), (0, 0), status='NS'))
+
+db = DatabaseManager.in_memory()
+processor = DataProcessor(db=db, api=APIFootballClient(payload_store=False))
+processor.save_fixtures_bulk(raws)
+
+without_stats = set()
+for raw in raws:
+    if raw['fixture']['status']['short'] != 'FT':
+        continue
+    fid = raw['fixture']['id']
+    teams = (raw['teams']['home']['id'], raw['teams']['away']['id'])
+    if rng.random() < 0.2:
+        without_stats.add(fid)  # Jogos sem estatísticas não contam para a pressão
+    else:
+        processor.save_fixture_statistics(fid, [{'team': {'id': team}, 'statistics': [
+            {'type': 'Shots on Goal', 'value': rng.randint(0, 10)},
+            {'type': 'Total Shots', 'value': rng.randint(5, 25)},
+            {'type': 'Shots insidebox', 'value': rng.choice((None, rng.randint(0, 12)))},
+            {'type': 'Corner Kicks', 'value': rng.randint(0, 12)},
+            {'type': 'Ball Possession', 'value': f"{rng.randint(30, 70)}%"},
+        ]} for team in teams])
+    events = []
+    for side, team in zip(('home', 'away'), teams):
+        for goal in range(raw['goals'][side]):
+            events.append({
+                'time': {'elapsed': rng.randint(1, 95), 'extra': None},
+                'team': {'id': team}, 'player': {'id': team * 10, 'name': f"Jogador {team}"},
+                'assist': {'id': None, 'name': None},
+                'type': 'Goal', 'detail': rng.choice(('Normal Goal', 'Penalty', 'Missed Penalty')),
+                'comments': None,
+            })
+    processor.save_fixture_events(fid, events)
+
+# ============================================================================
+# Lote == queries por equipa/par
+# ============================================================================
+
+print("📦 Lote vs queries individuais...")
+matches = [
+    (1, 2, 39), (3, 4, 39), (2, 1, 39),  # Par repetido ao contrário
+    (5, 6, 39), (1, 3, 39), (1, 99, 39),  # Equipa sem jogos
+    (3, 4, 140),  # Mesmo par noutra liga
+]
+batch = processor.get_matches_analysis_data(matches)
+assert len(batch) == len(matches)
+
+
+def single(home, away, league):
+    """analysis_data montado com as queries por equipa/par"""
+    def pressure(team):
+        return pressure_from_averages(db.get_team_avg_statistics(team, league, CURRENT_SEASON, LAST_N))
+    h2h = processor.get_head_to_head_summary(home, away, league, limit=10)
+    return {
+        # O lote agrega em SQL e não devolve os jogos (last_matches)
+        'h2h': {'stats': replace(h2h, last_matches=())},
+        'home_team': {'stats': processor.get_team_form(home, league)},
+        'away_team': {'stats': processor.get_team_form(away, league)},
+        'home_pressure': pressure(home),
+        'away_pressure': pressure(away),
+        'home_distribution': db.get_goals_by_minute_distribution(home, league, CURRENT_SEASON),
+        'away_distribution': db.get_goals_by_minute_distribution(away, league, CURRENT_SEASON),
+    }
+
+
+for match, data in zip(matches, batch):
+    expected = single(*match)
+    for key in expected:
+        assert data[key] == expected[key], (match, key, data[key], expected[key])
+    assert processor.get_match_analysis_data(*match) == data
+assert batch[0]['h2h']['stats'].total_matches == 5  # Inclui a temporada anterior
+assert batch[2]['h2h']['stats'].team1_wins == batch[0]['h2h']['stats'].team2_wins
+assert batch[5]['away_team']['stats'].games_played == 0
+assert batch[5]['away_distribution'] == {}
+assert batch[6]['h2h']['stats'].total_matches == 1
+print(f"   ✅ {len(matches)} jogos: forma, H2H, pressão e distribuição iguais às queries por equipa")
+print("   ✅ Par ao contrário, equipa sem jogos e outra liga tratados como no caminho individual")
+
+# ============================================================================
+# get_team_avg_statistics: médias dos últimos N jogos com estatísticas
+# ============================================================================
+
+print("\n📊 LIMIT de get_team_avg_statistics...")
+
+
+def expected_averages(team, league, last_n):
+    """Média em Python das estatísticas dos últimos N jogos terminados com estatísticas"""
+    games = [row for row in db.get_team_fixtures(team, limit=200)
+             if row['league_id'] == league and row['season'] == CURRENT_SEASON
+             and row['status_short'] == 'FT' and row['id'] not in without_stats]
+    games.sort(key=lambda row: row['date'], reverse=True)
+    rows = [next(s for s in db.get_fixture_statistics(row['id']) if s['team_id'] == team)
+            for row in games[:last_n]]
+
+    def mean(column):
+        values = [row[column] for row in rows if row[column] is not None]
+        return sum(values) / len(values) if values else None
+    return {'avg_shots_on_goal': mean('shots_on_goal'), 'avg_total_shots': mean('total_shots'),
+            'avg_shots_insidebox': mean('shots_insidebox'), 'avg_corners': mean('corner_kicks'),
+            'avg_possession': mean('ball_possession'),
+            'avg_dangerous_attacks': mean('dangerous_attacks'), 'games_count': len(rows)}
+
+
+for last_n in (1, 3, LAST_N, 50):
+    keys = [(team, 39) for team in range(1, 7)]
+    many = db.get_team_avg_statistics_many(keys, CURRENT_SEASON, last_n)
+    for team, league in keys:
+        averages = db.get_team_avg_statistics(team, league, CURRENT_SEASON, last_n)
+        assert averages == expected_averages(team, league, last_n), (team, last_n)
+        assert many[(team, league)] == averages, (team, last_n)
+total = expected_averages(1, 39, 50)['games_count']
+assert 0 < total < 20 and db.get_team_avg_statistics(1, 39, CURRENT_SEASON, 3)['games_count'] == 3
+print(f"   ✅ N = 1, 3, {LAST_N}, 50: médias só dos últimos N jogos com estatísticas "
+      f"(equipa 1: {total} de 20 jogos)")
+print("   ✅ get_team_avg_statistics_many == get_team_avg_statistics")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
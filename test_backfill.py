@@ -0,0 +1,111 @@
+"""
+Teste do Backfill (checkpoints e retoma após quota esgotada)
+"""
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import BACKFILL_PARAMS, CURRENT_SEASON
+from scripts.backfill import backfill_league_season
+
+print("\n" + "="*80)
+print("🧪 TESTE DO BACKFILL")
+print("="*80 + "\n")
+
+SEASON = CURRENT_SEASON - 1
+
+
+def fixture_raw(fixture_id, home, away, day):
+    """Jogo terminado (2-1) no formato de /fixtures"""
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{day}T15:00:00+00:00",
+                    'status': {'short': 'FT', 'long': 'Match Finished', 'elapsed': 90}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': 2, 'away': 1},
+        'score': {'halftime': {'home': 1, 'away': 0}},
+    }
+
+
+class OfflineAPI(APIFootballClient):
+    """Cliente sem rede com quota diária simulada (x-ratelimit-requests-remaining)"""
+
+    def __init__(self, fixtures):
+        super().__init__(payload_store=False)
+        self.fixtures = fixtures
+        self.calls = []
+
+    def _make_request(self, endpoint, params=None):
+        self.request_count += 1
+        self.daily_remaining -= 1
+        self.calls.append((endpoint, params.get('fixture')))
+
+        if endpoint == 'fixtures':
+            return {'response': self.fixtures}
+        fixture = next(f for f in self.fixtures if f['fixture']['id'] == params['fixture'])
+        home = fixture['teams']['home']['id']
+        if endpoint == 'fixtures/statistics':
+            return {'response': [{'team': {'id': home},
+                                  'statistics': [{'type': 'Shots on Goal', 'value': 5}]}]}
+        return {'response': [{
+            'time': {'elapsed': 20, 'extra': None}, 'team': {'id': home},
+            'player': {'id': 9, 'name': 'Jogador 9'}, 'assist': {'id': None, 'name': None},
+            'type': 'Goal', 'detail': 'Normal Goal', 'comments': None,
+        }]}
+
+
+fixtures = [fixture_raw(300 + i, 1 + i % 3, 4 + i % 3, f"2024-10-0{i + 1}") for i in range(6)]
+params = {**BACKFILL_PARAMS, 'enrich_chunk': 2}
+
+db = DatabaseManager.in_memory()
+api = OfflineAPI(fixtures)
+processor = DataProcessor(db=db, api=api)
+
+# ============================================================================
+# Dia 1: quota acaba a meio do enriquecimento
+# ============================================================================
+
+print("📅 Dia 1: 7 pedidos disponíveis...")
+api.daily_remaining = 7
+assert backfill_league_season(processor, 39, SEASON, params=params) is False
+day1 = list(api.calls)
+
+checkpoint = db.get_backfill_checkpoint(39, SEASON)
+assert checkpoint['status'] == 'fixtures' and checkpoint['fixtures_finished'] == 6
+assert day1[0] == ('fixtures', None) and len(day1) == 7
+enriched = {fixture_id for endpoint, fixture_id in day1 if endpoint == 'fixtures/statistics'}
+assert len(enriched) == 3
+print(f"   ✅ Parou com a quota esgotada: checkpoint 'fixtures', {len(enriched)}/6 jogos enriquecidos")
+
+# ============================================================================
+# Dia 2: retoma a partir do checkpoint
+# ============================================================================
+
+print("\n📅 Dia 2: quota renovada...")
+api.daily_remaining = 100
+assert backfill_league_season(processor, 39, SEASON, params=params) is True
+day2 = api.calls[len(day1):]
+
+assert ('fixtures', None) not in day2, "a lista de jogos já estava guardada"
+assert not enriched & {fixture_id for _, fixture_id in day2}, "jogos do dia 1 repetidos"
+assert len(day2) == 6
+assert db.get_backfill_checkpoint(39, SEASON)['status'] == 'done'
+assert db.get_enrichment_needs([f['fixture']['id'] for f in fixtures]) == {}
+print("   ✅ Só os 3 jogos em falta (6 pedidos); checkpoint 'done'")
+
+# ============================================================================
+# Dia 3: temporada passada concluída não gasta pedidos
+# ============================================================================
+
+print("\n📅 Dia 3...")
+assert backfill_league_season(processor, 39, SEASON, params=params) is True
+assert len(api.calls) == len(day1) + len(day2)
+print("   ✅ 0 pedidos")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
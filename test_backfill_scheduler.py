@@ -0,0 +1,102 @@
+"""
+Teste do Agendador do Backfill (repartição da quota diária)
+"""
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import BACKFILL_PARAMS, CURRENT_SEASON
+from scripts.backfill_scheduler import daily_budget, run_day
+
+print("\n" + "="*80)
+print("🧪 TESTE DO AGENDADOR DO BACKFILL")
+print("="*80 + "\n")
+
+LIMIT = 200
+
+
+def fixture_raw(fixture_id, home, away, day):
+    """Jogo terminado (1-0) no formato de /fixtures"""
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{day}T15:00:00+00:00",
+                    'status': {'short': 'FT', 'long': 'Match Finished', 'elapsed': 90}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': 1, 'away': 0},
+        'score': {'halftime': {'home': 1, 'away': 0}},
+    }
+
+
+class OfflineAPI(APIFootballClient):
+    """Cliente sem rede: /status dá o uso do dia, os outros pedidos gastam quota"""
+
+    def __init__(self, fixtures, used=0):
+        super().__init__(payload_store=False)
+        self.fixtures = fixtures
+        self.used = used
+
+    def _make_request(self, endpoint, params=None):
+        self.request_count += 1
+        if endpoint == 'status':
+            return {'response': {'requests': {'limit_day': LIMIT, 'current': self.used}}}
+
+        self.used += 1
+        self.daily_limit, self.daily_remaining = LIMIT, LIMIT - self.used
+        if endpoint == 'fixtures':
+            return {'response': self.fixtures}
+        if endpoint == 'fixtures/statistics':
+            return {'response': [{'team': {'id': 1},
+                                  'statistics': [{'type': 'Shots on Goal', 'value': 3}]}]}
+        return {'response': [{
+            'time': {'elapsed': 10, 'extra': None}, 'team': {'id': 1},
+            'player': {'id': 9, 'name': 'Jogador 9'}, 'assist': {'id': None, 'name': None},
+            'type': 'Goal', 'detail': 'Normal Goal', 'comments': None,
+        }]}
+
+
+fixtures = [fixture_raw(400 + i, 1 + i % 5, 6 + i % 5, f"2025-09-{1 + i:02d}") for i in range(30)]
+live_share = int(LIMIT * BACKFILL_PARAMS['live_quota_share'])
+reserve = BACKFILL_PARAMS['quota_reserve']
+
+# ============================================================================
+# daily_budget: parte da análise do dia e quota_reserve ficam de fora
+# ============================================================================
+
+db = DatabaseManager.in_memory()
+api = OfflineAPI(fixtures)
+api.daily_limit = LIMIT
+
+budget = daily_budget(db, api)
+assert budget['reserve'] == reserve
+assert budget['backfill'] == LIMIT - live_share - reserve, budget
+print(f"🗓️  Limite {LIMIT}: análise {live_share}, reserva {reserve}, backfill {budget['backfill']}")
+
+db.record_api_usage('live', 50)
+budget = daily_budget(db, api)
+assert budget['live_reserved'] == live_share - 50
+assert budget['backfill'] == LIMIT - 50 - (live_share - 50) - reserve
+print("   ✅ Uso real da análise do dia desconta da sua parte, não do backfill")
+
+# ============================================================================
+# run_day: pára antes de tocar na reserva
+# ============================================================================
+
+print("\n📥 run_day com 61 pedidos por fazer...")
+db = DatabaseManager.in_memory()
+api = OfflineAPI(fixtures)
+processor = DataProcessor(db=db, api=api)
+
+assert run_day(processor, [39], seasons=1) is False
+spent = db.get_api_usage()['backfill']
+assert spent == api.used and spent <= LIMIT - live_share - reserve, spent
+assert api.daily_remaining >= live_share + reserve
+print(f"   ✅ {spent} pedidos gastos; ficam {api.daily_remaining} "
+      f"(análise {live_share} + reserva {reserve})")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
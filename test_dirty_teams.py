@@ -0,0 +1,180 @@
+"""
+Teste do Dirty Set (dirty_teams): só recalcular previsões cujas equipas mudaram
+"""
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from analysis.pipeline import MatchDayPipeline
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON, DATABASE_PATH
+
+print("\n" + "="*80)
+print("🧪 TESTE DO DIRTY SET")
+print("="*80 + "\n")
+
+
+def fixture_raw(fixture_id, home, away, day, status='FT', goals=(2, 1)):
+    """Jogo no formato de /fixtures"""
+    finished = status == 'FT'
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{day}T15:00:00+00:00",
+                    'status': {'short': status, 'long': 'Match Finished' if finished else 'Not Started',
+                               'elapsed': 90 if finished else None}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': goals[0] if finished else None, 'away': goals[1] if finished else None},
+        'score': {'halftime': {'home': 1 if finished else None, 'away': 0 if finished else None}},
+    }
+
+
+def stats_raw(home, away, shots=5):
+    return [{'team': {'id': team}, 'statistics': [
+        {'type': 'Shots on Goal', 'value': shots}, {'type': 'Ball Possession', 'value': '50%'},
+    ]} for team in (home, away)]
+
+
+def events_raw(home, minutes=(12, 70)):
+    return [{
+        'time': {'elapsed': minute, 'extra': None}, 'team': {'id': home},
+        'player': {'id': 11, 'name': 'Jogador 11'}, 'assist': {'id': None, 'name': None},
+        'type': 'Goal', 'detail': 'Normal Goal', 'comments': None,
+    } for minute in minutes]
+
+
+# Histórico: 1 vs 5 e 3 vs 6; jogos de hoje: 1 vs 2 e 3 vs 4
+history = [fixture_raw(410, 1, 5, "2025-09-01"), fixture_raw(411, 3, 6, "2025-09-01")]
+today = [fixture_raw(500, 1, 2, "2025-10-20", status='NS'),
+         fixture_raw(501, 3, 4, "2025-10-20", status='NS')]
+
+db = DatabaseManager.in_memory()
+processor = DataProcessor(db=db, api=APIFootballClient(payload_store=False))
+processor.save_fixtures_bulk(history + today)
+
+
+def save_details(shots=5, minutes=(12, 70)):
+    processor.save_fixture_statistics(410, stats_raw(1, 5, shots))
+    processor.save_fixture_statistics(411, stats_raw(3, 6))
+    processor.save_fixture_events(410, events_raw(1))
+    processor.save_fixture_events(411, events_raw(3, minutes))
+
+
+save_details()
+
+# Pipeline só com o estágio de pontuação: score_fn conta os recálculos
+scored = []
+
+
+def score_fn(fixture, league_name, data, input_seq=None):
+    fixture_id = fixture['fixture']['id']
+    scored.append(fixture_id)
+    return {'fixture_id': fixture_id, 'date': fixture['fixture']['date'], 'league_id': 39,
+            'league_name': league_name,
+            'home_team': fixture['teams']['home']['name'],
+            'away_team': fixture['teams']['away']['name'],
+            'home_team_id': fixture['teams']['home']['id'],
+            'away_team_id': fixture['teams']['away']['id'],
+            'score_over_05_ht': data['home_team']['stats'].goals_scored,
+            'confidence_over_05_ht': 'MÉDIA', 'recommendation_over_05_ht': '-',
+            'score_over_15_ft': 0, 'confidence_over_15_ft': 'MÉDIA',
+            'recommendation_over_15_ft': '-', 'input_seq': input_seq}
+
+
+def persist_fn(prediction):
+    assert db.insert_prediction(prediction)
+    return prediction
+
+
+pipeline = MatchDayPipeline(processor, score_fn=score_fn, persist_fn=persist_fn,
+                            reuse_fn=lambda fixture: db.get_current_prediction(fixture['fixture']['id']))
+items = [{'fixture': fixture, 'league_name': 'Premier League', 'league': 39,
+          'home': fixture['teams']['home']['id'], 'away': fixture['teams']['away']['id']}
+         for fixture in today]
+
+
+def score_round(label):
+    """Uma passagem do estágio pontuar+guardar; devolve os jogos recalculados"""
+    scored.clear()
+    for result in pipeline._score(items):
+        if result['fresh']:
+            pipeline.persist_fn(result['prediction'])
+    print(f"   {label}: recalculados {sorted(scored) or '-'} | seq {db.get_change_seq()}")
+    return sorted(scored)
+
+
+# ============================================================================
+# Primeira análise e repetição sem alterações
+# ============================================================================
+
+print("📊 Previsões...")
+assert score_round("1ª análise") == [500, 501]
+assert score_round("sem alterações") == []
+print("   ✅ Previsões guardadas são reutilizadas")
+
+# ============================================================================
+# Reescrita idêntica (jogos, estatísticas e eventos) não marca equipas
+# ============================================================================
+
+print("\n🔁 Reescrita idêntica dos mesmos dados...")
+seq = db.get_change_seq()
+processor.save_fixtures_bulk(history + today)
+save_details()
+assert db.get_change_seq() == seq, "reescrita idêntica marcou equipas"
+assert score_round("reescrita idêntica") == []
+print("   ✅ Sequência inalterada, nada recalculado")
+
+# ============================================================================
+# Alterações reais só recalculam os jogos das equipas afetadas
+# ============================================================================
+
+print("\n✏️  Alterações...")
+save_details(shots=9)
+assert score_round("estatística do jogo 410") == [500]
+
+save_details(shots=9, minutes=(12,))
+assert score_round("evento removido do jogo 411") == [501]
+
+processor.save_fixtures_bulk([fixture_raw(410, 1, 5, "2025-09-01", goals=(3, 1))])
+assert score_round("resultado do jogo 410 corrigido") == [500]
+
+with db.get_connection() as conn:
+    rows = conn.execute("SELECT fixture_id, COUNT(*) AS n FROM predictions GROUP BY fixture_id").fetchall()
+assert {row['fixture_id']: row['n'] for row in rows} == {500: 1, 501: 1}
+print("   ✅ Só as equipas afetadas; uma previsão por jogo (upsert)")
+
+# ============================================================================
+# Recalcular mantém created_at e atualiza updated_at
+# ============================================================================
+
+print("\n🕒 Datas da previsão...")
+
+
+def timestamps(fixture_id):
+    with db.get_connection() as conn:
+        return tuple(conn.execute("SELECT created_at, updated_at FROM predictions WHERE fixture_id = ?",
+                                  (fixture_id,)).fetchone())
+
+
+OLD = '2000-01-01 00:00:00'
+with db.get_connection() as conn:
+    conn.execute("UPDATE predictions SET created_at = ?, updated_at = ?", (OLD, OLD))
+save_details(shots=3, minutes=(12,))
+assert score_round("estatística do jogo 410") == [500]
+created, updated = timestamps(500)
+assert created == OLD and updated > OLD, (created, updated)
+assert timestamps(501) == (OLD, OLD)
+print("   ✅ Previsão recalculada: created_at original, updated_at novo")
+
+# BD existente: a coluna updated_at é acrescentada na migração
+legacy = DatabaseManager.in_memory(DATABASE_PATH)
+with legacy.get_connection() as conn:
+    assert 'updated_at' in {row[1] for row in conn.execute("PRAGMA table_info(predictions)")}
+legacy.close()
+print("   ✅ BD existente migrada com updated_at")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
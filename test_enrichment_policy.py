@@ -0,0 +1,139 @@
+"""
+Teste da Política de Enriquecimento (ENRICHMENT_POLICY)
+"""
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON, ENRICHMENT_POLICY
+
+print("\n" + "="*80)
+print("🧪 TESTE DA POLÍTICA DE ENRIQUECIMENTO")
+print("="*80 + "\n")
+
+
+def fixture_raw(fixture_id, home, away, day, goals, season=CURRENT_SEASON):
+    """Jogo terminado no formato de /fixtures"""
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{day}T15:00:00+00:00",
+                    'status': {'short': 'FT', 'long': 'Match Finished', 'elapsed': 90}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': season, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': goals[0], 'away': goals[1]},
+        'score': {'halftime': {'home': 0, 'away': 0}},
+    }
+
+
+class OfflineAPI(APIFootballClient):
+    """Cliente sem rede: estatísticas/eventos diferentes por jogo"""
+
+    def __init__(self, fixtures):
+        super().__init__(payload_store=False)
+        self.fixtures = {f['fixture']['id']: f for f in fixtures}
+        self.calls = []
+
+    def _make_request(self, endpoint, params=None):
+        self.request_count += 1
+        fixture_id = params['fixture']
+        self.calls.append((endpoint, fixture_id))
+        fixture = self.fixtures[fixture_id]
+        home, away = fixture['teams']['home']['id'], fixture['teams']['away']['id']
+
+        if endpoint == 'fixtures/statistics':
+            return {'response': [
+                {'team': {'id': team}, 'statistics': [
+                    {'type': 'Shots on Goal', 'value': (fixture_id + team) % 9},
+                    {'type': 'Shots insidebox', 'value': (fixture_id * team) % 11},
+                    {'type': 'Corner Kicks', 'value': fixture_id % 7},
+                    {'type': 'Ball Possession', 'value': f"{40 + (fixture_id + team) % 20}%"},
+                ]}
+                for team in (home, away)
+            ]}
+
+        events = []
+        for side, team in (('home', home), ('away', away)):
+            for goal in range(fixture['goals'][side]):
+                events.append({
+                    'time': {'elapsed': (fixture_id * 7 + goal * 31) % 90 + 1, 'extra': None},
+                    'team': {'id': team}, 'player': {'id': team * 10, 'name': f"Jogador {team}"},
+                    'assist': {'id': None, 'name': None},
+                    'type': 'Goal', 'detail': 'Normal Goal', 'comments': None,
+                })
+        return {'response': events}
+
+
+# Equipas 1 e 2: 7 jogos da temporada atual (2 sem golos) + 1 da anterior
+last_n = ENRICHMENT_POLICY['stats']['last_n_games']
+scores = [(0, 0), (2, 1), (1, 1), (0, 0), (3, 0), (1, 2), (0, 1)]
+fixtures = [
+    fixture_raw(200 + i, 1 if i % 2 == 0 else 2, 2 if i % 2 == 0 else 1,
+                f"2025-08-{10 + i}", goals)
+    for i, goals in enumerate(scores)
+]
+fixtures.append(fixture_raw(299, 1, 2, "2024-09-01", (2, 2), season=CURRENT_SEASON - 1))
+ids = [f['fixture']['id'] for f in fixtures]
+
+
+def new_processor():
+    db = DatabaseManager.in_memory()
+    processor = DataProcessor(db=db, api=OfflineAPI(fixtures))
+    assert sorted(processor.save_fixtures_bulk(fixtures)) == sorted(ids)
+    return processor
+
+
+# ============================================================================
+# Alvos: estatísticas dos últimos N jogos, eventos dos jogos com golos
+# ============================================================================
+
+policy = new_processor()
+targets = policy.db.get_enrichment_targets(
+    ids, stats_last_n=last_n, min_total_goals=ENRICHMENT_POLICY['events']['min_total_goals']
+)
+
+expected_stats = {200 + i for i in range(len(scores) - last_n, len(scores))}
+expected_events = {200 + i for i, goals in enumerate(scores) if sum(goals)}
+assert {fid for fid, t in targets.items() if t['stats']} == expected_stats, targets
+assert {fid for fid, t in targets.items() if t['events']} == expected_events, targets
+assert targets[299] == {'stats': False, 'events': False}
+print(f"🎯 Estatísticas: {sorted(expected_stats)}")
+print(f"🎯 Eventos:      {sorted(expected_events)}")
+print("   ✅ Jogos antigos, sem golos e de outras temporadas ficam de fora")
+
+# ============================================================================
+# enrich_fixtures só pede os alvos
+# ============================================================================
+
+print("\n📥 enrich_fixtures com a política...")
+result = policy.enrich_fixtures(ids)
+requested = len(expected_stats) + len(expected_events)
+assert (result['stats'], result['events']) == (len(expected_stats), len(expected_events))
+assert result['not_needed'] == 2 * len(ids) - requested
+assert policy.api.request_count == requested
+print(f"   ✅ {requested} pedidos em vez de {2 * len(ids)}")
+
+# ============================================================================
+# Os scores são os mesmos que com todos os jogos enriquecidos
+# ============================================================================
+
+print("\n⚖️  Comparação com enriquecimento completo...")
+full = new_processor()
+for fixture_id in ids:
+    full.process_fixture_statistics(fixture_id)
+    full.process_fixture_events(fixture_id)
+assert full.api.request_count == 2 * len(ids)
+
+for team_id in (1, 2):
+    for name in ('calculate_offensive_pressure_score', 'calculate_minute_distribution_score'):
+        with_policy = getattr(policy, name)(team_id, 39)
+        with_all = getattr(full, name)(team_id, 39)
+        assert with_policy == with_all, (name, team_id, with_policy, with_all)
+        print(f"   ✅ Equipa {team_id} {name}: {with_policy:.2f}")
+
+policy.db.close()
+full.db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,145 @@
+"""
+Teste do Feature Store (vetores point-in-time e ficheiros memory-mapped)
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from database.db_manager import DatabaseManager
+from database.models import Match
+from analysis.data_processor import DataProcessor
+from analysis.feature_store import FEATURE_INDEX, FeatureBuilder, FeatureStore
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON
+
+print("\n" + "="*80)
+print("🧪 TESTE DO FEATURE STORE")
+print("="*80 + "\n")
+
+
+def fixture_raw(fixture_id, home, away, kickoff, goals, halftime):
+    """Jogo terminado no formato de /fixtures"""
+    return {
+        'fixture': {'id': fixture_id, 'date': kickoff,
+                    'status': {'short': 'FT', 'long': 'Match Finished', 'elapsed': 90}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': goals[0], 'away': goals[1]},
+        'score': {'halftime': {'home': halftime[0], 'away': halftime[1]}},
+    }
+
+
+# Equipas 1, 2 e 3: um jogo por dia, resultados e estatísticas diferentes
+games = []
+for day in range(1, 13):
+    home, away = ((1, 2), (2, 3), (3, 1))[day % 3]
+    goals = (day % 4, (day * 5) % 3)
+    halftime = (min(goals[0], day % 2), 0)
+    games.append(fixture_raw(600 + day, home, away,
+                             f"2025-08-{day:02d}T15:00:00+00:00", goals, halftime))
+# Jogo no mesmo dia do alvo, mas antes do pontapé de saída
+games.append(fixture_raw(690, 1, 3, "2025-08-08T12:00:00+00:00", (2, 2), (1, 1)))
+
+
+def save_game(processor, raw):
+    fixture_id = raw['fixture']['id']
+    processor.save_fixtures_bulk([raw])
+    teams = (raw['teams']['home']['id'], raw['teams']['away']['id'])
+    processor.save_fixture_statistics(fixture_id, [{'team': {'id': team}, 'statistics': [
+        {'type': 'Shots on Goal', 'value': (fixture_id + team) % 8},
+        {'type': 'Shots insidebox', 'value': (fixture_id * team) % 10},
+        {'type': 'Corner Kicks', 'value': fixture_id % 6},
+        {'type': 'Ball Possession', 'value': f"{45 + (fixture_id + team) % 10}%"},
+    ]} for team in teams])
+    events = []
+    for side, team in zip(('home', 'away'), teams):
+        for goal in range(raw['goals'][side]):
+            events.append({
+                'time': {'elapsed': (fixture_id * 11 + goal * 37) % 90 + 1, 'extra': None},
+                'team': {'id': team}, 'player': {'id': team, 'name': f"Jogador {team}"},
+                'assist': {'id': None, 'name': None},
+                'type': 'Goal', 'detail': 'Normal Goal', 'comments': None,
+            })
+    processor.save_fixture_events(fixture_id, events)
+
+
+def database(raws):
+    db = DatabaseManager.in_memory()
+    processor = DataProcessor(db=db, api=APIFootballClient(payload_store=False))
+    for raw in raws:
+        save_game(processor, raw)
+    return db
+
+
+target = Match.from_api(games[7])  # 2025-08-08 15:00, já terminado
+assert target.date == "2025-08-08T15:00:00+00:00"
+
+# ============================================================================
+# Point-in-time: só jogos anteriores ao pontapé de saída
+# ============================================================================
+
+print("⏱️  Point-in-time...")
+full = database(games)
+past = database([raw for raw in games if raw['fixture']['date'] < target.date])
+
+vector = FeatureBuilder(full).build(target)
+expected = FeatureBuilder(past).build(target)
+assert np.array_equal(vector, expected), (vector, expected)
+assert vector[FEATURE_INDEX['home_games_played']] > 0
+assert vector[FEATURE_INDEX['home_pressure_games_count']] > 0
+assert vector[FEATURE_INDEX['home_goals_total']] > 0
+print("   ✅ Vetor com a BD completa == vetor com só os jogos anteriores")
+
+# O próprio jogo e os posteriores não contam; o do mesmo dia mais cedo conta
+without_same_day = database([raw for raw in games
+                             if raw['fixture']['date'] < target.date
+                             and raw['fixture']['id'] != 690])
+assert not np.array_equal(vector, FeatureBuilder(without_same_day).build(target))
+print("   ✅ Jogo do mesmo dia antes do pontapé de saída conta")
+
+save_game(DataProcessor(db=full, api=APIFootballClient(payload_store=False)),
+          fixture_raw(699, 1, 2, "2025-09-01T15:00:00+00:00", (5, 0), (3, 0)))
+assert np.array_equal(FeatureBuilder(full).build(target), vector)
+print("   ✅ Jogos acrescentados depois não alteram o vetor")
+
+# ============================================================================
+# FeatureStore: append, leitura, reabrir e append interrompido
+# ============================================================================
+
+print("\n📦 FeatureStore...")
+with tempfile.TemporaryDirectory() as directory:
+    store = FeatureStore(directory)
+    matches = list(full.iter_fixtures(status='FT', model=Match))
+    assert store.build_missing(matches, FeatureBuilder(full), batch_size=4) == len(matches)
+    assert store.build_missing(matches, FeatureBuilder(full)) == 0
+    assert np.array_equal(store.get(target.id), vector)
+    data = store.get_analysis_data(target.id)
+    assert data['home_team']['stats']['games_played'] == vector[FEATURE_INDEX['home_games_played']]
+    print(f"   ✅ {len(store)} vetores; repetir não acrescenta nada")
+
+    # IDs repetidos no mesmo lote: fica o primeiro
+    assert store.append([1, 1], np.vstack([vector, vector * 2])) == 1
+    assert np.array_equal(store.get(1), vector)
+
+    # Append interrompido: bytes de features sem índice são cortados ao abrir
+    with open(store.features_path, 'ab') as f:
+        f.write(b'\0' * 12)
+    reopened = FeatureStore(directory)
+    assert len(reopened) == len(matches) + 1
+    assert os.path.getsize(reopened.features_path) == 8 * reopened.width * len(reopened)
+    assert reopened.append([2], vector * 3) == 1
+    assert np.array_equal(reopened.get(2), vector * 3)
+    assert np.array_equal(reopened.get(target.id), vector)
+    print("   ✅ Reabrir mantém os vetores; append interrompido é reparado")
+    del store, reopened
+
+for db in (full, past, without_same_day):
+    db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,169 @@
+"""
+Teste do Ledger de Fetch (fixture_fetch_ledger)
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON, FETCH_LEDGER_PARAMS
+
+print("\n" + "="*80)
+print("🧪 TESTE DO LEDGER DE FETCH")
+print("="*80 + "\n")
+
+
+def fixture_raw(fixture_id, home, away, day, goals=(1, 0), halftime=(1, 0)):
+    """Jogo terminado no formato de /fixtures"""
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{day}T15:00:00+00:00",
+                    'status': {'short': 'FT', 'long': 'Match Finished', 'elapsed': 90}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': goals[0], 'away': goals[1]},
+        'score': {'halftime': {'home': halftime[0], 'away': halftime[1]}},
+    }
+
+
+class OfflineAPI(APIFootballClient):
+    """Cliente sem rede: responde a estatísticas/eventos e conta os pedidos"""
+
+    def __init__(self, teams, empty=()):
+        super().__init__(payload_store=False)
+        self.teams = teams          # fixture_id -> (casa, fora)
+        self.empty = set(empty)     # jogos cuja resposta vem vazia
+        self.calls = []
+
+    def _make_request(self, endpoint, params=None):
+        self.request_count += 1
+        fixture_id = params['fixture']
+        self.calls.append((endpoint, fixture_id))
+        if fixture_id in self.empty:
+            return {'response': []}
+
+        home, away = self.teams[fixture_id]
+        if endpoint == 'fixtures/statistics':
+            return {'response': [
+                {'team': {'id': team}, 'statistics': [{'type': 'Shots on Goal', 'value': 4}]}
+                for team in (home, away)
+            ]}
+        return {'response': [{
+            'time': {'elapsed': 30, 'extra': None}, 'team': {'id': home},
+            'player': {'id': 7, 'name': 'Jogador 7'}, 'assist': {'id': None, 'name': None},
+            'type': 'Goal', 'detail': 'Normal Goal', 'comments': None,
+        }]}
+
+
+# BD em memória: 4 jogos com golos (todos alvo de estatísticas e eventos)
+fixtures = [fixture_raw(100 + i, 1 + i % 2, 3 + i % 2, f"2025-09-0{i + 1}") for i in range(4)]
+teams = {f['fixture']['id']: (f['teams']['home']['id'], f['teams']['away']['id'])
+         for f in fixtures}
+
+db = DatabaseManager.in_memory()
+api = OfflineAPI(teams, empty={103})
+processor = DataProcessor(db=db, api=api)
+ids = processor.save_fixtures_bulk(fixtures)
+assert sorted(ids) == [100, 101, 102, 103]
+
+# ============================================================================
+# 1ª passagem: tudo em dívida
+# ============================================================================
+
+print("📥 1ª passagem...")
+result = processor.enrich_fixtures(ids)
+assert (result['stats'], result['events']) == (4, 4), result
+assert api.request_count == 8
+
+ledger = db.get_fixture_ledger(100)
+assert ledger['has_stats'] and ledger['has_events'] and ledger['status_short'] == 'FT'
+empty = db.get_fixture_ledger(103)
+assert not empty['has_stats'] and empty['stats_attempts'] == 1
+print("   ✅ 8 pedidos; jogo 103 registado com resposta vazia")
+
+# ============================================================================
+# 2ª passagem: jogos completos e respostas vazias recentes são saltados
+# ============================================================================
+
+print("\n📒 2ª passagem (logo a seguir)...")
+result = processor.enrich_fixtures(ids)
+assert api.request_count == 8, api.calls[8:]
+assert result['skipped'] == 4 and db.get_enrichment_needs(ids) == {}
+print("   ✅ 0 pedidos: jogos terminados não voltam a ser pedidos")
+
+# ============================================================================
+# Resposta vazia antiga: nova tentativa até max_attempts
+# ============================================================================
+
+print("\n⏳ Respostas vazias com mais de empty_retry_hours...")
+api.empty.clear()
+hours = FETCH_LEDGER_PARAMS['empty_retry_hours'] + 1
+
+
+def age_ledger(fixture_id):
+    with db.get_connection() as conn:
+        conn.execute("""
+            UPDATE fixture_fetch_ledger
+            SET stats_fetched_at = datetime('now', ?), events_fetched_at = datetime('now', ?)
+            WHERE fixture_id = ?
+        """, (f"-{hours} hours", f"-{hours} hours", fixture_id))
+
+
+age_ledger(103)
+assert db.get_enrichment_needs(ids) == {103: {'stats': True, 'events': True}}
+processor.enrich_fixtures(ids)
+assert api.calls[8:] == [('fixtures/statistics', 103), ('fixtures/events', 103)]
+assert db.get_fixture_ledger(103)['has_stats']
+print("   ✅ Jogo 103 pedido de novo e agora completo")
+
+# Sempre vazio: desiste ao fim de max_attempts tentativas
+with db.get_connection() as conn:
+    conn.execute("""
+        UPDATE fixture_fetch_ledger SET has_stats = 0, has_events = 0,
+            stats_attempts = ?, events_attempts = ?
+        WHERE fixture_id = 103
+    """, (FETCH_LEDGER_PARAMS['max_attempts'], FETCH_LEDGER_PARAMS['max_attempts']))
+age_ledger(103)
+assert db.get_enrichment_needs(ids) == {}
+print(f"   ✅ Ao fim de {FETCH_LEDGER_PARAMS['max_attempts']} tentativas deixa de pedir")
+
+# ============================================================================
+# Escrita falhada: sem mensagem de sucesso e o jogo continua em dívida
+# ============================================================================
+
+print("\n💥 Falha ao gravar estatísticas/eventos...")
+processor.save_fixtures_bulk([fixture_raw(104, 1, 3, "2025-09-05")])
+teams[104] = (1, 3)
+with db.get_connection() as conn:
+    for table in ('fixture_statistics', 'fixture_events_data'):
+        conn.execute(f"""
+            CREATE TRIGGER fail_{table} BEFORE INSERT ON {table}
+            BEGIN SELECT RAISE(ABORT, 'disco cheio'); END
+        """)
+
+output = io.StringIO()
+with redirect_stdout(output):
+    assert processor.process_fixture_statistics(104) is False
+    assert processor.process_fixture_events(104) is False
+assert '✅' not in output.getvalue(), output.getvalue()
+assert db.get_enrichment_needs([104]) == {104: {'stats': True, 'events': True}}
+for endpoint in ('fixtures/statistics', 'fixtures/events'):
+    data = OfflineAPI(teams)._make_request(endpoint, {'fixture': 104})
+    assert processor.reprocess_payload(endpoint, {'fixture': 104}, data) == 0
+print("   ✅ process_* devolvem False sem '✅ ... guardados'; ledger por marcar")
+
+with db.get_connection() as conn:
+    conn.execute("DROP TRIGGER fail_fixture_statistics")
+    conn.execute("DROP TRIGGER fail_fixture_events_data")
+assert processor.process_fixture_statistics(104) and processor.process_fixture_events(104)
+assert db.get_enrichment_needs([104]) == {}
+print("   ✅ Depois da falha, nova tentativa grava e marca o ledger")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
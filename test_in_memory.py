@@ -0,0 +1,99 @@
+"""
+Teste da BD em Memória (DatabaseManager.in_memory e snapshots)
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+from database.db_manager import DatabaseManager
+from config.config import DATABASE_PATH
+
+print("\n" + "="*80)
+print("🧪 TESTE DA BD EM MEMÓRIA")
+print("="*80 + "\n")
+
+
+def md5(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def count(db, table):
+    with db.get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+digest = md5(DATABASE_PATH)
+source = sqlite3.connect(Path(DATABASE_PATH).resolve().as_uri() + "?mode=ro", uri=True)
+expected = {table: source.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ('teams', 'fixtures', 'fixture_statistics')}
+source.close()
+
+# ============================================================================
+# Snapshot: cópia do ficheiro, que não é alterado
+# ============================================================================
+
+print("📥 Snapshot...")
+db = DatabaseManager.in_memory(DATABASE_PATH)
+assert db.is_memory
+assert {table: count(db, table) for table in expected} == expected
+print(f"   ✅ Mesmas contagens do ficheiro: {expected}")
+
+fixture = next(db.iter_fixtures(status='FT'))
+with db.get_connection() as conn:
+    conn.execute("DELETE FROM fixture_statistics")
+    conn.execute("UPDATE fixtures SET home_goals = 99 WHERE id = ?", (fixture['id'],))
+assert count(db, 'fixture_statistics') == 0
+assert md5(DATABASE_PATH) == digest
+print("   ✅ Escritas na cópia não alteram o ficheiro")
+
+# ============================================================================
+# BDs independentes, partilhadas entre conexões e threads
+# ============================================================================
+
+print("\n🔀 Várias BDs em memória...")
+empty = DatabaseManager.in_memory()
+other = DatabaseManager.in_memory(DATABASE_PATH)
+assert len({empty.db_path, db.db_path, other.db_path}) == 3
+assert count(empty, 'fixtures') == 0
+assert count(other, 'fixture_statistics') == expected['fixture_statistics']
+assert other.get_fixture(fixture['id'])['home_goals'] == fixture['home_goals']
+print("   ✅ Cada in_memory() tem a sua BD (vazia ou semeada)")
+
+seen = []
+thread = threading.Thread(target=lambda: seen.append(db.get_fixture(fixture['id'])['home_goals']))
+thread.start()
+thread.join()
+assert seen == [99]
+print("   ✅ Outras conexões/threads veem as escritas da mesma BD")
+
+# ============================================================================
+# close() liberta a BD
+# ============================================================================
+
+print("\n🧹 close()...")
+path = db.db_path
+db.close()
+db.close()  # Segunda chamada sem efeito
+assert not db.is_memory
+conn = sqlite3.connect(path, uri=True)
+assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+conn.close()
+assert count(other, 'fixtures') == expected['fixtures']
+print("   ✅ BD libertada; as outras continuam intactas")
+
+try:
+    empty.load_snapshot('/nao/existe.db')
+    raise AssertionError("snapshot inexistente aceite")
+except FileNotFoundError:
+    print("   ✅ Snapshot inexistente: FileNotFoundError")
+
+for remaining in (empty, other):
+    remaining.close()
+assert md5(DATABASE_PATH) == digest
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,97 @@
+"""
+Teste da Manutenção da BD (ANALYZE, incremental vacuum e conversão)
+"""
+
+import hashlib
+
+from database.db_manager import DatabaseManager
+from config.config import DATABASE_PATH
+
+print("\n" + "="*80)
+print("🧪 TESTE DA MANUTENÇÃO")
+print("="*80 + "\n")
+
+with open(DATABASE_PATH, 'rb') as f:
+    digest = hashlib.md5(f.read()).hexdigest()
+
+
+def pragma(db, name):
+    with db.get_connection() as conn:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def tasks(db):
+    with db.get_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT task FROM maintenance_log ORDER BY id")]
+
+
+def free_pages(db):
+    """Apagar estatísticas geradas para deixar páginas livres"""
+    with db.get_connection() as conn:
+        conn.executemany("""
+            INSERT OR IGNORE INTO fixture_statistics (fixture_id, team_id, shots_on_goal)
+            SELECT id, ?, 1 FROM fixtures
+        """, [(-team,) for team in range(1, 4)])
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM fixture_statistics WHERE team_id < 0")
+    return pragma(db, 'freelist_count')
+
+
+# ============================================================================
+# BD antiga (auto_vacuum=NONE): a rotina nunca faz VACUUM completo
+# ============================================================================
+
+print("🧹 BD sem auto_vacuum=INCREMENTAL...")
+db = DatabaseManager.in_memory(DATABASE_PATH)
+assert pragma(db, 'auto_vacuum') == 0
+freelist = free_pages(db)
+pages = pragma(db, 'page_count')
+assert freelist > 0
+
+done = db.run_maintenance(force=True)
+assert 'analyze' in done and 'vacuum' not in done, done
+assert pragma(db, 'page_count') >= pages  # sem VACUUM: o ficheiro não encolhe
+before = (pragma(db, 'page_count'), pragma(db, 'freelist_count'))
+assert db.incremental_vacuum() == {}
+assert (pragma(db, 'page_count'), pragma(db, 'freelist_count')) == before
+assert pragma(db, 'auto_vacuum') == 0
+assert tasks(db) == ['analyze']
+print(f"   ✅ run_maintenance(force=True): só ANALYZE, sem VACUUM completo")
+
+# ============================================================================
+# Conversão explícita e vacuum incremental depois dela
+# ============================================================================
+
+print("\n🔄 convert_auto_vacuum()...")
+result = db.convert_auto_vacuum()
+assert result['converted'] and result['pages_freed'] >= freelist
+assert pragma(db, 'auto_vacuum') == 2 and pragma(db, 'freelist_count') == 0
+assert db.convert_auto_vacuum() == {'converted': False}
+assert tasks(db) == ['analyze', 'convert']
+print(f"   ✅ Convertida ({result['page_count_before']} → {result['page_count_after']} páginas); "
+      f"segunda chamada sem efeito")
+
+freelist = free_pages(db)
+assert freelist > 0
+result = db.incremental_vacuum()
+assert result['pages_freed'] == freelist and pragma(db, 'freelist_count') == 0
+assert 'converted' not in result
+free_pages(db)
+assert 'vacuum' in db.run_maintenance(force=True)
+assert tasks(db)[-2:] == ['analyze', 'vacuum']
+print(f"   ✅ incremental_vacuum libertou {freelist} páginas; a rotina passa a usá-lo")
+db.close()
+
+# BDs novas já nascem em modo INCREMENTAL
+fresh = DatabaseManager.in_memory()
+assert pragma(fresh, 'auto_vacuum') == 2
+assert fresh.convert_auto_vacuum() == {'converted': False}
+fresh.close()
+print("   ✅ BD nova criada já com auto_vacuum=INCREMENTAL")
+
+with open(DATABASE_PATH, 'rb') as f:
+    assert hashlib.md5(f.read()).hexdigest() == digest
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,148 @@
+"""
+Teste do Orçamento do Dia (MatchDayPlanner.budget: full → history → cached)
+"""
+
+from datetime import datetime
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from analysis.match_day import MATCH_MODES, MatchDayPlanner
+from analysis.pipeline import MatchDayPipeline
+from api.api_client import APIFootballClient
+from config.config import ANALYSIS_PARAMS, CURRENT_SEASON, ENRICHMENT_POLICY
+
+print("\n" + "="*80)
+print("🧪 TESTE DO ORÇAMENTO DO DIA")
+print("="*80 + "\n")
+
+TODAY = datetime.now().strftime('%Y-%m-%d')
+LAST_N = ENRICHMENT_POLICY['stats']['last_n_games']
+H2H_COST = ANALYSIS_PARAMS['direct_confrontations_years']
+
+
+def fixture_raw(fixture_id, home, away, timestamp, status='NS'):
+    """Jogo no formato de /fixtures"""
+    finished = status == 'FT'
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{TODAY}T20:00:00+00:00", 'timestamp': timestamp,
+                    'status': {'short': status, 'long': 'Match Finished' if finished else 'Not Started',
+                               'elapsed': 90 if finished else None}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': 1 if finished else None, 'away': 0 if finished else None},
+        'score': {'halftime': {'home': 1 if finished else None, 'away': 0 if finished else None}},
+    }
+
+
+class OfflineAPI(APIFootballClient):
+    """Cliente sem rede: um jogo terminado no histórico de cada equipa"""
+
+    def __init__(self):
+        super().__init__(payload_store=False)
+        self.requests = []
+
+    def _make_request(self, endpoint, params=None):
+        self.request_count += 1
+        self.requests.append((endpoint, dict(params or {})))
+        if endpoint == 'fixtures' and 'team' in params:
+            team = params['team']
+            return {'response': [fixture_raw(5000 + team, team, 700 + team, 1, status='FT')]}
+        return {'response': []}
+
+
+# Três jogos sem equipas em comum, listados fora da ordem de pontapé de saída
+FIXTURES = [(fixture_raw(901, 1, 2, 300), 'Premier League'),
+            (fixture_raw(902, 3, 4, 100), 'Premier League'),
+            (fixture_raw(903, 5, 6, 200), 'Premier League')]
+HISTORY = 2 + H2H_COST                # Duas equipas + H2H por temporada
+FULL = HISTORY + 2 * (2 * LAST_N)     # BD vazia: todos os jogos de cada equipa em falta
+RANK = {mode: rank for rank, mode in enumerate(reversed(MATCH_MODES))}
+
+db = DatabaseManager.in_memory()
+api = OfflineAPI()
+processor = DataProcessor(db=db, api=api)
+planner = MatchDayPlanner(processor)
+
+# ============================================================================
+# Modos por orçamento
+# ============================================================================
+
+print("🧮 Modos por orçamento...")
+plan = planner.build(FIXTURES)
+assert plan.order == [1, 2, 0]
+
+expected = {
+    3 * FULL: ['full', 'full', 'full'],
+    2 * FULL + HISTORY: ['history', 'full', 'full'],
+    2 * FULL: ['cached', 'full', 'full'],
+    FULL + 2 * HISTORY: ['history', 'full', 'history'],
+    FULL + 2 * HISTORY - 1: ['cached', 'full', 'history'],
+    2 * HISTORY: ['cached', 'history', 'history'],
+    HISTORY: ['cached', 'history', 'cached'],
+    HISTORY - 1: ['cached', 'cached', 'cached'],
+}
+for budget, modes in expected.items():
+    planner.budget(plan, budget)
+    assert plan.modes == modes, (budget, plan.modes)
+    assert plan.estimates == [{'full': FULL, 'history': HISTORY, 'cached': 0}[mode]
+                              for mode in modes], (budget, plan.estimates)
+print(f"   ✅ Jogo completo = {FULL} pedidos, só histórico = {HISTORY}: "
+      f"o enriquecimento cai antes do histórico")
+
+previous = None
+for budget in range(3 * FULL, -1, -1):
+    planner.budget(plan, budget)
+    ranks = [RANK[mode] for mode in plan.modes]
+    assert plan.estimated_requests <= budget, (budget, plan.estimates)
+    # Mais cedo nunca fica pior que mais tarde (jogos com o mesmo custo)
+    by_kickoff = [ranks[index] for index in plan.order]
+    assert by_kickoff == sorted(by_kickoff, reverse=True), (budget, plan.modes)
+    # Menos orçamento nunca dá mais jogos completos
+    full = plan.modes.count('full')
+    assert previous is None or full <= previous, (budget, plan.modes)
+    previous = full
+print(f"   ✅ Orçamento {3 * FULL} → 0: estimativa ≤ orçamento, completos só diminuem, "
+      f"prioridade por pontapé de saída")
+
+# Nós já pagos por um jogo anterior não voltam a contar
+shared = planner.build(FIXTURES + [(fixture_raw(904, 4, 3, 400), 'Premier League')])
+planner.budget(shared, 3 * FULL)
+assert shared.modes == ['full', 'full', 'full', 'full'] and shared.estimates[3] == 0
+print("   ✅ Par repetido (ao contrário) já pago: custo 0")
+
+# ============================================================================
+# Pipeline: cada modo só faz os pedidos a que tem direito
+# ============================================================================
+
+print("\n🚰 Pipeline com o plano orçamentado...")
+planner.budget(plan, FULL + HISTORY)
+assert plan.modes == ['cached', 'full', 'history']
+
+
+def score_fn(fixture, league_name, data, input_seq=None):
+    return {'fixture_id': fixture['fixture']['id']}
+
+
+pipeline = MatchDayPipeline(processor, score_fn=score_fn, persist_fn=lambda p: p)
+results = list(pipeline.run(plan=plan))
+assert sorted(r['fixture_id'] for r in results) == [901, 902, 903]
+
+
+def requested(endpoint, key):
+    return {params[key] for name, params in api.requests if name == endpoint}
+
+
+assert requested('fixtures', 'team') == {3, 4, 5, 6}
+assert requested('fixtures/headtohead', 'h2h') == {'3-4', '5-6'}
+assert requested('fixtures/statistics', 'fixture') == {5003, 5004}
+assert requested('fixtures/events', 'fixture') == {5003, 5004}
+assert api.request_count <= plan.estimated_requests, (api.request_count, plan.estimated_requests)
+print(f"   ✅ cached: 0 pedidos; history: sem estatísticas/eventos; "
+      f"{api.request_count} pedidos de {plan.estimated_requests} estimados")
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,128 @@
+"""
+Teste dos Metadados (save_metadata só escreve equipas/ligas/temporadas alteradas)
+"""
+
+import os
+import tempfile
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON
+
+print("\n" + "="*80)
+print("🧪 TESTE DOS METADADOS")
+print("="*80 + "\n")
+
+
+def team(team_id, name=None):
+    return {'id': team_id, 'name': name or f"Equipa {team_id}", 'code': None,
+            'country': 'England', 'founded': None, 'logo': f"https://logo/{team_id}.png"}
+
+
+LEAGUE = {'id': 39, 'name': 'Premier League', 'type': 'League', 'country': 'England',
+          'logo': 'https://logo/39.png'}
+TEAMS = [team(team_id) for team_id in range(1, 21)]
+SEASONS = [(39, CURRENT_SEASON), (39, CURRENT_SEASON - 1)]
+
+
+def count_writes(db):
+    """Triggers temporários que contam cada escrita em teams, leagues e seasons"""
+    with db.get_connection() as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS metadata_writes (tbl TEXT)")
+        for table in ('teams', 'leagues', 'seasons'):
+            for action in ('INSERT', 'UPDATE', 'DELETE'):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS count_{table}_{action.lower()}
+                    AFTER {action} ON {table}
+                    BEGIN INSERT INTO metadata_writes VALUES ('{table}'); END
+                """)
+
+
+def writes(db):
+    with db.get_connection() as conn:
+        rows = conn.execute("SELECT tbl, COUNT(*) FROM metadata_writes GROUP BY tbl").fetchall()
+        conn.execute("DELETE FROM metadata_writes")
+    return {row[0]: row[1] for row in rows}
+
+
+def team_rows(db):
+    with db.get_connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT * FROM teams ORDER BY id")]
+
+
+# ============================================================================
+# Metadados repetidos não são reescritos
+# ============================================================================
+
+print("💾 save_metadata...")
+db = DatabaseManager.in_memory()
+count_writes(db)
+assert db.save_metadata(teams=TEAMS, leagues=[LEAGUE], seasons=SEASONS) == 23
+assert writes(db) == {'teams': 20, 'leagues': 1, 'seasons': 2}
+
+with db.get_connection() as conn:
+    conn.execute("UPDATE teams SET updated_at = '2000-01-01 00:00:00'")
+writes(db)
+rows, seq = team_rows(db), db.get_change_seq()
+assert db.save_metadata(teams=TEAMS, leagues=[LEAGUE], seasons=SEASONS) == 0
+assert db.save_metadata(teams=TEAMS + TEAMS, leagues=[dict(LEAGUE)], seasons=SEASONS * 2) == 0
+assert writes(db) == {}
+assert team_rows(db) == rows and db.get_change_seq() == seq
+print("   ✅ Repetidos: 0 linhas, nenhuma escrita, updated_at e change_seq intactos")
+
+# Só o que mudou é escrito
+renamed = [team(3, 'Equipa Três') if t['id'] == 3 else t for t in TEAMS]
+assert db.save_metadata(teams=renamed, leagues=[LEAGUE],
+                        seasons=SEASONS + [(40, CURRENT_SEASON)]) == 2
+assert writes(db) == {'teams': 1, 'seasons': 1}
+assert db.save_metadata(teams=renamed) == 0 and writes(db) == {}
+print("   ✅ Equipa alterada e temporada nova: só essas linhas escritas")
+
+# ============================================================================
+# Caminho dos jogos (save_fixtures_bulk)
+# ============================================================================
+
+print("\n⚽ save_fixtures_bulk...")
+
+
+def fixture_raw(fixture_id, home, away):
+    return {
+        'fixture': {'id': fixture_id, 'date': "2025-09-01T15:00:00+00:00",
+                    'status': {'short': 'NS', 'long': 'Not Started', 'elapsed': None}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'logo': 'https://logo/39.png', 'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}", 'logo': f"https://logo/{home}.png"},
+                  'away': {'id': away, 'name': f"Equipa {away}", 'logo': f"https://logo/{away}.png"}},
+        'goals': {'home': None, 'away': None},
+        'score': {'halftime': {'home': None, 'away': None}},
+    }
+
+
+processor = DataProcessor(db=db, api=APIFootballClient(payload_store=False))
+raws = [fixture_raw(600 + n, 2 * n + 1, 2 * n + 2) for n in range(10)]
+processor.save_fixtures_bulk(raws)
+first = writes(db)
+processor.save_fixtures_bulk(raws)
+assert writes(db) == {}, "metadados dos jogos reescritos"
+print(f"   ✅ 1ª gravação {first or 'sem alterações'}; 2ª gravação: nenhuma escrita")
+db.close()
+
+# ============================================================================
+# Nova instância sobre o mesmo ficheiro: cache carregada da BD
+# ============================================================================
+
+print("\n🔁 Nova instância...")
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'metadados.db')
+    first = DatabaseManager(path)
+    assert first.save_metadata(teams=TEAMS, leagues=[LEAGUE], seasons=SEASONS) == 23
+    count_writes(first)
+    second = DatabaseManager(path)
+    assert second.save_metadata(teams=TEAMS, leagues=[LEAGUE], seasons=SEASONS) == 0
+    assert writes(second) == {}
+    print("   ✅ Metadados já no ficheiro: 0 linhas escritas")
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
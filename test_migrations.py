@@ -0,0 +1,341 @@
+"""
+Teste das Migrações de Arranque (BD no formato antigo -> schema atual)
+"""
+
+import contextlib
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+
+from database.db_manager import DatabaseManager
+
+print("\n" + "="*80)
+print("🧪 TESTE DAS MIGRAÇÕES")
+print("="*80 + "\n")
+
+# Tabelas, views e triggers do schema original (antes das migrações)
+BASELINE_SCHEMA = """
+CREATE TABLE teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    code TEXT,
+    country TEXT,
+    founded INTEGER,
+    logo TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE leagues (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT,
+    country TEXT,
+    logo TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(id)
+);
+
+CREATE TABLE fixtures (
+    id INTEGER PRIMARY KEY,
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    round TEXT,
+    date TIMESTAMP NOT NULL,
+    timestamp INTEGER,
+    home_team_id INTEGER NOT NULL,
+    away_team_id INTEGER NOT NULL,
+    status_short TEXT,
+    status_long TEXT,
+    status_elapsed INTEGER,
+    venue_id INTEGER,
+    venue_name TEXT,
+    venue_city TEXT,
+    referee TEXT,
+    home_goals INTEGER,
+    away_goals INTEGER,
+    home_goals_halftime INTEGER,
+    away_goals_halftime INTEGER,
+    home_goals_extratime INTEGER,
+    away_goals_extratime INTEGER,
+    home_goals_penalty INTEGER,
+    away_goals_penalty INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (league_id) REFERENCES leagues(id),
+    FOREIGN KEY (home_team_id) REFERENCES teams(id),
+    FOREIGN KEY (away_team_id) REFERENCES teams(id)
+);
+
+CREATE TABLE fixture_statistics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fixture_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    shots_on_goal INTEGER,
+    shots_off_goal INTEGER,
+    total_shots INTEGER,
+    blocked_shots INTEGER,
+    shots_insidebox INTEGER,
+    shots_outsidebox INTEGER,
+    ball_possession INTEGER,
+    total_passes INTEGER,
+    passes_accurate INTEGER,
+    passes_percentage INTEGER,
+    attacks INTEGER,
+    dangerous_attacks INTEGER,
+    corner_kicks INTEGER,
+    offsides INTEGER,
+    fouls INTEGER,
+    yellow_cards INTEGER,
+    red_cards INTEGER,
+    goalkeeper_saves INTEGER,
+    expected_goals REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (fixture_id) REFERENCES fixtures(id),
+    FOREIGN KEY (team_id) REFERENCES teams(id),
+    UNIQUE(fixture_id, team_id)
+);
+
+CREATE TABLE fixture_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fixture_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    time_elapsed INTEGER NOT NULL,
+    time_extra INTEGER,
+    type TEXT NOT NULL,
+    detail TEXT,
+    player_id INTEGER,
+    player_name TEXT,
+    assist_id INTEGER,
+    assist_name TEXT,
+    comments TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (fixture_id) REFERENCES fixtures(id),
+    FOREIGN KEY (team_id) REFERENCES teams(id)
+);
+
+CREATE INDEX idx_fixtures_date ON fixtures(date);
+CREATE INDEX idx_fixtures_teams ON fixtures(home_team_id, away_team_id);
+CREATE INDEX idx_fixtures_status ON fixtures(status_short);
+CREATE INDEX idx_fixture_stats_fixture ON fixture_statistics(fixture_id);
+CREATE INDEX idx_fixture_events_fixture ON fixture_events(fixture_id);
+CREATE INDEX idx_fixture_events_type ON fixture_events(type);
+
+CREATE VIEW fixtures_with_stats AS
+SELECT
+    f.*,
+    hs.shots_on_goal as home_shots_on_goal,
+    as_.shots_on_goal as away_shots_on_goal
+FROM fixtures f
+LEFT JOIN fixture_statistics hs ON f.id = hs.fixture_id AND f.home_team_id = hs.team_id
+LEFT JOIN fixture_statistics as_ ON f.id = as_.fixture_id AND f.away_team_id = as_.team_id;
+
+CREATE VIEW goals_by_period AS
+SELECT
+    fixture_id,
+    SUM(CASE WHEN time_elapsed <= 45 THEN 1 ELSE 0 END) as goals_first_half,
+    SUM(CASE WHEN time_elapsed > 45 THEN 1 ELSE 0 END) as goals_second_half,
+    COUNT(*) as total_goals
+FROM fixture_events
+WHERE type = 'Goal' AND detail NOT IN ('Missed Penalty')
+GROUP BY fixture_id;
+
+CREATE TRIGGER update_fixture_timestamp
+AFTER UPDATE ON fixtures
+BEGIN
+    UPDATE fixtures SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+"""
+
+TEAMS = [(1, 'Benfica', 'Portugal'), (2, 'Porto', 'Portugal'),
+         (3, 'Sporting', 'Portugal'), (4, 'Braga', 'Portugal')]
+
+# (id, casa, fora, data, status, golos, intervalo)
+FIXTURES = [
+    (701, 1, 2, '2025-08-10T19:00:00+00:00', 'FT', (2, 1), (1, 0)),
+    (702, 3, 4, '2025-08-11T19:00:00+00:00', 'FT', (0, 0), (0, 0)),
+    (703, 2, 3, '2025-08-17T19:00:00+00:00', 'FT', (3, 2), (0, 2)),
+    (704, 4, 1, '2025-08-24T19:00:00+00:00', 'NS', (None, None), (None, None)),
+]
+
+# (jogo, equipa, minuto, extra, tipo, detalhe, jogador, assistência, comentário)
+EVENTS = [
+    (701, 1, 12, None, 'Goal', 'Normal Goal', (9, 'Pavlidis'), (10, 'Di María'), None),
+    (701, 2, 40, 2, 'Card', 'Yellow Card', (5, 'Varela'), (None, None), 'Foul'),
+    (701, 2, 58, None, 'Goal', 'Penalty', (20, 'Samu'), (None, None), None),
+    (701, 1, 77, None, 'Goal', 'Own Goal', (None, 'Desconhecido'), (None, None), None),
+    (701, 1, 80, None, 'subst', 'Substitution 1', (10, 'Di María'), (9, 'Pavlidis'), None),
+    (702, 3, 30, None, 'Goal', 'Missed Penalty', (17, 'Trincão'), (None, None), None),
+    (702, 4, 90, 5, 'Var', 'Goal cancelled', (None, None), (None, None), 'Offside'),
+    (703, 2, 50, None, 'Goal', 'Normal Goal', (20, 'Samu'), (None, None), None),
+    (703, 3, 22, None, 'Goal', 'Normal Goal', (17, 'Trincão'), (None, None), None),
+    (703, 3, 35, None, 'Goal', 'Normal Goal', (19, 'Gyökeres'), (17, 'Trincão'), None),
+    (703, 2, 61, None, 'Goal', 'Normal Goal', (20, 'Samu'), (5, 'Varela'), None),
+    (703, 2, 88, None, 'Goal', None, (22, None), (None, None), None),
+]
+
+
+def build_baseline(path):
+    """BD no formato antigo com equipas, jogos, estatísticas e eventos"""
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("INSERT INTO leagues (id, name, country) VALUES (94, 'Primeira Liga', 'Portugal')")
+    conn.executemany("INSERT INTO teams (id, name, country) VALUES (?, ?, ?)", TEAMS)
+    for fixture_id, home, away, date, status, goals, halftime in FIXTURES:
+        conn.execute("""
+            INSERT INTO fixtures (id, league_id, season, round, date, home_team_id, away_team_id,
+                                  status_short, venue_name, referee, home_goals, away_goals,
+                                  home_goals_halftime, away_goals_halftime,
+                                  created_at, updated_at)
+            VALUES (?, 94, 2025, 'Regular Season - 1', ?, ?, ?, ?, 'Estádio', 'Árbitro',
+                    ?, ?, ?, ?, '2025-08-01 10:00:00', '2025-08-01 10:00:00')
+        """, (fixture_id, date, home, away, status, *goals, *halftime))
+        if status == 'FT':
+            for team, shots in ((home, fixture_id % 7), (away, fixture_id % 5)):
+                conn.execute("""
+                    INSERT INTO fixture_statistics (fixture_id, team_id, shots_on_goal,
+                                                    ball_possession, expected_goals)
+                    VALUES (?, ?, ?, 50, 1.25)
+                """, (fixture_id, team, shots))
+    for n, (fixture_id, team, minute, extra, kind, detail,
+            player, assist, comments) in enumerate(EVENTS):
+        conn.execute("""
+            INSERT INTO fixture_events (fixture_id, team_id, time_elapsed, time_extra, type,
+                                        detail, player_id, player_name, assist_id, assist_name,
+                                        comments, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (fixture_id, team, minute, extra, kind, detail, *player, *assist, comments,
+              f"2025-08-20 12:00:{n:02d}"))
+    conn.commit()
+    conn.close()
+
+
+def rows(conn, query):
+    return [tuple(row) for row in conn.execute(query).fetchall()]
+
+
+def schema(db):
+    with db.get_connection() as conn:
+        return rows(conn, "SELECT type, name, sql FROM sqlite_master ORDER BY type, name")
+
+
+def counts(db, tables):
+    with db.get_connection() as conn:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in tables}
+
+
+def reopen(db):
+    """Segunda inicialização; devolve o que foi impresso"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert db.initialize_database()
+    return output.getvalue()
+
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'baseline.db')
+    build_baseline(path)
+    with open(path, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()
+
+    original = sqlite3.connect(path)
+    original_events = rows(original, "SELECT * FROM fixture_events ORDER BY id")
+    original_goals = rows(original, "SELECT * FROM goals_by_period ORDER BY fixture_id")
+    fixture_columns = [row[1] for row in original.execute("PRAGMA table_info(fixtures)")]
+    original_fixtures = rows(original, f"SELECT {', '.join(fixture_columns)} FROM fixtures ORDER BY id")
+    stats_columns = ', '.join(row[1] for row in original.execute("PRAGMA table_info(fixture_statistics)"))
+    original_stats = rows(original, f"SELECT {stats_columns} FROM fixture_statistics ORDER BY id")
+
+    db = DatabaseManager.in_memory(path)
+
+    # ========================================================================
+    # fixture_events: tabela antiga -> tabelas de lookup + view
+    # ========================================================================
+
+    print("\n📋 Eventos...")
+    with db.get_connection() as conn:
+        kinds = dict(rows(conn, "SELECT name, type FROM sqlite_master "
+                                "WHERE name IN ('fixture_events', 'fixture_events_data')"))
+        assert kinds == {'fixture_events': 'view', 'fixture_events_data': 'table'}, kinds
+        assert rows(conn, "SELECT * FROM fixture_events ORDER BY id") == original_events
+        assert rows(conn, "SELECT fixture_id, goals_first_half, goals_second_half, total_goals "
+                          "FROM goals_by_period ORDER BY fixture_id") == original_goals
+        players = rows(conn, "SELECT api_id, name FROM players ORDER BY api_id, name")
+        assert len(players) == len(set(players)) == 8, players
+        assert rows(conn, "SELECT COUNT(*) FROM event_types") == [(4,)]
+        assert not rows(conn, "SELECT name FROM sqlite_master WHERE name LIKE '%_legacy'")
+    assert counts(db, ['fixture_events_data'])['fixture_events_data'] == len(EVENTS)
+    goals = [(event['id'], event['player_name']) for event in db.get_fixture_events(703, 'Goal')]
+    assert sorted(goals) == [(row[0], row[8]) for row in original_events
+                             if row[1] == 703 and row[5] == 'Goal']
+    print(f"   ✅ {len(EVENTS)} eventos, view fixture_events igual à tabela antiga")
+    print("   ✅ goals_by_period igual; jogadores sem duplicados")
+
+    # ========================================================================
+    # fixtures reconstruída com as colunas geradas ht_goals / total_goals
+    # ========================================================================
+
+    print("\n⚽ Jogos...")
+    with db.get_connection() as conn:
+        assert rows(conn, f"SELECT {', '.join(fixture_columns)} FROM fixtures "
+                          "ORDER BY id") == original_fixtures
+        generated = rows(conn, "SELECT id, ht_goals, total_goals FROM fixtures ORDER BY id")
+        assert generated == [(701, 1, 3), (702, 0, 0), (703, 2, 5), (704, None, None)], generated
+        assert rows(conn, f"SELECT {stats_columns} FROM fixture_statistics "
+                          "ORDER BY id") == original_stats
+
+        # FKs de estatísticas e eventos continuam a apontar para fixtures
+        for table in ('fixture_statistics', 'fixture_events_data'):
+            targets = {row[2] for row in conn.execute(f"PRAGMA foreign_key_list({table})")}
+            assert 'fixtures' in targets and 'fixtures_legacy' not in targets, (table, targets)
+        assert not rows(conn, "PRAGMA foreign_key_check")
+        assert not rows(conn, "SELECT name FROM sqlite_master WHERE sql LIKE '%fixtures_legacy%'")
+        joined = rows(conn, """
+            SELECT f.id, COUNT(DISTINCT s.id), COUNT(DISTINCT e.id)
+            FROM fixtures f
+            LEFT JOIN fixture_statistics s ON s.fixture_id = f.id
+            LEFT JOIN fixture_events_data e ON e.fixture_id = f.id
+            GROUP BY f.id ORDER BY f.id
+        """)
+        assert joined == [(701, 2, 5), (702, 2, 2), (703, 2, 5), (704, 0, 0)], joined
+
+        # Índices e trigger do schema atual recriados sobre a nova tabela
+        objects = dict(rows(conn, "SELECT name, tbl_name FROM sqlite_master "
+                                  "WHERE name IN ('idx_fixtures_date', 'update_fixture_timestamp')"))
+        assert objects == {'idx_fixtures_date': 'fixtures', 'update_fixture_timestamp': 'fixtures'}
+    print(f"   ✅ {len(FIXTURES)} jogos iguais; ht_goals/total_goals calculados (NULL se NS)")
+    print("   ✅ FKs de fixture_statistics/fixture_events_data válidas")
+
+    # A coluna gerada acompanha as atualizações
+    with db.get_connection() as conn:
+        conn.execute("UPDATE fixtures SET home_goals = 4, home_goals_halftime = 2 WHERE id = 701")
+        assert rows(conn, "SELECT ht_goals, total_goals FROM fixtures WHERE id = 701") == [(2, 5)]
+    print("   ✅ Colunas geradas atualizadas com o resultado")
+
+    # ========================================================================
+    # Segunda abertura não faz nada
+    # ========================================================================
+
+    print("\n🔁 Segunda inicialização...")
+    tables = ['teams', 'fixtures', 'fixture_statistics', 'fixture_events_data',
+              'players', 'event_types', 'event_details', 'event_comments']
+    before = (schema(db), counts(db, tables))
+    output = reopen(db)
+    assert 'A migrar' not in output and 'A reconstruir' not in output, output
+    assert (schema(db), counts(db, tables)) == before
+    with db.get_connection() as conn:
+        assert rows(conn, "SELECT * FROM fixture_events ORDER BY id") == original_events
+    print("   ✅ Schema, contagens e eventos inalterados")
+
+    db.close()
+    original.close()
+    with open(path, 'rb') as f:
+        assert hashlib.md5(f.read()).hexdigest() == digest
+    print("   ✅ Ficheiro de origem não foi alterado")
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
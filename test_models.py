@@ -0,0 +1,112 @@
+"""
+Teste dos Modelos Compactos (slots)
+"""
+
+import sys
+import tracemalloc
+
+from database.db_manager import DatabaseManager
+from database.models import (
+    Match, MatchStatistics, MatchEvent, TeamForm, HeadToHead, event_rows, statistics_rows
+)
+from analysis.scoring import ScoringSystem
+from config.config import DATABASE_PATH
+
+print("\n" + "="*80)
+print("🧪 TESTE DOS MODELOS COMPACTOS")
+print("="*80 + "\n")
+
+# Cópia em memória da BD (o ficheiro não é alterado)
+db = DatabaseManager.in_memory(DATABASE_PATH)
+
+# ============================================================================
+# Memória por jogo: dict vs Match
+# ============================================================================
+
+with db.get_connection() as conn:
+    cursor = conn.cursor()
+    cursor.execute("SELECT home_team_id, season FROM fixtures WHERE status_short = 'FT' LIMIT 1")
+    row = cursor.fetchone()
+    cursor.execute("""
+        SELECT date(date) AS day FROM fixtures
+        GROUP BY day ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    busiest = cursor.fetchone()
+
+if not row:
+    print("⚠️  Sem jogos terminados na BD - importe dados primeiro")
+    sys.exit()
+
+def measure(build):
+    tracemalloc.start()
+    items = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(items), size
+
+n_dicts, dict_bytes = measure(lambda: list(db.iter_fixtures_by_date(busiest['day'])))
+n_models, model_bytes = measure(lambda: list(db.iter_fixtures_by_date(busiest['day'], model=Match)))
+
+print(f"📦 dict:  {n_dicts} linhas → {dict_bytes / 1024:.1f} KB")
+print(f"📦 Match: {n_models} linhas → {model_bytes / 1024:.1f} KB")
+
+matches = db.get_team_matches(row['home_team_id'], season=row['season'])
+assert all(isinstance(m, Match) for m in matches)
+assert not hasattr(matches[0], '__dict__'), "Match deve usar __slots__"
+print(f"   ✅ {len(matches)} jogos carregados como Match (sem __dict__)")
+
+# ============================================================================
+# Agregados e scoring a partir de modelos
+# ============================================================================
+
+form = TeamForm.from_matches(row['home_team_id'], 0, row['season'], matches)
+print(f"\n📈 Forma: {form.games_played} jogos, "
+      f"{form.games_with_first_half_goal} com golo na 1ª parte, "
+      f"{form.games_over15} com Over 1.5")
+
+h2h = HeadToHead.from_matches(1, 2, None, [
+    Match(1, 39, 2025, home_team_id=1, away_team_id=2, home_goals=2, away_goals=1,
+          home_goals_halftime=1, away_goals_halftime=0),
+    Match(2, 39, 2025, home_team_id=2, away_team_id=1, home_goals=0, away_goals=0,
+          home_goals_halftime=0, away_goals_halftime=0),
+])
+assert (h2h.total_matches, h2h.team1_wins, h2h.draws) == (2, 1, 1)
+assert (h2h.matches_with_first_half_goal, h2h.matches_over15) == (1, 1)
+
+scoring = ScoringSystem()
+as_model = scoring.calculate_h2h_score(h2h)
+as_dict = scoring.calculate_h2h_score({
+    'total_matches': 2, 'matches_with_first_half_goal': 1, 'matches_over15': 1
+})
+assert as_model == as_dict
+print("   ✅ ScoringSystem aceita HeadToHead/TeamForm e dicts")
+
+# ============================================================================
+# Payloads da API -> linhas (estatísticas e eventos)
+# ============================================================================
+
+stats_rows = statistics_rows(10, [{'team': {'id': 1}, 'statistics': [
+    {'type': 'Shots on Goal', 'value': 4},
+    {'type': 'Red Cards', 'value': 0},
+    {'type': 'Ball Possession', 'value': '58%'},
+    {'type': 'expected_goals', 'value': '1.37'},
+    {'type': 'Fouls', 'value': None},
+    {'type': 'Tipo desconhecido', 'value': 9},
+]}])
+stats = MatchStatistics(*stats_rows[0])
+assert (stats.fixture_id, stats.team_id, stats.shots_on_goal) == (10, 1, 4)
+assert (stats.red_cards, stats.ball_possession, stats.expected_goals) == (0, 58, 1.37)
+assert stats.fouls is None and stats.corner_kicks is None
+
+events = event_rows(10, [{'time': {'elapsed': 23, 'extra': None}, 'team': {'id': 1},
+                          'player': {'id': 7, 'name': 'Jogador'}, 'assist': {},
+                          'type': 'Goal', 'detail': 'Normal Goal', 'comments': None}])
+event = MatchEvent(*events[0])
+assert (event.time_elapsed, event.type, event.player_name, event.assist_id) == (23, 'Goal', 'Jogador', None)
+print("   ✅ statistics_rows/event_rows convertem payloads da API em linhas")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ MODELOS FUNCIONAM PERFEITAMENTE!")
+print("="*80 + "\n")
@@ -0,0 +1,116 @@
+"""
+Teste das Pesquisas por Nome (get_team_id_by_name / get_league_id_by_name)
+"""
+
+import os
+import tempfile
+
+from database.db_manager import DatabaseManager
+
+print("\n" + "="*80)
+print("🧪 TESTE DAS PESQUISAS POR NOME")
+print("="*80 + "\n")
+
+
+def team(team_id, name):
+    return {'id': team_id, 'name': name, 'code': None, 'country': 'Portugal',
+            'founded': None, 'logo': None}
+
+
+def delete_team(db, team_id):
+    """Apagar diretamente em SQL (sem passar pelas caches)"""
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM teams WHERE id = ?", (team_id,))
+
+
+db = DatabaseManager.in_memory()
+for team_id, name in ((10, 'Benfica'), (20, 'Porto'), (30, 'Braga'), (5, 'Braga')):
+    assert db.insert_team(team(team_id, name))
+assert db.insert_league({'id': 94, 'name': 'Primeira Liga', 'country': 'Portugal'})
+
+# ============================================================================
+# Pesquisas e índices
+# ============================================================================
+
+print("🔎 Pesquisas...")
+assert db.get_team_id_by_name('Benfica') == 10
+assert db.get_team_id_by_name('Braga') == 5  # Nome repetido: menor ID
+assert db.get_league_id_by_name('Primeira Liga') == 94
+assert db.get_team_id_by_name('Inexistente') is None
+assert db.get_team_id_by_name('') is None and db.get_team_id_by_name(None) is None
+with db.get_connection() as conn:
+    for table, index in (('teams', 'idx_teams_name'), ('leagues', 'idx_leagues_name')):
+        plan = " ".join(row[3] for row in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT MIN(id) FROM {table} WHERE name = ?", ('x',)))
+        assert index in plan, plan
+print("   ✅ Equipas e ligas encontradas pelos índices; repetidos → menor ID")
+
+# Resultado em cache: não volta à BD
+delete_team(db, 10)
+assert db.get_team_id_by_name('Benfica') == 10
+# Nome não encontrado não fica em cache
+assert db.insert_team(team(40, 'Inexistente'))
+assert db.get_team_id_by_name('Inexistente') == 40
+print("   ✅ Encontrados ficam em cache; não encontrados não")
+
+# ============================================================================
+# Renomear invalida o nome antigo
+# ============================================================================
+
+print("\n✏️  Renomear...")
+assert db.insert_team(team(20, 'FC Porto'))
+assert db.get_team_id_by_name('Porto') is None
+assert db.get_team_id_by_name('FC Porto') == 20
+
+# Pelo caminho dos jogos (save_metadata)
+assert db.save_metadata(teams=[team(20, 'Futebol Clube do Porto')]) == 1
+assert db.get_team_id_by_name('FC Porto') is None
+assert db.get_team_id_by_name('Futebol Clube do Porto') == 20
+assert db.save_metadata(leagues=[{'id': 94, 'name': 'Liga Portugal Betclic',
+                                  'country': 'Portugal'}]) == 1
+assert db.get_league_id_by_name('Primeira Liga') is None
+assert db.get_league_id_by_name('Liga Portugal Betclic') == 94
+print("   ✅ insert_team e save_metadata esquecem o nome antigo")
+
+# Repetido renomeado: o nome passa para o outro ID
+assert db.insert_team(team(5, 'SC Braga'))
+assert db.get_team_id_by_name('Braga') == 30
+assert db.get_team_id_by_name('SC Braga') == 5
+print("   ✅ Nome repetido passa para o ID que ainda o tem")
+
+# ============================================================================
+# Cache partilhada pelo processo, separada por BD
+# ============================================================================
+
+print("\n🔀 Várias instâncias...")
+other = DatabaseManager.in_memory()
+assert other.insert_team(team(99, 'Benfica'))
+assert other.get_team_id_by_name('Benfica') == 99
+assert db.get_team_id_by_name('Benfica') == 10
+print("   ✅ BDs diferentes não partilham entradas")
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'nomes.db')
+    first, second = DatabaseManager(path), DatabaseManager(path)
+    assert first.insert_team(team(7, 'Sporting'))
+    delete_team(first, 7)
+    assert second.get_team_id_by_name('Sporting') == 7  # Cache do mesmo ficheiro
+    assert first.insert_team(team(7, 'Sporting CP'))
+    assert second.get_team_id_by_name('Sporting') is None
+    print("   ✅ Mesmo ficheiro: a renomeação numa instância vale para a outra")
+
+    # BD alterada fora da aplicação: refresh_metadata_cache esquece os nomes
+    with first.get_connection() as conn:
+        conn.execute("UPDATE teams SET name = 'Sporting Clube' WHERE id = 7")
+    assert second.get_team_id_by_name('Sporting CP') == 7
+    second.refresh_metadata_cache()
+    assert second.get_team_id_by_name('Sporting CP') is None
+    assert first.get_team_id_by_name('Sporting Clube') == 7
+    print("   ✅ refresh_metadata_cache esquece nomes alterados por fora")
+
+for manager in (db, other):
+    manager.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,79 @@
+"""
+Teste do Arquivo de Payloads da API (PayloadStore)
+"""
+
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from api.api_client import APIFootballClient
+from api.payload_store import PayloadStore
+from config.config import RAW_PAYLOAD_ARCHIVE
+
+print("\n" + "="*80)
+print("🧪 TESTE DO ARQUIVO DE PAYLOADS")
+print("="*80 + "\n")
+
+# Opcional: sem RAW_PAYLOAD_ARCHIVE=1 o cliente não arquiva nada
+if not RAW_PAYLOAD_ARCHIVE:
+    assert APIFootballClient().payload_store is None
+    print("✅ Arquivo desligado por defeito (RAW_PAYLOAD_ARCHIVE=1 para ligar)")
+
+with tempfile.TemporaryDirectory() as directory:
+    store = PayloadStore(os.path.join(directory, 'payloads.db'))
+    print(f"📦 Codec: {store.codec}")
+
+    # ========================================================================
+    # Guardar e ler
+    # ========================================================================
+
+    response = {'response': [{'team': {'id': 1}, 'statistics': [{'type': 'Fouls', 'value': 9}]}]}
+    assert store.save('fixtures/statistics', {'fixture': 10}, response)
+    assert not store.save('status', {}, {'response': {}})
+    assert store.latest('fixtures/statistics', {'fixture': 10}) == response
+    assert store.latest('fixtures/statistics', {'fixture': 11}) is None
+    print("   ✅ save/latest (status não é arquivado)")
+
+    # ========================================================================
+    # Várias threads a comprimir ao mesmo tempo (workers do pipeline)
+    # ========================================================================
+
+    errors = []
+
+    def worker(thread_id):
+        try:
+            for i in range(25):
+                data = {'response': [{'thread': thread_id, 'i': i, 'pad': 'x' * (i * 40)}]}
+                assert store.save('fixtures/events', {'fixture': thread_id * 100 + i}, data)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    saved = list(store.iter_payloads('fixtures/events'))
+    assert len(saved) == 200
+    assert all(data['response'][0]['i'] == params['fixture'] % 100
+               for _, params, _, data in saved)
+    print("   ✅ 8 threads x 25 respostas arquivadas e lidas sem erros")
+
+    # ========================================================================
+    # Retenção
+    # ========================================================================
+
+    old = datetime.now() - timedelta(days=120)
+    assert store.save('fixtures', {'league': 39}, {'response': []}, fetched_at=old)
+    assert store.prune(timedelta(days=90)) == 1
+    assert store.latest('fixtures', {'league': 39}) is None
+    assert store.prune(timedelta(days=90)) == 0
+    assert store.get_stats()['fixtures/events']['count'] == 200
+    print("   ✅ prune apaga só as respostas antigas")
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
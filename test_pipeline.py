@@ -0,0 +1,151 @@
+"""
+Teste do Pipeline do Dia (streaming, paragem a meio e contagem de pedidos)
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from analysis.match_day import MatchDayPlanner
+from analysis.pipeline import MatchDayPipeline
+from analysis.scoring import ScoringSystem
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON
+from main import FootballBettingAI
+
+print("\n" + "="*80)
+print("🧪 TESTE DO PIPELINE DO DIA")
+print("="*80 + "\n")
+
+TODAY = datetime.now().strftime('%Y-%m-%d')
+
+
+def fixture_raw(fixture_id, home, away):
+    """Jogo de hoje por começar, no formato de /fixtures"""
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{TODAY}T20:00:00+00:00",
+                    'timestamp': fixture_id,
+                    'status': {'short': 'NS', 'long': 'Not Started', 'elapsed': None}},
+        'league': {'id': 39, 'name': 'Premier League', 'country': 'England',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season'},
+        'teams': {'home': {'id': home, 'name': f"Equipa {home}"},
+                  'away': {'id': away, 'name': f"Equipa {away}"}},
+        'goals': {'home': None, 'away': None},
+        'score': {'halftime': {'home': None, 'away': None}},
+    }
+
+
+class OfflineAPI(APIFootballClient):
+    """Cliente sem rede: jogos de hoje e histórico vazio"""
+
+    def __init__(self, fixtures):
+        super().__init__(payload_store=False)
+        self.fixtures = fixtures
+
+    def _make_request(self, endpoint, params=None):
+        self.request_count += 1
+        if endpoint == 'fixtures' and (params or {}).get('date') == TODAY:
+            return {'response': self.fixtures}
+        return {'response': []}
+
+
+FIXTURES = [fixture_raw(800 + n, 2 * n + 1, 2 * n + 2) for n in range(40)]
+
+
+def pipeline_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name.split('-')[0] in ('plano', 'descobrir', 'histórico',
+                                              'enriquecer', 'score', 'guardar')]
+
+
+def wait_for_no_threads(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while pipeline_threads() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return pipeline_threads()
+
+
+# ============================================================================
+# MatchDayPipeline: filas limitadas e consumidor que pára a meio
+# ============================================================================
+
+print("🚰 MatchDayPipeline...")
+db = DatabaseManager.in_memory()
+processor = DataProcessor(db=db, api=OfflineAPI(FIXTURES))
+params = {'queue_size': 1, 'history_workers': 2, 'enrich_workers': 2, 'score_workers': 2}
+
+
+def score_fn(fixture, league_name, data, input_seq=None):
+    return {'fixture_id': fixture['fixture']['id']}
+
+
+pipeline = MatchDayPipeline(processor, score_fn=score_fn, persist_fn=lambda p: p, params=params)
+results = list(pipeline.run(league_ids=[39]))
+assert sorted(r['fixture_id'] for r in results) == [f['fixture']['id'] for f in FIXTURES]
+assert pipeline.counts['recomputed'] == len(FIXTURES)
+assert not wait_for_no_threads()
+print(f"   ✅ {len(results)} previsões; todos os workers terminaram")
+
+pipeline = MatchDayPipeline(processor, score_fn=score_fn, persist_fn=lambda p: p, params=params)
+stream = pipeline.run(league_ids=[39])
+first = next(stream)
+assert pipeline_threads(), "pipeline devia estar a correr"
+stream.close()
+assert not pipeline_threads(), [t.name for t in pipeline_threads()]
+assert pipeline.counts['recomputed'] < len(FIXTURES)
+print(f"   ✅ close() depois de 1 previsão: workers parados "
+      f"({pipeline.counts['recomputed']} de {len(FIXTURES)} jogos processados)")
+
+# Erro no consumidor (exceção dentro do for) também pára os workers
+try:
+    for prediction in MatchDayPipeline(processor, score_fn=score_fn, persist_fn=lambda p: p,
+                                       params=params).run(league_ids=[39]):
+        raise KeyboardInterrupt
+except KeyboardInterrupt:
+    pass
+assert not wait_for_no_threads()
+print("   ✅ Exceção no consumidor: workers parados")
+db.close()
+
+# ============================================================================
+# iter_today_predictions: quota e manutenção registadas mesmo a meio
+# ============================================================================
+
+print("\n📅 iter_today_predictions...")
+
+
+def application():
+    """FootballBettingAI com BD em memória e API offline"""
+    app = FootballBettingAI.__new__(FootballBettingAI)
+    app.db = DatabaseManager.in_memory()
+    app.api = OfflineAPI(FIXTURES)
+    app.processor = DataProcessor(db=app.db, api=app.api)
+    app.planner = MatchDayPlanner(app.processor)
+    app.scoring = ScoringSystem()
+    return app
+
+
+app = application()
+stream = app.iter_today_predictions(league_ids=[39], budget=1000)
+prediction = next(stream)
+assert prediction['match_id'] in {f['fixture']['id'] for f in FIXTURES}
+stream.close()
+assert not pipeline_threads()
+usage = app.db.get_api_usage()
+assert usage.get('live') == app.api.request_count > 1, (usage, app.api.request_count)
+assert app.db.get_last_maintenance('analyze') is not None
+print(f"   ✅ Parado a meio: {usage['live']} pedidos registados na quota, manutenção corrida")
+app.db.close()
+
+app = application()
+predictions = list(app.iter_today_predictions(league_ids=[39], budget=1000))
+assert len(predictions) == len(FIXTURES)
+assert app.db.get_api_usage()['live'] == app.api.request_count
+print(f"   ✅ Até ao fim: {len(predictions)} previsões, {app.api.request_count} pedidos registados")
+app.db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
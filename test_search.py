@@ -0,0 +1,141 @@
+"""
+Teste da Pesquisa FTS5 (search_teams / search_fixtures e triggers do índice)
+"""
+
+from database.db_manager import DatabaseManager
+from analysis.data_processor import DataProcessor
+from api.api_client import APIFootballClient
+from config.config import CURRENT_SEASON
+
+print("\n" + "="*80)
+print("🧪 TESTE DA PESQUISA")
+print("="*80 + "\n")
+
+
+def fixture_raw(fixture_id, home, away, day, venue, city, referee, status='FT'):
+    """Jogo no formato de /fixtures"""
+    finished = status == 'FT'
+    return {
+        'fixture': {'id': fixture_id, 'date': f"{day}T19:00:00+00:00", 'referee': referee,
+                    'venue': {'id': None, 'name': venue, 'city': city},
+                    'status': {'short': status, 'long': 'Match Finished' if finished else 'Not Started',
+                               'elapsed': 90 if finished else None}},
+        'league': {'id': 94, 'name': 'Primeira Liga', 'country': 'Portugal',
+                   'season': CURRENT_SEASON, 'round': 'Regular Season - 5'},
+        'teams': {'home': {'id': home[0], 'name': home[1]},
+                  'away': {'id': away[0], 'name': away[1]}},
+        'goals': {'home': 1 if finished else None, 'away': 0 if finished else None},
+        'score': {'halftime': {'home': 0 if finished else None, 'away': 0 if finished else None}},
+    }
+
+
+BENFICA, PORTO, SPORTING = (211, 'Benfica'), (212, 'FC Porto'), (228, 'Sporting CP')
+SAO_PAULO, SILVA = (126, 'São Paulo'), (900, 'Silva FC')
+BRAGA, GUIMARAES = (217, 'Braga'), (224, 'Vitória SC')
+
+
+def ids(results):
+    return [row['id'] for row in results]
+
+
+def search_index(db, table, rowid):
+    with db.get_connection() as conn:
+        row = conn.execute(f"SELECT * FROM {table} WHERE rowid = ?", (rowid,)).fetchone()
+        return dict(row) if row else None
+
+
+db = DatabaseManager.in_memory()
+processor = DataProcessor(db=db, api=APIFootballClient(payload_store=False))
+processor.save_fixtures_bulk([
+    fixture_raw(1, BENFICA, PORTO, "2025-09-01", 'Estádio da Luz', 'Lisboa', 'Artur Soares Dias'),
+    fixture_raw(2, SPORTING, BENFICA, "2025-09-08", 'Estádio José Alvalade', 'Lisboa', 'João Pinheiro'),
+    fixture_raw(3, PORTO, SPORTING, "2025-09-15", 'Estádio do Dragão', 'Porto', 'Fábio Veríssimo'),
+    fixture_raw(4, SILVA, SAO_PAULO, "2025-09-22", 'Morumbi', 'São Paulo', 'Anderson Silva'),
+    fixture_raw(5, BENFICA, SILVA, "2025-10-20", 'Estádio da Luz', 'Lisboa', 'Luís Godinho',
+                status='NS'),
+    fixture_raw(6, BRAGA, GUIMARAES, "2025-09-29", 'Estádio Municipal de Braga', 'Braga',
+                'Carlos Porto'),
+])
+
+# ============================================================================
+# Índice preenchido ao inserir
+# ============================================================================
+
+print("➕ Inserir...")
+assert ids(db.search_teams("benf")) == [211]
+assert ids(db.search_teams("sao paulo")) == [126]  # Sem acentos
+assert sorted(ids(db.search_fixtures("benfica"))) == [1, 2, 5]
+assert ids(db.search_fixtures("benf lisb dragao")) == []  # Palavras ligadas por AND
+assert ids(db.search_fixtures("dragao")) == [3]
+assert ids(db.search_fixtures("jornada")) == [] and db.search_fixtures("  ?! ") == []
+assert sorted(ids(db.search_fixtures("benfica", status='NS'))) == [5]
+row = db.search_fixtures("veríssimo")[0]
+assert (row['home_team'], row['away_team'], row['referee']) == ('FC Porto', 'Sporting CP',
+                                                                'Fábio Veríssimo')
+print("   ✅ Equipas e jogos indexados (prefixos, sem acentos, AND, status)")
+
+# ============================================================================
+# Ranking bm25: nomes das equipas pesam mais que árbitro/estádio
+# ============================================================================
+
+print("\n🏆 Ranking...")
+results = db.search_fixtures("porto")
+assert [row['rank'] for row in results] == sorted(row['rank'] for row in results)
+# Jogo 3: FC Porto + cidade Porto; jogo 1: FC Porto; jogo 6: só o árbitro
+assert ids(results) == [3, 1, 6], ids(results)
+assert ids(db.search_fixtures("silva")) == [4, 5]  # Equipa + árbitro > só equipa
+assert ids(db.search_fixtures("lisboa", limit=2)) == [5, 2]  # Empate: mais recente primeiro
+teams = db.search_teams("porto")
+assert ids(teams) == [212]
+print("   ✅ Mais relevante primeiro; empates por data; limit respeitado")
+
+# ============================================================================
+# UPDATE e DELETE mantêm o índice
+# ============================================================================
+
+print("\n✏️  Atualizar...")
+processor.save_fixtures_bulk([
+    fixture_raw(1, BENFICA, PORTO, "2025-09-01", 'Estádio da Luz', 'Lisboa', 'Rui Costa'),
+])
+assert ids(db.search_fixtures("soares")) == [] and ids(db.search_fixtures("rui costa")) == [1]
+with db.get_connection() as conn:
+    conn.execute("UPDATE fixtures SET venue_name = 'Estádio Novo' WHERE id = 3")
+assert ids(db.search_fixtures("dragao")) == [] and ids(db.search_fixtures("novo")) == [3]
+print("   ✅ Jogo re-gravado (upsert) e UPDATE direto")
+
+# Equipa renomeada pelo upsert e por UPDATE direto: equipas e jogos
+assert db.insert_team({'id': 212, 'name': 'Futebol Clube do Porto', 'country': 'Portugal'})
+assert ids(db.search_teams("futebol clube")) == [212]
+assert sorted(ids(db.search_fixtures("futebol clube"))) == [1, 3]
+with db.get_connection() as conn:
+    conn.execute("UPDATE teams SET name = 'Sporting Clube de Portugal' WHERE id = 228")
+assert ids(db.search_teams("sporting cp")) == []
+assert ids(db.search_teams("sporting clube")) == [228]
+assert sorted(ids(db.search_fixtures("sporting clube"))) == [2, 3]
+assert search_index(db, 'fixture_search', 3)['away_team'] == 'Sporting Clube de Portugal'
+print("   ✅ Equipa renomeada (upsert e UPDATE) atualiza equipas e jogos")
+
+print("\n🗑️  Apagar...")
+with db.get_connection() as conn:
+    conn.execute("DELETE FROM fixtures WHERE id = 4")
+    conn.execute("DELETE FROM teams WHERE id = 126")
+assert search_index(db, 'fixture_search', 4) is None
+assert search_index(db, 'team_search', 126) is None
+assert ids(db.search_fixtures("morumbi")) == [] and ids(db.search_teams("sao paulo")) == []
+print("   ✅ Jogo e equipa apagados saem do índice")
+
+# O índice mantido pelos triggers é igual a um reconstruído de raiz
+with db.get_connection() as conn:
+    maintained = [tuple(r) for r in conn.execute("SELECT rowid, * FROM fixture_search ORDER BY rowid")]
+    maintained_teams = [tuple(r) for r in conn.execute("SELECT rowid, * FROM team_search ORDER BY rowid")]
+assert db.rebuild_search_index() == {'teams': len(maintained_teams), 'fixtures': len(maintained)}
+with db.get_connection() as conn:
+    assert [tuple(r) for r in conn.execute("SELECT rowid, * FROM fixture_search ORDER BY rowid")] == maintained
+    assert [tuple(r) for r in conn.execute("SELECT rowid, * FROM team_search ORDER BY rowid")] == maintained_teams
+print("   ✅ Índice mantido pelos triggers == índice reconstruído")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")
@@ -0,0 +1,103 @@
+"""
+Teste das Leituras em Streaming (iter_*)
+"""
+
+from database.db_manager import DatabaseManager
+from database.models import Match
+from config.config import DATABASE_PATH
+
+print("\n" + "="*80)
+print("🧪 TESTE DAS LEITURAS EM STREAMING")
+print("="*80 + "\n")
+
+# Cópia em memória da BD (o ficheiro não é alterado)
+db = DatabaseManager.in_memory(DATABASE_PATH)
+
+with db.get_connection() as conn:
+    busiest = conn.execute("""
+        SELECT date(date) AS day FROM fixtures
+        GROUP BY day ORDER BY COUNT(*) DESC LIMIT 1
+    """).fetchone()['day']
+    team = conn.execute("""
+        SELECT team_id FROM (
+            SELECT home_team_id AS team_id FROM fixtures WHERE status_short = 'FT'
+            UNION ALL
+            SELECT away_team_id FROM fixtures WHERE status_short = 'FT'
+        ) GROUP BY team_id ORDER BY COUNT(*) DESC LIMIT 1
+    """).fetchone()['team_id']
+    pair = conn.execute("""
+        SELECT home_team_id, away_team_id FROM fixtures
+        WHERE status_short = 'FT' ORDER BY date LIMIT 1
+    """).fetchone()
+    events_fixture = conn.execute("""
+        SELECT fixture_id FROM fixture_events
+        GROUP BY fixture_id ORDER BY COUNT(*) DESC LIMIT 1
+    """).fetchone()['fixture_id']
+    finished = conn.execute(
+        "SELECT COUNT(*) AS n FROM fixtures WHERE status_short = 'FT'"
+    ).fetchone()['n']
+
+
+def check(label, rows, iterator_factory):
+    """Mesmas linhas em dicts, blocos pequenos, tuplos e modelos"""
+    assert rows, f"{label}: sem dados para comparar"
+    assert list(iterator_factory(chunk_size=3)) == rows
+    assert list(iterator_factory(as_tuples=True)) == [tuple(row.values()) for row in rows]
+    print(f"   ✅ {label}: {len(rows)} linhas iguais (dicts, blocos de 3, tuplos)")
+
+
+# ============================================================================
+# iter_* == get_*
+# ============================================================================
+
+print("🔁 iter_* vs get_*...")
+fixtures_day = db.get_fixtures_by_date(busiest)
+check(f"jogos de {busiest}", fixtures_day,
+      lambda **kw: db.iter_fixtures_by_date(busiest, **kw))
+assert [m.id for m in db.iter_fixtures_by_date(busiest, model=Match)] == \
+    [row['id'] for row in fixtures_day]
+
+check(f"jogos da equipa {team}", db.get_team_fixtures(team, limit=10),
+      lambda **kw: db.iter_team_fixtures(team, limit=10, **kw))
+assert [m.id for m in db.get_team_matches(team)] == \
+    [row['id'] for row in db.get_team_fixtures(team)]
+
+check("confrontos diretos", db.get_head_to_head(*pair),
+      lambda **kw: db.iter_head_to_head(*pair, limit=10, **kw))
+
+check(f"eventos do jogo {events_fixture}", db.get_fixture_events(events_fixture),
+      lambda **kw: db.iter_fixture_events(events_fixture, **kw))
+goals = db.get_fixture_events(events_fixture, 'Goal')
+assert goals == list(db.iter_fixture_events(events_fixture, 'Goal', chunk_size=1))
+assert all(event['type'] == 'Goal' for event in goals)
+
+# Previsões: três linhas inseridas nesta cópia
+for offset, score in enumerate((55.0, 80.0, 70.0)):
+    fixture = fixtures_day[offset]
+    assert db.insert_prediction({
+        'fixture_id': fixture['id'], 'date': fixture['date'], 'league_id': fixture['league_id'],
+        'league_name': 'Liga', 'home_team': 'Casa', 'away_team': 'Fora',
+        'score_over_05_ht': score, 'confidence_over_05_ht': 'MÉDIA',
+        'recommendation_over_05_ht': '-', 'score_over_15_ft': score,
+        'confidence_over_15_ft': 'MÉDIA', 'recommendation_over_15_ft': '-',
+    })
+predictions = db.get_predictions_by_date(busiest)
+assert [row['score_over_05_ht'] for row in predictions] == [80.0, 70.0, 55.0]
+check("previsões", predictions, lambda **kw: db.iter_predictions_by_date(busiest, **kw))
+
+# ============================================================================
+# iter_fixtures percorre a tabela toda em blocos
+# ============================================================================
+
+print("\n📦 iter_fixtures em blocos...")
+streamed = list(db.iter_fixtures(status='FT', chunk_size=7, as_tuples=True))
+assert len(streamed) == finished
+dates = [row[4] for row in streamed]
+assert dates == sorted(dates)
+print(f"   ✅ {len(streamed)} jogos terminados, por ordem cronológica")
+
+db.close()
+
+print("\n" + "="*80)
+print("✅ TODOS OS TESTES PASSARAM!")
+print("="*80 + "\n")